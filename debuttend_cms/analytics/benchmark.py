@@ -0,0 +1,351 @@
+"""Seeded benchmark of the CMS hot paths with a stored-baseline comparison.
+
+``seed()`` fills a throwaway database with a configurable site:
+- article pages with realistic StreamField bodies, added in bulk through ``home.bulk``;
+- a ``DashboardPage`` with its widgets;
+- integrations with log history;
+- the ``benchmark`` superuser used for the editor scenarios.
+
+``run()`` requests each scenario through the Django test client in two modes.
+Warm mode leaves the cache primed by the warm-up requests. Cold mode clears the
+cache before every request. While it runs, the ``BENCHMARK_CACHE_ALIAS`` cache
+stands in as the default cache, so clearing it never touches the cache the site
+is served from; the run is refused when that alias is missing or has the same
+configuration as ``default``. Each mode records latency
+percentiles, the highest query count seen across every database connection
+(so replica reads count too) and the peak memory traced by ``tracemalloc`` per
+request. ``compare()`` checks a result against a stored
+baseline. Latency and allocations may grow by a relative tolerance; query
+counts are a budget that may grow by an absolute number.
+"""
+from __future__ import annotations
+
+import json
+import platform
+import random
+import statistics
+import time
+import tracemalloc
+import uuid
+from dataclasses import dataclass
+
+import django
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from wagtail.models import Site
+
+from home import bulk, richtext
+from home.models import ArticlePage, DashboardPage, DashboardWidget, HomePage, Integration, IntegrationLogEntry
+from home.text import stream_to_text
+from search import fulltext
+
+from .queries import track_queries
+
+PARENT_SLUG = "benchmark"
+INTEGRATION_PREFIX = "Benchmark integration"
+USERNAME = "benchmark"
+SEARCH_TERM = "latency"
+SCENARIOS = ("page_serve", "search", "api_pages", "dashboard", "integration_detail")
+# Measured as a logged-in editor; the public scenarios are requested anonymously.
+EDITOR_SCENARIOS = {"dashboard", "integration_detail"}
+WORDS = (
+    "cache latency publish editor content stream block render template query index replica search "
+    "page article widget dashboard integration revision locale image embed link summary layout "
+    "request response worker queue batch signal header token preview draft schedule archive"
+).split()
+
+
+class BenchmarkError(Exception):
+    pass
+
+
+@dataclass
+class SeedOptions:
+    articles: int = 50000
+    widgets: int = 40
+    integrations: int = 200
+    logs_per_integration: int = 50
+    batch_size: int = 1000
+    seed: int = 42
+
+
+@dataclass
+class Thresholds:
+    latency: float = 0.25
+    queries: int = 0
+    allocations: float = 0.25
+
+
+def sentence(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize() + "."
+
+
+def paragraph(rng: random.Random) -> str:
+    return " ".join(sentence(rng, rng.randint(8, 18)) for _ in range(rng.randint(2, 5)))
+
+
+def article_body(rng: random.Random) -> list[dict]:
+    blocks = []
+    for _ in range(rng.randint(4, 10)):
+        kind = rng.choices(["rich_text", "quote", "embed"], weights=[8, 2, 1])[0]
+        if kind == "rich_text":
+            value = f"<h2>{sentence(rng, 4)}</h2><p>{paragraph(rng)}</p><p>{paragraph(rng)}</p>"
+        elif kind == "quote":
+            value = {"quote": sentence(rng, 14), "attribution": sentence(rng, 2)}
+        else:
+            value = f"https://www.youtube.com/watch?v=bench{rng.randint(0, 999)}"
+        blocks.append({"type": kind, "value": value, "id": str(uuid.UUID(int=rng.getrandbits(128)))})
+    return blocks
+
+
+def get_site() -> Site:
+    site = Site.objects.filter(is_default_site=True).select_related("root_page").first()
+    if site is None:
+        raise BenchmarkError("A default Site is required.")
+    return site
+
+
+def get_parent(site: Site):
+    parent = HomePage.objects.child_of(site.root_page).filter(slug=PARENT_SLUG).first()
+    if parent is None:
+        parent = site.root_page.add_child(instance=HomePage(title="Benchmark", slug=PARENT_SLUG))
+        parent.save_revision().publish()
+    return parent
+
+
+def seed_articles(parent, options: SeedOptions, rng: random.Random) -> int:
+    existing = ArticlePage.objects.child_of(parent).count()
+    for start in range(existing, options.articles, options.batch_size):
+        pages = []
+        for number in range(start, min(start + options.batch_size, options.articles)):
+            page = ArticlePage(
+                title=sentence(rng, rng.randint(3, 7)).rstrip("."),
+                slug=f"article-{number:06d}",
+                live=True,
+                introduction=sentence(rng, 16),
+                author=f"{rng.choice(WORDS).title()} {rng.choice(WORDS).title()}",
+                published_date=timezone.now().date(),
+                body=json.dumps(article_body(rng)),
+            )
+            page.body_text = stream_to_text(page.body)
+            page.compiled_richtext = richtext.compile_page(page)
+            pages.append(page)
+        bulk.bulk_add_children(parent, pages)
+        fulltext.index_articles(pages)
+    return max(options.articles - existing, 0)
+
+
+def seed_dashboard(site: Site, options: SeedOptions, rng: random.Random) -> int:
+    if DashboardPage.objects.child_of(site.root_page).filter(slug="dashboard").exists():
+        return 0
+    widgets = DashboardWidget.objects.bulk_create(
+        [
+            DashboardWidget(
+                title=sentence(rng, 3).rstrip("."),
+                description=sentence(rng, 12),
+                widget_type=rng.choice(["stats", "chart", "todo"]),
+                configuration={"metric": rng.choice(WORDS), "period": rng.choice(["day", "week", "month"])},
+                locale_id=site.root_page.locale_id,
+            )
+            for _ in range(options.widgets)
+        ]
+    )
+    layout = [
+        {"type": "widget", "value": {"widget": widget.pk, "column_span": rng.choice("123")}} for widget in widgets
+    ]
+    page = site.root_page.add_child(
+        instance=DashboardPage(title="Dashboard", slug="dashboard", layout=json.dumps(layout))
+    )
+    page.save_revision().publish()
+    return len(widgets)
+
+
+def seed_integrations(site: Site, options: SeedOptions, rng: random.Random) -> int:
+    existing = Integration.objects.filter(name__startswith=INTEGRATION_PREFIX).count()
+    integrations = Integration.objects.bulk_create(
+        [
+            Integration(
+                name=f"{INTEGRATION_PREFIX} {number:04d}",
+                api_base_url=f"https://integration-{number}.example.invalid/status",
+                # Inactive so a real sync run never polls the placeholder URLs.
+                is_active=False,
+                locale_id=site.root_page.locale_id,
+            )
+            for number in range(existing, options.integrations)
+        ]
+    )
+    for start in range(0, len(integrations), 50):
+        IntegrationLogEntry.objects.bulk_create(
+            [
+                IntegrationLogEntry(
+                    integration=integration,
+                    status=rng.choices(["success", "error", "pending"], weights=[8, 2, 1])[0],
+                    message=sentence(rng, 10),
+                )
+                for integration in integrations[start:start + 50]
+                for _ in range(options.logs_per_integration)
+            ],
+            batch_size=options.batch_size,
+        )
+    return len(integrations)
+
+
+def seed_editor() -> int:
+    if get_user_model().objects.filter(username=USERNAME).exists():
+        return 0
+    get_user_model().objects.create_superuser(USERNAME, "", None)
+    return 1
+
+
+def seed(options: SeedOptions) -> dict[str, int]:
+    """Top up the benchmark data set to the requested sizes; returns how many objects were added."""
+    rng = random.Random(options.seed)
+    site = get_site()
+    return {
+        "articles": seed_articles(get_parent(site), options, rng),
+        "widgets": seed_dashboard(site, options, rng),
+        "integrations": seed_integrations(site, options, rng),
+        "editors": seed_editor(),
+    }
+
+
+def scenario_paths(site: Site, sample: int) -> dict[str, list[str]]:
+    parent = HomePage.objects.child_of(site.root_page).filter(slug=PARENT_SLUG).first()
+    articles = ArticlePage.objects.child_of(parent).live().order_by("path") if parent else ArticlePage.objects.none()
+    total = articles.count()
+    step = max(total // sample, 1)
+    integration_id = (
+        Integration.objects.filter(name__startswith=INTEGRATION_PREFIX).order_by("pk").values_list("pk", flat=True)
+    ).first()
+    paths = {
+        "page_serve": [page.get_url() for page in articles[: step * sample : step]],
+        "search": [f"{reverse('search:results')}?query={SEARCH_TERM}"],
+        "api_pages": [f"{reverse('wagtailapi:pages:listing')}?type=home.ArticlePage&limit=20"],
+        "dashboard": [reverse("dashboard:index")],
+        "integration_detail": [reverse("integrations:detail", args=[integration_id])] if integration_id else [],
+    }
+    return {name: urls for name, urls in paths.items() if urls}
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, round(fraction * (len(ordered) - 1)))]
+
+
+def request(client: Client, path: str):
+    response = client.get(path)
+    if response.status_code >= 400:
+        raise BenchmarkError(f"GET {path} returned {response.status_code}")
+    return response
+
+
+def measure(client: Client, paths: list[str], iterations: int, warmup: int, cold: bool) -> dict:
+    for number in range(max(warmup, len(paths))):
+        request(client, paths[number % len(paths)])
+
+    timings, queries = [], []
+    for number in range(iterations):
+        if cold:
+            cache.clear()
+        with track_queries() as counter:
+            started = time.perf_counter()
+            request(client, paths[number % len(paths)])
+            timings.append((time.perf_counter() - started) * 1000)
+        queries.append(counter.count)
+
+    # Allocations are traced in a separate, shorter pass so tracing doesn't skew the timings.
+    peaks = []
+    tracemalloc.start()
+    try:
+        for number in range(min(iterations, 10)):
+            if cold:
+                cache.clear()
+            baseline = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            request(client, paths[number % len(paths)])
+            peaks.append(tracemalloc.get_traced_memory()[1] - baseline)
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "requests": iterations,
+        "p50_ms": round(percentile(timings, 0.50), 3),
+        "p95_ms": round(percentile(timings, 0.95), 3),
+        "p99_ms": round(percentile(timings, 0.99), 3),
+        "mean_ms": round(statistics.fmean(timings), 3),
+        "queries": max(queries),
+        "alloc_peak_kib": round(statistics.median(peaks) / 1024, 1),
+    }
+
+
+def get_client(site: Site, editor: bool) -> Client:
+    client = Client(HTTP_HOST=site.hostname, SERVER_PORT=str(site.port))
+    if editor:
+        user = get_user_model().objects.filter(username=USERNAME).first()
+        if user is None:
+            raise BenchmarkError(f"No {USERNAME!r} user for the editor scenarios; run with --seed first.")
+        client.force_login(user)
+    return client
+
+
+def isolated_cache():
+    """Settings override making the benchmark cache the default one for the duration of a run."""
+    alias = getattr(settings, "BENCHMARK_CACHE_ALIAS", "benchmark")
+    config = settings.CACHES.get(alias)
+    if config is None:
+        raise BenchmarkError(f"CACHES has no {alias!r} alias; the benchmark will not clear the site's cache.")
+    if config == settings.CACHES["default"]:
+        raise BenchmarkError(f"The {alias!r} cache is configured like 'default'; point it at a separate cache.")
+    return override_settings(CACHES={**settings.CACHES, "default": config})
+
+
+def run(scenarios=SCENARIOS, iterations: int = 50, warmup: int = 5, sample: int = 50, modes=("warm", "cold")) -> dict:
+    site = get_site()
+    paths = scenario_paths(site, sample)
+    missing = [name for name in scenarios if name not in paths]
+    if missing:
+        raise BenchmarkError(f"No data for scenario {missing[0]!r}; run with --seed first.")
+    results = {}
+    with isolated_cache():
+        cache.clear()
+        clients = {editor: get_client(site, editor) for editor in {name in EDITOR_SCENARIOS for name in scenarios}}
+        for name in scenarios:
+            client = clients[name in EDITOR_SCENARIOS]
+            results[name] = {mode: measure(client, paths[name], iterations, warmup, mode == "cold") for mode in modes}
+    return {
+        "meta": {
+            "timestamp": timezone.now().isoformat(),
+            "vendor": connection.vendor,
+            "django": django.get_version(),
+            "python": platform.python_version(),
+            "iterations": iterations,
+            "articles": ArticlePage.objects.count(),
+        },
+        "results": results,
+    }
+
+
+def compare(report: dict, baseline: dict, thresholds: Thresholds) -> list[str]:
+    """Describe each metric in ``report`` that regressed past ``thresholds`` relative to ``baseline``."""
+    regressions = []
+    for name, modes in baseline.get("results", {}).items():
+        for mode, expected in modes.items():
+            current = report["results"].get(name, {}).get(mode)
+            if current is None:
+                continue
+            checks = [
+                ("p95_ms", expected["p95_ms"] * (1 + thresholds.latency)),
+                ("queries", expected["queries"] + thresholds.queries),
+                ("alloc_peak_kib", expected["alloc_peak_kib"] * (1 + thresholds.allocations)),
+            ]
+            for metric, limit in checks:
+                if current[metric] > limit:
+                    regressions.append(
+                        f"{name}/{mode} {metric}: {current[metric]} > {round(limit, 3)} (baseline {expected[metric]})"
+                    )
+    return regressions
@@ -0,0 +1,174 @@
+"""In-process buffer for page-view events with batched database writes.
+
+``PageViewMiddleware`` only appends a tuple to the buffer, so recording a hit
+never adds a synchronous database write to the request path. A daemon thread
+flushes the buffer whenever it reaches ``ANALYTICS_FLUSH_BATCH_SIZE`` events or
+every ``ANALYTICS_FLUSH_INTERVAL`` seconds, using ``COPY`` on PostgreSQL and
+``bulk_create`` elsewhere. When the buffer holds ``ANALYTICS_BUFFER_MAX_SIZE``
+events new hits are dropped and counted rather than blocking requests. The
+remaining events are flushed when the worker process exits.
+"""
+from __future__ import annotations
+
+import atexit
+import csv
+import io
+import logging
+import os
+import threading
+
+from django.conf import settings
+from django.db import close_old_connections, connection
+
+from .models import PageView
+
+logger = logging.getLogger(__name__)
+
+COLUMNS = ("page_id", "site_id", "path", "referrer", "viewed_at")
+
+
+def write_page_views(rows: list[tuple]) -> None:
+    """Persist ``(page_id, site_id, path, referrer, viewed_at)`` rows in one batch."""
+    if not rows:
+        return
+    if connection.vendor == "postgresql":
+        with connection.cursor() as cursor:
+            if hasattr(cursor.cursor, "copy_expert"):
+                buf = io.StringIO()
+                writer = csv.writer(buf)
+                for page_id, site_id, path, referrer, viewed_at in rows:
+                    writer.writerow([
+                        "" if page_id is None else page_id,
+                        "" if site_id is None else site_id,
+                        path,
+                        referrer,
+                        viewed_at.isoformat(),
+                    ])
+                buf.seek(0)
+                # An unquoted empty CSV field is NULL to COPY; only the id columns may be NULL.
+                cursor.copy_expert(
+                    f"COPY {PageView._meta.db_table} ({', '.join(COLUMNS)}) FROM STDIN "
+                    "WITH (FORMAT csv, FORCE_NOT_NULL (path, referrer))",
+                    buf,
+                )
+                return
+    PageView.objects.bulk_create(
+        [PageView(**dict(zip(COLUMNS, row))) for row in rows],
+        batch_size=getattr(settings, "ANALYTICS_FLUSH_BATCH_SIZE", 500),
+    )
+
+
+class PageViewBuffer:
+    def __init__(self, max_size: int, batch_size: int, flush_interval: float, writer=write_page_views):
+        self.max_size = max_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.writer = writer
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._events: list[tuple] = []
+        self._thread: threading.Thread | None = None
+        self._pid = os.getpid()
+        self.recorded = 0
+        self.dropped = 0
+        self.written = 0
+        self.failed = 0
+        self.flushes = 0
+
+    @classmethod
+    def from_settings(cls) -> PageViewBuffer:
+        return cls(
+            max_size=getattr(settings, "ANALYTICS_BUFFER_MAX_SIZE", 10000),
+            batch_size=getattr(settings, "ANALYTICS_FLUSH_BATCH_SIZE", 500),
+            flush_interval=getattr(settings, "ANALYTICS_FLUSH_INTERVAL", 5.0),
+        )
+
+    def record(self, page_id, site_id, path: str, referrer: str, viewed_at) -> bool:
+        """Queue a page view; returns ``False`` when the event was dropped."""
+        self._check_fork()
+        with self._lock:
+            if len(self._events) >= self.max_size:
+                self.dropped += 1
+                return False
+            self._events.append((page_id, site_id, path[:255], referrer[:255], viewed_at))
+            self.recorded += 1
+            should_flush = len(self._events) >= self.batch_size
+        self._ensure_thread()
+        if should_flush:
+            self._wakeup.set()
+        return True
+
+    def flush(self) -> int:
+        """Write every queued event; returns the number of rows written."""
+        with self._flush_lock:
+            with self._lock:
+                events, self._events = self._events, []
+            if not events:
+                return 0
+            try:
+                for start in range(0, len(events), self.batch_size):
+                    self.writer(events[start:start + self.batch_size])
+            except Exception:
+                logger.exception("Failed to write %d page views", len(events))
+                with self._lock:
+                    self.failed += len(events)
+                return 0
+            with self._lock:
+                self.written += len(events)
+                self.flushes += 1
+            return len(events)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "pending": len(self._events),
+                "recorded": self.recorded,
+                "dropped": self.dropped,
+                "written": self.written,
+                "failed": self.failed,
+                "flushes": self.flushes,
+            }
+
+    def _check_fork(self) -> None:
+        # Events and the flush thread must not be shared with a forked child.
+        if self._pid != os.getpid():
+            with self._lock:
+                self._pid = os.getpid()
+                self._events = []
+                self._thread = None
+
+    def _ensure_thread(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, name="pageview-flush", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            close_old_connections()
+            self.flush()
+
+
+_buffer: PageViewBuffer | None = None
+_buffer_lock = threading.Lock()
+
+
+def get_buffer() -> PageViewBuffer:
+    global _buffer
+    if _buffer is None:
+        with _buffer_lock:
+            if _buffer is None:
+                _buffer = PageViewBuffer.from_settings()
+                atexit.register(flush_on_exit)
+    return _buffer
+
+
+def flush_on_exit() -> None:
+    if _buffer is not None:
+        _buffer.flush()
@@ -0,0 +1,82 @@
+"""Seed the benchmark data set, measure the hot paths and compare against a baseline."""
+from __future__ import annotations
+
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from analytics import benchmark
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure latency, query counts and allocations of the public and admin hot paths. "
+        "--seed writes benchmark content and the benchmark user, so only use it against a throwaway database. "
+        "Runs use the 'benchmark' cache in place of the default one."
+    )
+
+    def add_arguments(self, parser):
+        defaults = benchmark.SeedOptions()
+        thresholds = benchmark.Thresholds()
+        parser.add_argument("--seed", action="store_true", help="Top up the benchmark data set before measuring.")
+        parser.add_argument("--articles", type=int, default=defaults.articles)
+        parser.add_argument("--widgets", type=int, default=defaults.widgets)
+        parser.add_argument("--integrations", type=int, default=defaults.integrations)
+        parser.add_argument("--logs", type=int, default=defaults.logs_per_integration, help="Log entries each.")
+        parser.add_argument(
+            "--scenario", action="append", choices=benchmark.SCENARIOS, help="Limit to these scenarios."
+        )
+        parser.add_argument("--iterations", type=int, default=50, help="Timed requests per scenario and mode.")
+        parser.add_argument("--warmup", type=int, default=5)
+        parser.add_argument("--warm-only", action="store_true", help="Skip the cold-cache mode.")
+        parser.add_argument("--output", help="Write the JSON report here instead of stdout.")
+        parser.add_argument("--baseline", help="Fail when the report regresses against this JSON report.")
+        parser.add_argument("--latency-tolerance", type=float, default=thresholds.latency, help="Allowed p95 growth.")
+        parser.add_argument("--query-tolerance", type=int, default=thresholds.queries, help="Allowed extra queries.")
+        parser.add_argument(
+            "--allocation-tolerance", type=float, default=thresholds.allocations, help="Allowed allocation growth."
+        )
+
+    def handle(self, *args, **options):
+        try:
+            if options["seed"]:
+                added = benchmark.seed(
+                    benchmark.SeedOptions(
+                        articles=options["articles"],
+                        widgets=options["widgets"],
+                        integrations=options["integrations"],
+                        logs_per_integration=options["logs"],
+                    )
+                )
+                self.stderr.write(", ".join(f"{count} {name}" for name, count in added.items()) + " added.")
+            report = benchmark.run(
+                scenarios=options["scenario"] or benchmark.SCENARIOS,
+                iterations=options["iterations"],
+                warmup=options["warmup"],
+                modes=("warm",) if options["warm_only"] else ("warm", "cold"),
+            )
+        except benchmark.BenchmarkError as exc:
+            raise CommandError(str(exc)) from exc
+
+        regressions = []
+        if options["baseline"]:
+            with open(options["baseline"]) as handle:
+                baseline = json.load(handle)
+            thresholds = benchmark.Thresholds(
+                latency=options["latency_tolerance"],
+                queries=options["query_tolerance"],
+                allocations=options["allocation_tolerance"],
+            )
+            regressions = benchmark.compare(report, baseline, thresholds)
+            report["thresholds"] = vars(thresholds)
+            report["regressions"] = regressions
+
+        output = json.dumps(report, indent=2)
+        if options["output"]:
+            with open(options["output"], "w") as handle:
+                handle.write(output + "\n")
+        else:
+            self.stdout.write(output)
+        if regressions:
+            raise CommandError(f"{len(regressions)} regression(s) against the baseline:\n" + "\n".join(regressions))
+        self.stderr.write(self.style.SUCCESS("Benchmark complete."))
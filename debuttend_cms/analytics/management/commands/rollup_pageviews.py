@@ -0,0 +1,25 @@
+"""Fold new raw page views into the analytics rollup tables."""
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+
+from analytics.rollups import prune_rollup_sources, rollup_pageviews
+
+
+class Command(BaseCommand):
+    help = "Incrementally roll up raw page views into hourly/daily tables and apply retention."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=50000, help="Raw rows processed per transaction.")
+        parser.add_argument("--settle-seconds", type=int, default=None, help="Skip rows younger than this.")
+        parser.add_argument("--no-prune", action="store_true", help="Do not apply raw-event retention.")
+
+    def handle(self, *args, **options):
+        result = rollup_pageviews(chunk_size=options["chunk_size"], settle_seconds=options["settle_seconds"])
+        self.stdout.write(
+            f"Rolled up {result.rows} page views in {result.chunks} chunk(s); settled until {result.settled_until}."
+        )
+        if not options["no_prune"]:
+            pruned = prune_rollup_sources()
+            self.stdout.write(f"Pruned {pruned['raw']} raw page views and {pruned['hourly']} hourly rows.")
+        self.stdout.write(self.style.SUCCESS("Rollup complete."))
@@ -0,0 +1,179 @@
+"""Request latency and database metrics aggregated per URL name.
+
+``RequestMetricsMiddleware`` records every request into a process-local
+``MetricsRegistry``: a log-bucketed latency histogram (fixed memory, roughly 19%
+relative precision), database query counts and time, and error counts. Each
+worker periodically publishes its snapshot to the shared cache and
+``collect_metrics`` merges the snapshots of all live workers, which is what the
+analytics dashboard and the JSON endpoint report.
+"""
+from __future__ import annotations
+
+import math
+import os
+import socket
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+# Workers register by taking a slot number from this counter; only the newest MAX_WORKER_SLOTS are read.
+WORKER_SEQ_KEY = "metrics:workers:seq"
+MAX_WORKER_SLOTS = 256
+
+# Bucket i covers latencies up to MIN_LATENCY_MS * 2 ** (i / BUCKETS_PER_DOUBLING).
+MIN_LATENCY_MS = 0.1
+BUCKETS_PER_DOUBLING = 4
+BUCKET_COUNT = 80  # upper bound ~ 60s
+BUCKET_BOUNDS = [MIN_LATENCY_MS * 2 ** (idx / BUCKETS_PER_DOUBLING) for idx in range(BUCKET_COUNT)]
+
+VIEW_GROUPS = (
+    ("search:", "search"),
+    ("dashboard:", "dashboard"),
+    ("integrations:", "integrations"),
+    ("wagtailapi", "api"),
+    ("api:", "api"),
+    ("wagtail_serve", "page_serve"),
+    ("analytics:", "analytics"),
+)
+
+
+def bucket_for(latency_ms: float) -> int:
+    if latency_ms <= MIN_LATENCY_MS:
+        return 0
+    idx = math.ceil(BUCKETS_PER_DOUBLING * math.log2(latency_ms / MIN_LATENCY_MS))
+    return min(idx, BUCKET_COUNT - 1)
+
+
+def percentile(buckets: list[int], fraction: float) -> float | None:
+    total = sum(buckets)
+    if not total:
+        return None
+    threshold = fraction * total
+    running = 0
+    for idx, count in enumerate(buckets):
+        running += count
+        if running >= threshold:
+            return round(BUCKET_BOUNDS[idx], 2)
+    return round(BUCKET_BOUNDS[-1], 2)
+
+
+def group_for(view_name: str) -> str:
+    for prefix, group in VIEW_GROUPS:
+        if view_name.startswith(prefix):
+            return group
+    return "other"
+
+
+def empty_stats() -> dict:
+    return {"requests": 0, "errors": 0, "db_queries": 0, "db_time_ms": 0.0, "buckets": [0] * BUCKET_COUNT}
+
+
+def merge_stats(target: dict, source: dict) -> dict:
+    target["requests"] += source["requests"]
+    target["errors"] += source["errors"]
+    target["db_queries"] += source["db_queries"]
+    target["db_time_ms"] += source["db_time_ms"]
+    target["buckets"] = [left + right for left, right in zip(target["buckets"], source["buckets"])]
+    return target
+
+
+def summarize(stats: dict) -> dict:
+    requests = stats["requests"]
+    return {
+        "requests": requests,
+        "error_rate": stats["errors"] / requests if requests else 0.0,
+        "p50_ms": percentile(stats["buckets"], 0.50),
+        "p95_ms": percentile(stats["buckets"], 0.95),
+        "p99_ms": percentile(stats["buckets"], 0.99),
+        "avg_db_queries": round(stats["db_queries"] / requests, 2) if requests else 0.0,
+        "avg_db_time_ms": round(stats["db_time_ms"] / requests, 2) if requests else 0.0,
+    }
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._views: dict[str, dict] = {}
+        self._last_published = 0.0
+        self.started_at = time.time()
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self.slot: int | None = None
+
+    def record(self, view_name: str, latency_ms: float, error: bool, db_queries: int, db_time_ms: float) -> None:
+        with self._lock:
+            stats = self._views.get(view_name)
+            if stats is None:
+                stats = self._views[view_name] = empty_stats()
+            stats["requests"] += 1
+            stats["errors"] += int(error)
+            stats["db_queries"] += db_queries
+            stats["db_time_ms"] += db_time_ms
+            stats["buckets"][bucket_for(latency_ms)] += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "started_at": self.started_at,
+                "views": {name: dict(stats, buckets=list(stats["buckets"])) for name, stats in self._views.items()},
+            }
+
+    def maybe_publish(self) -> None:
+        interval = getattr(settings, "METRICS_PUBLISH_INTERVAL", 10)
+        now = time.monotonic()
+        if now - self._last_published < interval:
+            return
+        self._last_published = now
+        self.publish()
+
+    def publish(self) -> None:
+        """Store this worker's snapshot in the shared cache and register the worker."""
+        if self.worker_id != f"{socket.gethostname()}:{os.getpid()}":
+            # Forked after import: start a fresh registry for this worker.
+            with self._lock:
+                self._views.clear()
+                self.started_at = time.time()
+                self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+                self.slot = None
+        if self.slot is None or cache.get(WORKER_SEQ_KEY, 0) - self.slot >= MAX_WORKER_SLOTS:
+            # cache.incr is atomic, so workers registering at the same time never overwrite each other.
+            cache.add(WORKER_SEQ_KEY, 0, None)
+            self.slot = cache.incr(WORKER_SEQ_KEY)
+        ttl = getattr(settings, "METRICS_WORKER_TTL", 300)
+        cache.set(slot_key(self.slot), dict(self.snapshot(), worker_id=self.worker_id), ttl)
+
+
+def slot_key(slot: int) -> str:
+    return f"metrics:worker:{slot}"
+
+
+registry = MetricsRegistry()
+
+
+def collect_metrics() -> dict:
+    """Merge the published snapshots of every live worker."""
+    registry.publish()
+    last_slot = cache.get(WORKER_SEQ_KEY, 0)
+    # Slots of workers that stopped publishing expire after METRICS_WORKER_TTL.
+    snapshots = cache.get_many(
+        [slot_key(slot) for slot in range(max(1, last_slot - MAX_WORKER_SLOTS + 1), last_slot + 1)]
+    )
+
+    views: dict[str, dict] = {}
+    groups: dict[str, dict] = {}
+    overall = empty_stats()
+    for snapshot in snapshots.values():
+        for name, stats in snapshot["views"].items():
+            merge_stats(views.setdefault(name, empty_stats()), stats)
+            merge_stats(groups.setdefault(group_for(name), empty_stats()), stats)
+            merge_stats(overall, stats)
+
+    started = [snapshot["started_at"] for snapshot in snapshots.values()]
+    return {
+        "workers": len(snapshots),
+        "since": min(started) if started else None,
+        "overall": summarize(overall),
+        "groups": {name: summarize(stats) for name, stats in sorted(groups.items())},
+        "views": {name: summarize(stats) for name, stats in sorted(views.items())},
+    }
@@ -0,0 +1,70 @@
+"""Middleware capturing page views and request metrics for the analytics dashboard."""
+from __future__ import annotations
+
+import time
+
+from django.conf import settings
+from django.utils import timezone
+
+from .buffer import get_buffer
+from .metrics import registry
+from .queries import track_queries
+
+
+class PageViewMiddleware:
+    """Record successful views of live Wagtail pages into the in-process buffer.
+
+    Pages rendered by Wagtail are flagged by the ``before_serve_page`` hook in
+    ``analytics.wagtail_hooks``; responses answered by the page output cache
+    carry the page id set by ``home.middleware.PageCacheMiddleware``.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if request.method == "GET" and response.status_code == 200 and getattr(settings, "ANALYTICS_ENABLED", True):
+            page_id = getattr(request, "analytics_page_id", None) or getattr(request, "page_cache_page_id", None)
+            if page_id is not None:
+                site = getattr(request, "_wagtail_site", None)
+                get_buffer().record(
+                    page_id,
+                    site.pk if site else None,
+                    request.path,
+                    request.META.get("HTTP_REFERER", ""),
+                    timezone.now(),
+                )
+        return response
+
+
+class RequestMetricsMiddleware:
+    """Record latency, database usage and errors per URL name into ``analytics.metrics``."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        start = time.perf_counter()
+        with track_queries() as timer:
+            response = self.get_response(request)
+        latency_ms = (time.perf_counter() - start) * 1000
+
+        registry.record(
+            self.get_view_name(request),
+            latency_ms,
+            error=response.status_code >= 500,
+            db_queries=timer.count,
+            db_time_ms=timer.time_ms,
+        )
+        registry.maybe_publish()
+        return response
+
+    def get_view_name(self, request) -> str:
+        match = getattr(request, "resolver_match", None)
+        if match is not None:
+            return match.view_name
+        # Pages answered by the page cache or a prerendered file never reach URL resolution.
+        if getattr(request, "page_cache_page_id", None) is not None or getattr(request, "analytics_page_id", None) is not None:
+            return "wagtail_serve"
+        return "unresolved"
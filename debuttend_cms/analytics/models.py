@@ -0,0 +1,92 @@
+"""Analytics data captured from public page traffic."""
+from __future__ import annotations
+
+from django.db import models
+
+
+class PageView(models.Model):
+    """A single view of a live Wagtail page.
+
+    Rows are append-only and written in batches by ``analytics.buffer``, so the
+    page and site references skip database constraints and cascades.
+    """
+
+    page = models.ForeignKey(
+        "wagtailcore.Page",
+        null=True,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name="+",
+    )
+    site = models.ForeignKey(
+        "wagtailcore.Site",
+        null=True,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name="+",
+    )
+    path = models.CharField(max_length=255)
+    referrer = models.CharField(max_length=255, blank=True)
+    viewed_at = models.DateTimeField(db_index=True)
+
+    class Meta:
+        indexes = [models.Index(fields=["page", "viewed_at"], name="analytics_pageview_page_time")]
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"{self.path} @ {self.viewed_at:%Y-%m-%d %H:%M}"
+
+
+class PageViewRollup(models.Model):
+    """Pre-aggregated view counts maintained by the ``rollup_pageviews`` command."""
+
+    page = models.ForeignKey(
+        "wagtailcore.Page",
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name="+",
+    )
+    views = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        abstract = True
+
+
+class HourlyPageViews(PageViewRollup):
+    hour = models.DateTimeField(db_index=True)
+
+    class Meta:
+        constraints = [models.UniqueConstraint(fields=["page", "hour"], name="analytics_hourly_page_hour")]
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"page {self.page_id} @ {self.hour:%Y-%m-%d %H:00}: {self.views}"
+
+
+class DailyPageViews(PageViewRollup):
+    day = models.DateField(db_index=True)
+
+    class Meta:
+        constraints = [models.UniqueConstraint(fields=["page", "day"], name="analytics_daily_page_day")]
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"page {self.page_id} @ {self.day:%Y-%m-%d}: {self.views}"
+
+
+class DailyTraffic(models.Model):
+    """Site-wide view totals per day, read directly by the dashboard traffic chart."""
+
+    day = models.DateField(unique=True)
+    views = models.PositiveIntegerField(default=0)
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"{self.day:%Y-%m-%d}: {self.views}"
+
+
+class RollupWatermark(models.Model):
+    """Raw ``PageView`` rows viewed before ``settled_until`` are already folded into the rollup tables."""
+
+    name = models.CharField(max_length=50, unique=True)
+    settled_until = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"{self.name} @ {self.settled_until}"
@@ -0,0 +1,33 @@
+"""Counting and timing the database queries made while a block of code runs."""
+from __future__ import annotations
+
+import time
+from contextlib import ExitStack, contextmanager
+
+from django.db import connections
+
+
+class QueryTimer:
+    """``execute_wrapper`` callable counting and timing database queries."""
+
+    def __init__(self):
+        self.count = 0
+        self.time_ms = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.time_ms += (time.perf_counter() - start) * 1000
+
+
+@contextmanager
+def track_queries():
+    """Watch every configured database, replicas included, without opening connections."""
+    timer = QueryTimer()
+    with ExitStack() as stack:
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(timer))
+        yield timer
@@ -0,0 +1,142 @@
+"""Incremental rollups of raw page views into hourly and daily tables.
+
+Each run folds raw ``PageView`` rows viewed between the stored watermark and a
+settled cutoff (now minus ``ANALYTICS_ROLLUP_SETTLE_SECONDS``) into
+``HourlyPageViews``, ``DailyPageViews`` and ``DailyTraffic``, advancing the
+watermark in the same transaction. The watermark is a ``viewed_at`` time rather
+than a row id: ids are assigned when a batch is written, so a batch that
+commits late can hold ids below rows already rolled up, but its ``viewed_at``
+values still fall after the previous cutoff as long as it is written within
+the settle window. The watermark row is locked with ``SELECT ... FOR UPDATE``
+so concurrent runs serialise instead of double counting.
+"""
+from __future__ import annotations
+
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count
+from django.db.models.functions import TruncDate, TruncHour
+from django.utils import timezone
+
+from .models import DailyPageViews, DailyTraffic, HourlyPageViews, PageView, RollupWatermark
+
+WATERMARK_NAME = "pageviews"
+
+
+@dataclass
+class RollupResult:
+    rows: int = 0
+    chunks: int = 0
+    settled_until: datetime | None = None
+
+
+def apply_increments(model, key_fields: tuple[str, ...], increments: Counter) -> None:
+    """Add ``increments`` (keyed by ``key_fields`` values) to existing rollup rows or create them."""
+    if not increments:
+        return
+    lookups = {f"{field}__in": {key[idx] for key in increments} for idx, field in enumerate(key_fields)}
+    to_update = []
+    for row in model.objects.filter(**lookups):
+        key = tuple(getattr(row, field) for field in key_fields)
+        if key in increments:
+            row.views += increments.pop(key)
+            to_update.append(row)
+    model.objects.bulk_update(to_update, ["views"], batch_size=1000)
+    model.objects.bulk_create(
+        [model(views=views, **dict(zip(key_fields, key))) for key, views in increments.items()],
+        batch_size=1000,
+    )
+
+
+def _counts(queryset, *fields) -> Counter:
+    return Counter({tuple(row[:-1]): row[-1] for row in queryset.values_list(*fields).annotate(views=Count("id"))})
+
+
+def rollup_chunk(lower: datetime | None, upper: datetime) -> int:
+    """Fold page views with ``lower <= viewed_at < upper`` into the rollups."""
+    rows = PageView.objects.filter(viewed_at__lt=upper)
+    if lower is not None:
+        rows = rows.filter(viewed_at__gte=lower)
+    with_page = rows.filter(page__isnull=False)
+    apply_increments(
+        HourlyPageViews,
+        ("page_id", "hour"),
+        _counts(with_page.annotate(hour=TruncHour("viewed_at")), "page_id", "hour"),
+    )
+    apply_increments(
+        DailyPageViews,
+        ("page_id", "day"),
+        _counts(with_page.annotate(day=TruncDate("viewed_at")), "page_id", "day"),
+    )
+    totals = _counts(rows.annotate(day=TruncDate("viewed_at")), "day")
+    apply_increments(DailyTraffic, ("day",), totals.copy())
+    return sum(totals.values())
+
+
+def rollup_pageviews(chunk_size: int = 50000, settle_seconds: int | None = None) -> RollupResult:
+    if settle_seconds is None:
+        settle_seconds = getattr(settings, "ANALYTICS_ROLLUP_SETTLE_SECONDS", 60)
+    result = RollupResult()
+    while True:
+        with transaction.atomic():
+            RollupWatermark.objects.get_or_create(name=WATERMARK_NAME)
+            watermark = RollupWatermark.objects.select_for_update().get(name=WATERMARK_NAME)
+            lower = watermark.settled_until
+            cutoff = timezone.now() - timedelta(seconds=settle_seconds)
+            if lower is not None and lower >= cutoff:
+                result.settled_until = lower
+                return result
+
+            pending = PageView.objects.filter(viewed_at__lt=cutoff)
+            if lower is not None:
+                pending = pending.filter(viewed_at__gte=lower)
+            boundary = next(
+                iter(pending.order_by("viewed_at").values_list("viewed_at", flat=True)[chunk_size:chunk_size + 1]),
+                None,
+            )
+            if boundary is None:
+                upper = cutoff
+            elif lower is not None and boundary <= lower:
+                # More than a chunk shares one timestamp; take all of them rather than stalling.
+                upper = lower + timedelta(microseconds=1)
+            else:
+                upper = boundary
+
+            result.rows += rollup_chunk(lower, upper)
+            result.chunks += 1
+            watermark.settled_until = upper
+            watermark.save(update_fields=["settled_until", "updated_at"])
+            if upper == cutoff:
+                result.settled_until = upper
+                return result
+
+
+def _delete_in_chunks(queryset, chunk_size: int) -> int:
+    deleted = 0
+    while True:
+        ids = list(queryset.order_by("pk").values_list("pk", flat=True)[:chunk_size])
+        if not ids:
+            return deleted
+        deleted += queryset.model.objects.filter(pk__in=ids).delete()[0]
+
+
+def prune_rollup_sources(chunk_size: int = 10000) -> dict[str, int]:
+    """Apply the configured retention to raw events and hourly rollups.
+
+    Only raw rows already covered by the watermark are removed.
+    """
+    now = timezone.now()
+    watermark = RollupWatermark.objects.filter(name=WATERMARK_NAME).values_list("settled_until", flat=True).first()
+    raw_cutoff = now - timedelta(days=getattr(settings, "ANALYTICS_RAW_RETENTION_DAYS", 30))
+    raw = PageView.objects.none() if watermark is None else PageView.objects.filter(
+        viewed_at__lt=min(raw_cutoff, watermark)
+    )
+    hourly_cutoff = now - timedelta(days=getattr(settings, "ANALYTICS_HOURLY_RETENTION_DAYS", 90))
+    return {
+        "raw": _delete_in_chunks(raw, chunk_size),
+        "hourly": _delete_in_chunks(HourlyPageViews.objects.filter(hour__lt=hourly_cutoff), chunk_size),
+    }
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import json
+import tempfile
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from wagtail.models import Page
+
+from analytics import benchmark
+from analytics.buffer import get_buffer
+from home.models import ArticlePage
+
+SMALL = benchmark.SeedOptions(articles=5, widgets=2, integrations=2, logs_per_integration=2, batch_size=2)
+
+
+class SeedTests(TestCase):
+    def test_bulk_added_articles_form_a_valid_tree(self):
+        added = benchmark.seed(SMALL)
+
+        self.assertEqual(added, {"articles": 5, "widgets": 2, "integrations": 2, "editors": 1})
+        parent = Page.objects.get(slug=benchmark.PARENT_SLUG)
+        self.assertEqual(parent.numchild, 5)
+        self.assertEqual(
+            list(ArticlePage.objects.child_of(parent).order_by("path").values_list("slug", flat=True)),
+            [f"article-{number:06d}" for number in range(5)],
+        )
+        self.assertEqual(Page.find_problems(), ([], [], [], [], []))
+        # Topping up again only adds what is missing.
+        self.assertEqual(benchmark.seed(SMALL)["articles"], 0)
+
+
+class RunTests(TestCase):
+    def setUp(self):
+        benchmark.seed(SMALL)
+
+    def tearDown(self):
+        get_buffer().flush()
+
+    def test_reports_each_scenario_and_mode(self):
+        report = benchmark.run(iterations=2, warmup=1, sample=2)
+
+        self.assertEqual(set(report["results"]), set(benchmark.SCENARIOS))
+        for modes in report["results"].values():
+            self.assertEqual(set(modes), {"warm", "cold"})
+            self.assertGreater(modes["cold"]["queries"], 0)
+
+    def test_cold_mode_leaves_the_site_cache_alone(self):
+        cache.set("site-entry", "kept")
+
+        benchmark.run(scenarios=["search"], iterations=2, warmup=1, sample=2, modes=("cold",))
+
+        self.assertEqual(cache.get("site-entry"), "kept")
+
+    def test_refuses_to_clear_a_cache_shared_with_the_site(self):
+        shared = {alias: settings.CACHES["default"] for alias in ("default", "benchmark")}
+        with override_settings(CACHES=shared), self.assertRaises(benchmark.BenchmarkError):
+            benchmark.run(scenarios=["search"], iterations=1, warmup=1, sample=2)
+
+    def test_editor_scenarios_need_the_seeded_user(self):
+        get_user_model().objects.filter(username=benchmark.USERNAME).delete()
+
+        with self.assertRaisesMessage(benchmark.BenchmarkError, "--seed"):
+            benchmark.run(scenarios=["dashboard"], iterations=1, warmup=1, sample=2)
+
+    def test_compare_flags_only_metrics_past_their_tolerance(self):
+        metrics = {"p95_ms": 10.0, "queries": 5, "alloc_peak_kib": 100.0}
+        baseline = {"results": {"search": {"warm": metrics}}}
+        report = {"results": {"search": {"warm": {**metrics, "p95_ms": 12.0, "queries": 7}}}}
+
+        regressions = benchmark.compare(report, baseline, benchmark.Thresholds(latency=0.25, queries=1))
+
+        self.assertEqual(regressions, ["search/warm queries: 7 > 6 (baseline 5)"])
+
+    def test_command_fails_on_regression_against_baseline(self):
+        with tempfile.TemporaryDirectory() as directory:
+            baseline = Path(directory) / "baseline.json"
+            metrics = {"p95_ms": 1e6, "queries": 0, "alloc_peak_kib": 1e6}
+            baseline.write_text(json.dumps({"results": {"page_serve": {"cold": metrics}}}))
+
+            with self.assertRaisesMessage(Exception, "regression(s) against the baseline"):
+                call_command(
+                    "benchmark",
+                    "--scenario=page_serve",
+                    "--iterations=2",
+                    "--warmup=1",
+                    f"--baseline={baseline}",
+                    f"--output={Path(directory) / 'report.json'}",
+                )
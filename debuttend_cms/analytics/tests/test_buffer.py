@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+from django.test import TestCase
+from django.utils import timezone
+
+from analytics.buffer import PageViewBuffer, write_page_views
+from analytics.models import PageView
+
+
+class PageViewBufferTests(TestCase):
+    def make_buffer(self) -> PageViewBuffer:
+        return PageViewBuffer(max_size=10, batch_size=5, flush_interval=60, writer=write_page_views)
+
+    def test_flush_keeps_hits_without_referrer(self):
+        buffer = self.make_buffer()
+        now = timezone.now()
+        buffer.record(None, None, "/about/", "", now)
+        buffer.record(None, None, "/news/", "https://example.com/", now)
+
+        self.assertEqual(buffer.flush(), 2)
+
+        self.assertEqual(buffer.stats()["failed"], 0)
+        self.assertEqual(
+            dict(PageView.objects.values_list("path", "referrer")),
+            {"/about/": "", "/news/": "https://example.com/"},
+        )
+
+    def test_full_buffer_drops_new_hits(self):
+        buffer = PageViewBuffer(max_size=1, batch_size=5, flush_interval=60, writer=lambda rows: None)
+        now = timezone.now()
+
+        self.assertTrue(buffer.record(None, None, "/", "", now))
+        self.assertFalse(buffer.record(None, None, "/", "", now))
+        self.assertEqual(buffer.stats()["dropped"], 1)
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase
+
+from analytics import metrics
+from analytics.middleware import RequestMetricsMiddleware
+
+
+class PercentileTests(TestCase):
+    def test_percentiles_stay_within_bucket_precision(self):
+        stats = metrics.empty_stats()
+        for latency_ms in range(1, 101):
+            stats["buckets"][metrics.bucket_for(latency_ms)] += 1
+            stats["requests"] += 1
+
+        summary = metrics.summarize(stats)
+
+        # Buckets are a quarter doubling wide, so a reported value is at most ~19% above the real one.
+        self.assertTrue(50 <= summary["p50_ms"] <= 50 * 1.19)
+        self.assertTrue(95 <= summary["p95_ms"] <= 95 * 1.19)
+        self.assertIsNone(metrics.percentile(metrics.empty_stats()["buckets"], 0.5))
+
+
+class CollectMetricsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        metrics.registry._views.clear()
+        metrics.registry.slot = None
+
+    def test_merges_published_workers_by_view_and_group(self):
+        for latencies in ([10, 10, 10], [1000]):
+            worker = metrics.MetricsRegistry()
+            for latency_ms in latencies:
+                worker.record("search:index", latency_ms, error=latency_ms > 100, db_queries=2, db_time_ms=1.0)
+            worker.record("wagtail_serve", 5, error=False, db_queries=0, db_time_ms=0.0)
+            worker.publish()
+
+        collected = metrics.collect_metrics()
+
+        search = collected["views"]["search:index"]
+        self.assertEqual(collected["workers"], 3)  # two workers plus this process's own registry
+        self.assertEqual(search["requests"], 4)
+        self.assertEqual(search["error_rate"], 0.25)
+        self.assertEqual(search["avg_db_queries"], 2)
+        self.assertTrue(10 <= search["p50_ms"] <= 12)
+        self.assertTrue(1000 <= search["p99_ms"] <= 1190)
+        self.assertEqual(collected["groups"]["page_serve"]["requests"], 2)
+        self.assertEqual(collected["overall"]["requests"], 6)
+
+
+class ViewNameTests(TestCase):
+    def test_prerendered_and_cached_pages_count_as_page_serve(self):
+        middleware = RequestMetricsMiddleware(lambda request: HttpResponse())
+        prerendered, cached, unknown = (RequestFactory().get("/article/") for _ in range(3))
+        prerendered.analytics_page_id = 3
+        cached.page_cache_page_id = 3
+
+        self.assertEqual(middleware.get_view_name(prerendered), "wagtail_serve")
+        self.assertEqual(middleware.get_view_name(cached), "wagtail_serve")
+        self.assertEqual(middleware.get_view_name(unknown), "unresolved")
@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+from datetime import timedelta
+
+from django.test import TestCase
+from django.utils import timezone
+
+from analytics.models import DailyTraffic, PageView, RollupWatermark
+from analytics.rollups import WATERMARK_NAME, rollup_pageviews
+
+
+class RollupPageViewsTests(TestCase):
+    def view(self, viewed_at):
+        return PageView.objects.create(path="/", viewed_at=viewed_at)
+
+    def total_views(self) -> int:
+        return sum(DailyTraffic.objects.values_list("views", flat=True))
+
+    def test_leaves_unsettled_views_for_the_next_run(self):
+        now = timezone.now()
+        self.view(now - timedelta(minutes=10))
+        self.view(now)
+
+        result = rollup_pageviews(settle_seconds=60)
+
+        self.assertEqual(result.rows, 1)
+        self.assertEqual(self.total_views(), 1)
+
+    def test_counts_late_committed_views_with_lower_ids(self):
+        now = timezone.now()
+        PageView.objects.create(pk=10, path="/", viewed_at=now - timedelta(minutes=10))
+        rollup_pageviews(settle_seconds=60)
+
+        # A batch recorded inside the settle window that committed after a higher id was rolled up.
+        PageView.objects.create(pk=5, path="/", viewed_at=now - timedelta(seconds=30))
+        rollup_pageviews(settle_seconds=0)
+
+        self.assertEqual(self.total_views(), 2)
+        self.assertGreater(RollupWatermark.objects.get(name=WATERMARK_NAME).settled_until, now - timedelta(seconds=30))
+
+    def test_chunks_do_not_count_views_twice(self):
+        viewed_at = timezone.now() - timedelta(hours=1)
+        for offset in range(5):
+            self.view(viewed_at + timedelta(seconds=offset % 2))
+
+        result = rollup_pageviews(chunk_size=2, settle_seconds=60)
+
+        self.assertGreater(result.chunks, 1)
+        self.assertEqual(self.total_views(), 5)
+        self.assertEqual(rollup_pageviews(chunk_size=2, settle_seconds=60).rows, 0)
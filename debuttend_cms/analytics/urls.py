@@ -3,10 +3,11 @@ from __future__ import annotations
 
 from django.urls import path
 
-from .views import AnalyticsDashboardView
+from .views import AnalyticsDashboardView, MetricsView
 
 app_name = "analytics"
 
 urlpatterns = [
     path("", AnalyticsDashboardView.as_view(), name="dashboard"),
+    path("metrics.json", MetricsView.as_view(), name="metrics"),
 ]
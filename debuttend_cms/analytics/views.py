@@ -1,34 +1,89 @@
-"""Analytics views leveraging mock data to outline dashboard behaviour."""
+"""Analytics views reading the pre-aggregated page-view rollups."""
 from __future__ import annotations
 
-from datetime import datetime, timedelta
+import time
+from datetime import timedelta
 
 from django.contrib.auth.mixins import LoginRequiredMixin
+from django.db.models import Sum
+from django.http import JsonResponse
+from django.utils import timezone
+from django.views import View
 from django.views.generic import TemplateView
+from wagtail.models import Page
+
+from dashboard import routing
+from home import block_cache
+from search import queue as search_queue
+
+from .buffer import get_buffer
+from .metrics import collect_metrics
+from .models import DailyPageViews, DailyTraffic
+
+TRAFFIC_DAYS = 7
+TOP_CONTENT_LIMIT = 5
 
 
 class AnalyticsDashboardView(LoginRequiredMixin, TemplateView):
     template_name = "analytics/dashboard.html"
 
+    def get_traffic(self, since):
+        visits = dict(DailyTraffic.objects.filter(day__gte=since).values_list("day", "views"))
+        days = [since + timedelta(days=idx) for idx in range(TRAFFIC_DAYS)]
+        return [{"date": day.strftime("%Y-%m-%d"), "visits": visits.get(day, 0)} for day in days]
+
+    def get_top_content(self, since):
+        rows = list(
+            DailyPageViews.objects.filter(day__gte=since)
+            .values_list("page_id")
+            .annotate(views=Sum("views"))
+            .order_by("-views")[:TOP_CONTENT_LIMIT]
+        )
+        titles = dict(Page.objects.filter(pk__in=[page_id for page_id, _ in rows]).values_list("pk", "title"))
+        return [{"title": titles.get(page_id, "(deleted page)"), "views": views} for page_id, views in rows]
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        now = datetime.utcnow()
+        since = timezone.localdate() - timedelta(days=TRAFFIC_DAYS - 1)
         context.update(
             {
-                "traffic": [
-                    {"date": (now - timedelta(days=idx)).strftime("%Y-%m-%d"), "visits": 120 + idx * 3}
-                    for idx in range(7)
-                ][::-1],
-                "top_content": [
-                    {"title": "Modular Content Strategies", "views": 523},
-                    {"title": "Integrating APIs with Debuttend", "views": 412},
-                    {"title": "Optimising CMS SEO", "views": 310},
-                ],
-                "system_health": {
-                    "uptime": "99.99%",
-                    "avg_response_time": "180ms",
-                    "error_rate": "0.02%",
-                },
+                "traffic": self.get_traffic(since),
+                "top_content": self.get_top_content(since),
+                **self.get_system_health(),
             }
         )
         return context
+
+    def get_system_health(self):
+        metrics = collect_metrics()
+        overall = metrics["overall"]
+        uptime = "n/a"
+        if metrics["since"]:
+            hours, seconds = divmod(int(time.time() - metrics["since"]), 3600)
+            uptime = f"{hours}h {seconds // 60}m"
+        return {
+            "system_health": {
+                "uptime": uptime,
+                "avg_response_time": f"{overall['p50_ms']}ms" if overall["p50_ms"] is not None else "n/a",
+                "error_rate": f"{overall['error_rate']:.2%}",
+                "workers": metrics["workers"],
+            },
+            "view_latency": [
+                {"name": name, "error_percent": stats["error_rate"] * 100, **stats}
+                for name, stats in metrics["groups"].items()
+            ],
+        }
+
+
+class MetricsView(LoginRequiredMixin, View):
+    """Merged request metrics across workers, the search queue lag, and this worker's cache and buffer counters."""
+
+    def get(self, request, *args, **kwargs):
+        payload = collect_metrics()
+        payload["search_queue"] = search_queue.stats()
+        payload["process"] = {
+            "pageview_buffer": get_buffer().stats(),
+            "block_cache": block_cache.stats.snapshot(),
+            "dashboard_routes": routing.stats.snapshot(),
+        }
+        return JsonResponse(payload)
@@ -0,0 +1,10 @@
+"""Wagtail hooks feeding the analytics pipeline."""
+from __future__ import annotations
+
+from wagtail import hooks
+
+
+@hooks.register("before_serve_page")
+def mark_served_page(page, request, serve_args, serve_kwargs):
+    # Picked up by analytics.middleware.PageViewMiddleware once the response is ready.
+    request.analytics_page_id = page.pk
@@ -0,0 +1,84 @@
+"""Resolution of ``DashboardPage.layout`` into renderable widget data.
+
+All widget ids referenced by the stream are collected from the raw block data
+and loaded with a single ``in_bulk`` query, preferring the translation that
+matches the dashboard page's locale. Resolved layouts are cached per page
+revision and locale; saving or deleting any widget bumps a generation counter
+so cached layouts are rebuilt on next access.
+"""
+from __future__ import annotations
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Q
+
+from debuttend_cms import generations
+from home.models import DashboardWidget
+
+GENERATION_KEY = "dashboard:layout:generation"
+
+
+def get_generation() -> int:
+    return generations.get(GENERATION_KEY)
+
+
+def bump_generation() -> None:
+    generations.bump(GENERATION_KEY)
+
+
+def layout_cache_key(page) -> str:
+    return f"dashboard:layout:{page.pk}:{page.live_revision_id or 0}:{page.locale_id}:{get_generation()}"
+
+
+def load_widgets(widget_ids, locale_id) -> dict[int, DashboardWidget]:
+    """Return referenced widgets keyed by the id stored in the layout, localised where possible."""
+    if not widget_ids:
+        return {}
+    referenced = DashboardWidget.objects.filter(pk__in=widget_ids)
+    widgets = DashboardWidget.objects.filter(
+        Q(pk__in=widget_ids)
+        | Q(locale_id=locale_id, translation_key__in=referenced.values("translation_key"))
+    ).in_bulk()
+    localized = {
+        widget.translation_key: widget for widget in widgets.values() if widget.locale_id == locale_id
+    }
+    resolved = {}
+    for widget_id in widget_ids:
+        widget = widgets.get(widget_id)
+        if widget is not None:
+            resolved[widget_id] = localized.get(widget.translation_key, widget)
+    return resolved
+
+
+def build_layout(page) -> list[dict]:
+    items = [item for item in page.layout.raw_data if item.get("type") == "widget"]
+    widget_ids = {item["value"].get("widget") for item in items} - {None}
+    widgets = load_widgets(widget_ids, page.locale_id)
+
+    layout = []
+    for item in items:
+        widget = widgets.get(item["value"].get("widget"))
+        if widget is None:
+            continue
+        layout.append(
+            {
+                "column_span": item["value"].get("column_span") or "1",
+                "widget": {
+                    "id": widget.pk,
+                    "title": widget.title,
+                    "description": widget.description,
+                    "widget_type": widget.widget_type,
+                    "configuration": widget.configuration,
+                },
+            }
+        )
+    return layout
+
+
+def resolve_layout(page) -> list[dict]:
+    key = layout_cache_key(page)
+    layout = cache.get(key)
+    if layout is None:
+        layout = build_layout(page)
+        cache.set(key, layout, getattr(settings, "DASHBOARD_LAYOUT_CACHE_TIMEOUT", 60 * 60))
+    return layout
@@ -0,0 +1,112 @@
+"""Hostname/port to ``DashboardPage`` resolution for ``DashboardView``.
+
+The mapping is held in a process-local dict backed by the shared cache. Both
+layers are tagged with a version stamp stored in the shared cache; Site changes
+and DashboardPage publish/move/delete bump the stamp (see ``dashboard.signals``)
+so every worker re-resolves on its next request.
+"""
+from __future__ import annotations
+
+import threading
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http.request import split_domain_port
+from wagtail.models import Site
+
+from debuttend_cms import generations
+from home.models import DashboardPage
+
+VERSION_KEY = "dashboard:route:version"
+DASHBOARD_SLUG = "dashboard"
+# Hostnames come from the Host header, so keep the local map bounded.
+MAX_LOCAL_ENTRIES = 1000
+
+_MISSING = object()
+_local_routes: dict[tuple[str, int], tuple[int, int | None]] = {}
+
+
+class RouteStats:
+    """Process-local counters for dashboard route resolution."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        self.requests = 0
+        self.local_hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+        self.queries = 0
+
+    def record_resolution(self, source: str) -> None:
+        with self._lock:
+            setattr(self, source, getattr(self, source) + 1)
+
+    def record_request(self, queries: int) -> None:
+        with self._lock:
+            self.requests += 1
+            self.queries += queries
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "local_hits": self.local_hits,
+                "shared_hits": self.shared_hits,
+                "misses": self.misses,
+                "queries": self.queries,
+                "queries_per_request": round(self.queries / self.requests, 2) if self.requests else 0.0,
+            }
+
+
+stats = RouteStats()
+
+
+def get_version() -> int:
+    return generations.get(VERSION_KEY)
+
+
+def bump_version() -> None:
+    generations.bump(VERSION_KEY)
+    _local_routes.clear()
+
+
+def lookup_dashboard_page_id(request) -> int | None:
+    site = Site.find_for_request(request)
+    if site is None:
+        site = Site.objects.order_by("-is_default_site").first()
+    if site is None:
+        return None
+    return (
+        DashboardPage.objects.filter(slug=DASHBOARD_SLUG, path__startswith=site.root_page.path)
+        .order_by("path")
+        .values_list("pk", flat=True)
+        .first()
+    )
+
+
+def resolve_dashboard_page_id(request) -> int | None:
+    hostname = split_domain_port(request.get_host())[0]
+    port = request.get_port()
+    version = get_version()
+
+    entry = _local_routes.get((hostname, port))
+    if entry is not None and entry[0] == version:
+        stats.record_resolution("local_hits")
+        return entry[1]
+
+    key = f"dashboard:route:{version}:{hostname}:{port}"
+    page_id = cache.get(key, _MISSING)
+    if page_id is _MISSING:
+        stats.record_resolution("misses")
+        page_id = lookup_dashboard_page_id(request)
+        cache.set(key, page_id, getattr(settings, "DASHBOARD_ROUTE_CACHE_TIMEOUT", 60 * 60 * 24))
+    else:
+        stats.record_resolution("shared_hits")
+
+    if len(_local_routes) >= MAX_LOCAL_ENTRIES:
+        _local_routes.clear()
+    _local_routes[(hostname, port)] = (version, page_id)
+    return page_id
@@ -0,0 +1,32 @@
+"""Signal receivers invalidating cached dashboard data."""
+from __future__ import annotations
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from wagtail.models import Site
+from wagtail.signals import page_published, page_unpublished, post_page_move
+
+from home.models import DashboardPage, DashboardWidget
+
+from . import layout, routing
+
+
+@receiver(post_save, sender=DashboardWidget)
+@receiver(post_delete, sender=DashboardWidget)
+def invalidate_dashboard_layouts(sender, instance, **kwargs):
+    layout.bump_generation()
+
+
+@receiver(post_save, sender=Site)
+@receiver(post_delete, sender=Site)
+@receiver(page_published, sender=DashboardPage)
+@receiver(page_unpublished, sender=DashboardPage)
+@receiver(post_delete, sender=DashboardPage)
+def invalidate_dashboard_routes(sender, instance, **kwargs):
+    routing.bump_version()
+
+
+@receiver(post_page_move)
+def invalidate_dashboard_routes_on_move(sender, instance, **kwargs):
+    # Moving any ancestor can take the dashboard out of (or into) a site tree.
+    routing.bump_version()
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from wagtail.models import Site
+
+from dashboard import layout
+from home.models import DashboardPage, DashboardWidget
+
+
+# Query budgets count content queries; keep cache reads off the database cache.
+@override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}})
+class ResolveLayoutTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.stats = DashboardWidget.objects.create(title="Visitors", widget_type="stats")
+        self.chart = DashboardWidget.objects.create(title="Traffic", widget_type="chart", configuration={"days": 7})
+        root = Site.objects.get(is_default_site=True).root_page
+        self.page = root.add_child(
+            instance=DashboardPage(
+                title="Dashboard",
+                slug="dashboard",
+                layout=[
+                    ("widget", {"widget": self.chart, "column_span": "2"}),
+                    ("widget", {"widget": self.stats, "column_span": "1"}),
+                ],
+            )
+        )
+
+    def test_builds_widgets_in_layout_order_with_one_query(self):
+        page = DashboardPage.objects.get(pk=self.page.pk)
+
+        with self.assertNumQueries(1):
+            resolved = layout.build_layout(page)
+
+        self.assertEqual([item["widget"]["title"] for item in resolved], ["Traffic", "Visitors"])
+        self.assertEqual([item["column_span"] for item in resolved], ["2", "1"])
+        self.assertEqual(resolved[0]["widget"]["configuration"], {"days": 7})
+
+    def test_skips_deleted_widgets(self):
+        self.stats.delete()
+
+        resolved = layout.resolve_layout(DashboardPage.objects.get(pk=self.page.pk))
+
+        self.assertEqual([item["widget"]["title"] for item in resolved], ["Traffic"])
+
+    def test_cached_until_a_widget_changes(self):
+        page = DashboardPage.objects.get(pk=self.page.pk)
+        layout.resolve_layout(page)
+
+        with self.assertNumQueries(0):
+            layout.resolve_layout(page)
+
+        self.chart.title = "Traffic this week"
+        self.chart.save()
+
+        self.assertEqual(layout.resolve_layout(page)[0]["widget"]["title"], "Traffic this week")
+
+    def test_evicted_generation_does_not_restart(self):
+        before = layout.get_generation()
+        layout.bump_generation()
+        bumped = layout.get_generation()
+        cache.delete(layout.GENERATION_KEY)
+
+        self.assertGreater(bumped, before)
+        self.assertNotIn(layout.get_generation(), {before, bumped})
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import RequestFactory, TestCase, override_settings
+from wagtail.models import Site
+
+from dashboard import routing
+from home.models import DashboardPage, DashboardWidget
+
+
+# Query budgets count content queries; keep cache reads off the database cache.
+@override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}})
+class ResolveDashboardPageTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        routing._local_routes.clear()
+        routing.stats.reset()
+        self.root = Site.objects.get(is_default_site=True).root_page
+        widget = DashboardWidget.objects.create(title="Visitors", widget_type="stats")
+        self.page = self.root.add_child(
+            instance=DashboardPage(title="Dashboard", slug="dashboard", layout=[("widget", {"widget": widget})])
+        )
+        self.request = RequestFactory().get("/dashboard/")
+
+    def test_resolves_once_then_answers_from_the_local_map(self):
+        self.assertEqual(routing.resolve_dashboard_page_id(self.request), self.page.pk)
+        self.assertEqual(routing.resolve_dashboard_page_id(self.request), self.page.pk)
+
+        snapshot = routing.stats.snapshot()
+        self.assertEqual((snapshot["misses"], snapshot["local_hits"]), (1, 1))
+
+    def test_other_workers_reuse_the_shared_entry(self):
+        routing.resolve_dashboard_page_id(self.request)
+        routing._local_routes.clear()
+
+        with self.assertNumQueries(0):
+            routing.stats.reset()
+            self.assertEqual(routing.resolve_dashboard_page_id(self.request), self.page.pk)
+        self.assertEqual(routing.stats.snapshot()["shared_hits"], 1)
+
+    def test_deleted_dashboard_is_no_longer_resolved(self):
+        routing.resolve_dashboard_page_id(self.request)
+        self.page.delete()
+
+        self.assertIsNone(routing.resolve_dashboard_page_id(self.request))
+
+    def test_view_renders_the_resolved_dashboard(self):
+        self.client.force_login(get_user_model().objects.create_superuser("editor", "", "password"))
+
+        response = self.client.get("/dashboard/")
+
+        self.assertContains(response, "Visitors")
+        self.assertEqual(routing.stats.snapshot()["requests"], 1)
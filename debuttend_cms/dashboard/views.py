@@ -3,25 +3,30 @@ from __future__ import annotations
 
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.http import Http404
-from django.shortcuts import get_object_or_404, render
+from django.shortcuts import render
 from django.views import View
-from wagtail.models import Site
 
+from analytics.queries import track_queries
 from home.models import DashboardPage
 
+from . import routing
+from .layout import resolve_layout
+
 
 class DashboardView(LoginRequiredMixin, View):
     template_name = "dashboard/index.html"
 
     def get(self, request, *args, **kwargs):
-        site = Site.find_for_request(request)
-        if site is None:
-            site = Site.objects.order_by("-is_default_site").first()
-        if site is None:
-            raise Http404("No Wagtail site configured.")
-        dashboard_page = get_object_or_404(
-            DashboardPage,
-            slug="dashboard",
-            path__startswith=site.root_page.path,
-        )
-        return render(request, self.template_name, {"page": dashboard_page})
+        with track_queries() as queries:
+            try:
+                return self.render_dashboard(request)
+            finally:
+                routing.stats.record_request(queries.count)
+
+    def render_dashboard(self, request):
+        page_id = routing.resolve_dashboard_page_id(request)
+        dashboard_page = DashboardPage.objects.filter(pk=page_id).first() if page_id else None
+        if dashboard_page is None:
+            raise Http404("No dashboard page configured for this site.")
+        context = {"page": dashboard_page, "layout": resolve_layout(dashboard_page)}
+        return render(request, self.template_name, context)
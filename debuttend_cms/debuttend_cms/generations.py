@@ -0,0 +1,29 @@
+"""Generation counters in the shared cache for invalidating derived caches.
+
+Callers fold ``get(key)`` into their cache keys and call ``bump(key)`` when the
+underlying data changes, so stale entries are simply never read again. A
+missing counter (never set, or evicted) is seeded from the clock instead of a
+fixed start value, so a counter that is lost and recreated cannot return to a
+generation that entries were already cached under.
+"""
+from __future__ import annotations
+
+import time
+
+from django.core.cache import cache
+
+
+def get(key: str) -> int:
+    generation = cache.get(key)
+    if generation is None:
+        generation = time.time_ns()
+        if not cache.add(key, generation, None):
+            generation = cache.get(key, generation)
+    return generation
+
+
+def bump(key: str) -> None:
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns(), None)
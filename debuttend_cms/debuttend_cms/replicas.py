@@ -0,0 +1,161 @@
+"""Read-replica routing for public traffic.
+
+``ReplicaRoutingMiddleware`` marks safe requests outside ``DATABASE_PRIMARY_PATHS``
+(page serving, search, the API, analytics) as eligible for a replica. For those
+requests ``ReplicaRouter`` sends reads to one healthy alias from
+``DATABASE_REPLICAS``, chosen once per request. Everything else goes to
+``default``: writes, the admin, background threads and management commands.
+
+Once a request writes, the rest of it reads from the primary. The response also
+sets a short-lived cookie that keeps that client on the primary for
+``DATABASE_REPLICA_STICKY_SECONDS``, so an editor who has just published sees
+their change. Replica health is checked per process at most every
+``DATABASE_REPLICA_CHECK_INTERVAL`` seconds. A replica that cannot be reached,
+or that lags more than ``DATABASE_REPLICA_MAX_LAG`` seconds behind on
+PostgreSQL, is skipped until its next check.
+"""
+from __future__ import annotations
+
+import logging
+import random
+import threading
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+
+logger = logging.getLogger(__name__)
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+STICKY_COOKIE = "db_primary"
+
+LAG_QUERY = (
+    "SELECT CASE WHEN NOT pg_is_in_recovery() OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END"
+)
+
+
+@dataclass
+class RoutingState:
+    use_replica: bool
+    alias: str | None = None
+    wrote: bool = False
+
+
+_state: ContextVar[RoutingState | None] = ContextVar("db_routing_state", default=None)
+
+
+def get_replicas() -> list[str]:
+    return list(getattr(settings, "DATABASE_REPLICAS", []))
+
+
+class ReplicaHealth:
+    """Process-local replica health, refreshed lazily once the last check is older than the interval."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._checked: dict[str, tuple[bool, float]] = {}
+
+    def check(self, alias: str) -> bool:
+        connection = connections[alias]
+        try:
+            with connection.cursor() as cursor:
+                if connection.vendor != "postgresql":
+                    cursor.execute("SELECT 1")
+                    return True
+                cursor.execute(LAG_QUERY)
+                lag = cursor.fetchone()[0]
+        except DatabaseError:
+            logger.warning("Database replica %s is unreachable; reading from the primary", alias, exc_info=True)
+            connection.close()
+            return False
+        if lag is not None and float(lag) > getattr(settings, "DATABASE_REPLICA_MAX_LAG", 10):
+            logger.warning("Database replica %s is %.1fs behind; reading from the primary", alias, lag)
+            return False
+        return True
+
+    def is_healthy(self, alias: str) -> bool:
+        now = time.monotonic()
+        with self._lock:
+            checked = self._checked.get(alias)
+        if checked is not None and now - checked[1] < getattr(settings, "DATABASE_REPLICA_CHECK_INTERVAL", 5):
+            return checked[0]
+        healthy = self.check(alias)
+        with self._lock:
+            self._checked[alias] = (healthy, now)
+        return healthy
+
+    def snapshot(self) -> dict[str, bool]:
+        with self._lock:
+            return {alias: healthy for alias, (healthy, _) in self._checked.items()}
+
+
+health = ReplicaHealth()
+
+
+def choose_replica() -> str | None:
+    healthy = [alias for alias in get_replicas() if health.is_healthy(alias)]
+    return random.choice(healthy) if healthy else None
+
+
+def use_replica_for(request) -> bool:
+    return (
+        bool(get_replicas())
+        and request.method in SAFE_METHODS
+        and STICKY_COOKIE not in request.COOKIES
+        and not request.path.startswith(tuple(getattr(settings, "DATABASE_PRIMARY_PATHS", ())))
+    )
+
+
+class ReplicaRouter:
+    """Send reads of replica-eligible requests to a replica; everything else uses the default database."""
+
+    def db_for_read(self, model, **hints):
+        state = _state.get()
+        if state is None or not state.use_replica or state.wrote:
+            return None
+        # Reads inside a transaction on the primary must see its uncommitted writes.
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return None
+        if state.alias is None:
+            state.alias = choose_replica() or DEFAULT_DB_ALIAS
+        return state.alias
+
+    def db_for_write(self, model, **hints):
+        state = _state.get()
+        if state is not None:
+            state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas mirror the primary, so objects read from either may be related.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return False if db in get_replicas() else None
+
+
+class ReplicaRoutingMiddleware:
+    """Route the request's reads to a replica when eligible and pin writing clients to the primary."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        state = RoutingState(use_replica=use_replica_for(request))
+        token = _state.set(state)
+        try:
+            response = self.get_response(request)
+        finally:
+            _state.reset(token)
+        if get_replicas() and (state.wrote or request.method not in SAFE_METHODS):
+            response.set_cookie(
+                STICKY_COOKIE,
+                "1",
+                max_age=getattr(settings, "DATABASE_REPLICA_STICKY_SECONDS", 5),
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
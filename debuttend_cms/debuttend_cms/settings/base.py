@@ -50,14 +50,20 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "analytics.middleware.RequestMetricsMiddleware",
+    "debuttend_cms.replicas.ReplicaRoutingMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
+    "analytics.middleware.PageViewMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
-    "wagtail.contrib.redirects.middleware.RedirectMiddleware",
+    # Below clickjacking/security so cached and pre-rendered responses still get their headers.
+    "home.middleware.PageCacheMiddleware",
+    "home.middleware.PrerenderMiddleware",
+    "home.middleware.RedirectMiddleware",
 ]
 
 ROOT_URLCONF = "debuttend_cms.urls"
@@ -91,6 +97,44 @@ DATABASES = {
     }
 }
 
+# Read replicas for public traffic (see debuttend_cms.replicas): comma-separated host[:port] entries
+# that share the primary's credentials. Routing is a no-op while the list is empty.
+DATABASE_REPLICAS = []
+for _index, _address in enumerate(filter(None, os.getenv("DJANGO_DB_REPLICAS", "").split(",")), start=1):
+    _host, _, _port = _address.strip().partition(":")
+    DATABASES[f"replica_{_index}"] = {
+        **DATABASES["default"],
+        "HOST": _host,
+        "PORT": _port or DATABASES["default"]["PORT"],
+        "OPTIONS": (
+            {"connect_timeout": int(os.getenv("DJANGO_DB_REPLICA_CONNECT_TIMEOUT", "2"))}
+            if DATABASES["default"]["ENGINE"] == "django.db.backends.postgresql"
+            else {}
+        ),
+        "TEST": {"MIRROR": "default"},
+    }
+    DATABASE_REPLICAS.append(f"replica_{_index}")
+DATABASE_ROUTERS = ["debuttend_cms.replicas.ReplicaRouter"]
+DATABASE_REPLICA_STICKY_SECONDS = int(os.getenv("DJANGO_DB_REPLICA_STICKY_SECONDS", "5"))
+DATABASE_REPLICA_CHECK_INTERVAL = float(os.getenv("DJANGO_DB_REPLICA_CHECK_INTERVAL", "5"))
+DATABASE_REPLICA_MAX_LAG = float(os.getenv("DJANGO_DB_REPLICA_MAX_LAG", "10"))
+DATABASE_PRIMARY_PATHS = ["/cms/", "/django-admin/", "/dashboard/", "/integrations/"]
+
+CACHES = {
+    "default": {
+        # The page cache and the version stamps built on it must be shared by every
+        # worker, so the default is the database cache (``manage.py createcachetable``).
+        "BACKEND": os.getenv("DJANGO_CACHE_BACKEND", "django.core.cache.backends.db.DatabaseCache"),
+        "LOCATION": os.getenv("DJANGO_CACHE_LOCATION", "debuttend_cache"),
+    },
+    # Stands in for "default" while ``manage.py benchmark`` runs, so its cold mode never clears the site's cache.
+    "benchmark": {
+        "BACKEND": os.getenv("DJANGO_BENCHMARK_CACHE_BACKEND", "django.core.cache.backends.db.DatabaseCache"),
+        "LOCATION": os.getenv("DJANGO_BENCHMARK_CACHE_LOCATION", "debuttend_benchmark_cache"),
+    },
+}
+BENCHMARK_CACHE_ALIAS = "benchmark"
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         "NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator",
@@ -141,10 +185,96 @@ REST_FRAMEWORK = {
 }
 
 WAGTAILAPI_LIMIT_MAX = 50
+# Rows fetched per round trip by the streaming page export (/api/v2/export/pages/).
+PAGE_EXPORT_CHUNK_SIZE = int(os.getenv("DJANGO_PAGE_EXPORT_CHUNK_SIZE", "500"))
 
-SEARCH_BACKENDS = {
+# Index saved objects from a queue drained by process_search_queue instead of inline (see search.queue).
+# Only enable it where a ``process_search_queue --loop`` worker runs, or indexing stops.
+SEARCH_QUEUE_ENABLED = os.getenv("DJANGO_SEARCH_QUEUE_ENABLED", "0") == "1"
+SEARCH_QUEUE_BATCH_SIZE = int(os.getenv("DJANGO_SEARCH_QUEUE_BATCH_SIZE", "500"))
+SEARCH_QUEUE_MAX_LAG = int(os.getenv("DJANGO_SEARCH_QUEUE_MAX_LAG", "300"))
+
+WAGTAILSEARCH_BACKENDS = {
     "default": {
         "BACKEND": "wagtail.search.backends.database",
-        "AUTO_UPDATE": True,
+        "AUTO_UPDATE": not SEARCH_QUEUE_ENABLED,
     }
 }
+
+# Full-page output cache for anonymous HomePage/ArticlePage views (see home.page_cache).
+PAGE_CACHE_ENABLED = os.getenv("DJANGO_PAGE_CACHE_ENABLED", "1") == "1"
+PAGE_CACHE_ALIAS = "default"
+PAGE_CACHE_TIMEOUT = int(os.getenv("DJANGO_PAGE_CACHE_TIMEOUT", "3600"))
+# Rendition specs generated when a page is published (see home.renditions). Keys are image
+# foreign keys or StreamField paths; keep these in step with the templates.
+IMAGE_RENDITION_SPECS = {
+    "home.HomePage": {
+        "og_image": ["fill-1200x630"],
+        "body.hero.background_image": ["fill-1600x900"],
+    },
+    "home.ArticlePage": {
+        "featured_image": ["fill-1200x600"],
+        "og_image": ["fill-1200x630"],
+        "body.image": ["original"],
+    },
+}
+RENDITION_PREGENERATE = os.getenv("DJANGO_RENDITION_PREGENERATE", "1") == "1"
+# Background processes generating renditions; 0 generates them inline after commit.
+RENDITION_WORKERS = int(os.getenv("DJANGO_RENDITION_WORKERS", "2"))
+# Embed resolution (see home.embeds). Use "home.embeds.LocalEmbedFinder" to work offline.
+WAGTAILEMBEDS_FINDERS = [{"class": os.getenv("DJANGO_EMBED_FINDER", "wagtail.embeds.finders.oembed")}]
+EMBED_TTL = int(os.getenv("DJANGO_EMBED_TTL", str(7 * 24 * 60 * 60)))
+EMBED_NEGATIVE_TTL = int(os.getenv("DJANGO_EMBED_NEGATIVE_TTL", "3600"))
+EMBED_WORKERS = int(os.getenv("DJANGO_EMBED_WORKERS", "2"))
+# Background threads recompiling rich text after a linked object changes; 0 recompiles inline after commit.
+RICHTEXT_WORKERS = int(os.getenv("DJANGO_RICHTEXT_WORKERS", "1"))
+PRERENDER_ENABLED = os.getenv("DJANGO_PRERENDER_ENABLED", "1") == "1"
+PRERENDER_ROOT = Path(os.getenv("DJANGO_PRERENDER_ROOT", BASE_DIR / "prerendered"))
+# Seconds between checks for manifests rewritten by ``manage.py prerender_pages``.
+PRERENDER_RELOAD_INTERVAL = int(os.getenv("DJANGO_PRERENDER_RELOAD_INTERVAL", "5"))
+API_CACHE_ENABLED = os.getenv("DJANGO_API_CACHE_ENABLED", "1") == "1"
+API_CACHE_TIMEOUT = int(os.getenv("DJANGO_API_CACHE_TIMEOUT", "600"))
+
+# StreamField block fragment cache used by the ``include_cached_block`` tag (see home.block_cache).
+BLOCK_CACHE_ALIAS = "default"
+BLOCK_CACHE_TIMEOUT = int(os.getenv("DJANGO_BLOCK_CACHE_TIMEOUT", "86400"))
+
+# Dashboard layout and site-to-dashboard route caches (see dashboard.layout, dashboard.routing).
+DASHBOARD_LAYOUT_CACHE_TIMEOUT = int(os.getenv("DJANGO_DASHBOARD_LAYOUT_CACHE_TIMEOUT", "3600"))
+DASHBOARD_ROUTE_CACHE_TIMEOUT = int(os.getenv("DJANGO_DASHBOARD_ROUTE_CACHE_TIMEOUT", "86400"))
+
+# Page-view capture and rollups (see analytics.buffer, analytics.rollups).
+ANALYTICS_ENABLED = os.getenv("DJANGO_ANALYTICS_ENABLED", "1") == "1"
+ANALYTICS_BUFFER_MAX_SIZE = int(os.getenv("DJANGO_ANALYTICS_BUFFER_MAX_SIZE", "10000"))
+ANALYTICS_FLUSH_BATCH_SIZE = int(os.getenv("DJANGO_ANALYTICS_FLUSH_BATCH_SIZE", "500"))
+ANALYTICS_FLUSH_INTERVAL = float(os.getenv("DJANGO_ANALYTICS_FLUSH_INTERVAL", "5"))
+ANALYTICS_ROLLUP_SETTLE_SECONDS = int(os.getenv("DJANGO_ANALYTICS_ROLLUP_SETTLE_SECONDS", "60"))
+ANALYTICS_RAW_RETENTION_DAYS = int(os.getenv("DJANGO_ANALYTICS_RAW_RETENTION_DAYS", "30"))
+ANALYTICS_HOURLY_RETENTION_DAYS = int(os.getenv("DJANGO_ANALYTICS_HOURLY_RETENTION_DAYS", "90"))
+
+# Request latency/query metrics shared between workers (see analytics.metrics).
+METRICS_PUBLISH_INTERVAL = int(os.getenv("DJANGO_METRICS_PUBLISH_INTERVAL", "10"))
+METRICS_WORKER_TTL = int(os.getenv("DJANGO_METRICS_WORKER_TTL", "300"))
+
+# Text search configuration for the ArticlePage tsvector column (see search.fulltext).
+SEARCH_ARTICLE_CONFIG = os.getenv("DJANGO_SEARCH_ARTICLE_CONFIG", "english")
+SEARCH_SUGGEST_WARM_ON_START = os.getenv("DJANGO_SEARCH_SUGGEST_WARM_ON_START", "1") == "1"
+SEARCH_SUGGEST_MAX_RESULTS = int(os.getenv("DJANGO_SEARCH_SUGGEST_MAX_RESULTS", "10"))
+# Changes touching more pages than this make every worker rebuild instead of refreshing page by page.
+SEARCH_SUGGEST_MAX_JOURNALED = int(os.getenv("DJANGO_SEARCH_SUGGEST_MAX_JOURNALED", "200"))
+
+# Concurrent integration polling (see integrations.sync).
+INTEGRATION_SYNC_CONCURRENCY = int(os.getenv("DJANGO_INTEGRATION_SYNC_CONCURRENCY", "50"))
+INTEGRATION_SYNC_PER_HOST = int(os.getenv("DJANGO_INTEGRATION_SYNC_PER_HOST", "4"))
+INTEGRATION_SYNC_TIMEOUT = float(os.getenv("DJANGO_INTEGRATION_SYNC_TIMEOUT", "10"))
+INTEGRATION_SYNC_RETRIES = int(os.getenv("DJANGO_INTEGRATION_SYNC_RETRIES", "3"))
+INTEGRATION_SYNC_BACKOFF = float(os.getenv("DJANGO_INTEGRATION_SYNC_BACKOFF", "0.5"))
+INTEGRATION_SYNC_BATCH_SIZE = int(os.getenv("DJANGO_INTEGRATION_SYNC_BATCH_SIZE", "200"))
+# Integration.credential_key may only name environment variables starting with this prefix.
+INTEGRATION_CREDENTIAL_PREFIX = os.getenv("DJANGO_INTEGRATION_CREDENTIAL_PREFIX", "INTEGRATION_TOKEN_")
+INTEGRATION_LOG_RETENTION_DAYS = int(os.getenv("DJANGO_INTEGRATION_LOG_RETENTION_DAYS", "30"))
+INTEGRATION_LOG_PAGE_SIZE = int(os.getenv("DJANGO_INTEGRATION_LOG_PAGE_SIZE", "25"))
+INTEGRATION_HEALTH_CACHE_TIMEOUT = int(os.getenv("DJANGO_INTEGRATION_HEALTH_CACHE_TIMEOUT", "60"))
+# Sharded sitemaps (see home.sitemaps); at most 50,000 URLs per shard.
+SITEMAP_SHARD_SIZE = int(os.getenv("DJANGO_SITEMAP_SHARD_SIZE", "10000"))
+SITEMAP_CACHE_TIMEOUT = int(os.getenv("DJANGO_SITEMAP_CACHE_TIMEOUT", str(24 * 60 * 60)))
@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+from unittest import mock, skipUnless
+
+from django.contrib.auth import get_user_model
+from django.db import DEFAULT_DB_ALIAS, OperationalError, connections, transaction
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TransactionTestCase, override_settings
+
+from debuttend_cms import replicas
+
+REPLICA = "replica_1"
+
+
+def serve(request, view):
+    """Run ``view`` inside ``ReplicaRoutingMiddleware`` and return its result with the response."""
+    result = {}
+
+    def get_response(request):
+        result["value"] = view()
+        return HttpResponse()
+
+    response = replicas.ReplicaRoutingMiddleware(get_response)(request)
+    return result["value"], response
+
+
+def read_alias():
+    return get_user_model().objects.all().db
+
+
+@override_settings(DATABASE_REPLICAS=[REPLICA], DATABASE_PRIMARY_PATHS=["/cms/", "/dashboard/"])
+@mock.patch.object(replicas.health, "is_healthy", return_value=True)
+class ReplicaRouterTests(TransactionTestCase):
+    # TestCase would hold the primary in a transaction, which keeps every read on it.
+    def test_public_reads_go_to_a_replica(self, is_healthy):
+        alias, response = serve(RequestFactory().get("/articles/"), read_alias)
+
+        self.assertEqual(alias, REPLICA)
+        self.assertNotIn(replicas.STICKY_COOKIE, response.cookies)
+
+    def test_primary_paths_and_unsafe_methods_read_from_the_primary(self, is_healthy):
+        for request in (RequestFactory().get("/cms/pages/"), RequestFactory().post("/articles/")):
+            with self.subTest(path=request.path, method=request.method):
+                self.assertEqual(serve(request, read_alias)[0], DEFAULT_DB_ALIAS)
+
+    def test_reads_after_a_write_stay_on_the_primary(self, is_healthy):
+        def write_then_read():
+            get_user_model().objects.create_user("reader")
+            return read_alias()
+
+        alias, response = serve(RequestFactory().get("/articles/"), write_then_read)
+
+        self.assertEqual(alias, DEFAULT_DB_ALIAS)
+        self.assertIn(replicas.STICKY_COOKIE, response.cookies)
+
+    def test_sticky_cookie_keeps_the_client_on_the_primary(self, is_healthy):
+        request = RequestFactory().get("/articles/")
+        request.COOKIES[replicas.STICKY_COOKIE] = "1"
+
+        self.assertEqual(serve(request, read_alias)[0], DEFAULT_DB_ALIAS)
+
+    def test_falls_back_to_the_primary_without_a_healthy_replica(self, is_healthy):
+        is_healthy.return_value = False
+
+        self.assertEqual(serve(RequestFactory().get("/articles/"), read_alias)[0], DEFAULT_DB_ALIAS)
+
+    def test_reads_inside_a_transaction_use_the_primary(self, is_healthy):
+        def read_in_transaction():
+            with transaction.atomic():
+                return read_alias()
+
+        self.assertEqual(serve(RequestFactory().get("/articles/"), read_in_transaction)[0], DEFAULT_DB_ALIAS)
+
+    def test_reads_outside_a_request_use_the_primary(self, is_healthy):
+        self.assertEqual(read_alias(), DEFAULT_DB_ALIAS)
+
+
+class FakeCursor:
+    def __init__(self, lag=None, error=None):
+        self.lag, self.error = lag, error
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql):
+        if self.error:
+            raise self.error
+
+    def fetchone(self):
+        return (self.lag,)
+
+
+@override_settings(DATABASE_REPLICA_MAX_LAG=10, DATABASE_REPLICA_CHECK_INTERVAL=60)
+class ReplicaHealthTests(SimpleTestCase):
+    def check(self, **cursor):
+        replica = mock.Mock(vendor="postgresql")
+        replica.cursor.return_value = FakeCursor(**cursor)
+        with mock.patch.object(replicas, "connections", {REPLICA: replica}):
+            return replicas.ReplicaHealth().check(REPLICA), replica
+
+    def test_caught_up_replica_is_healthy(self):
+        self.assertTrue(self.check(lag=0)[0])
+        self.assertTrue(self.check(lag=None)[0])
+
+    def test_unreachable_replica_is_skipped_and_closed(self):
+        with self.assertLogs("debuttend_cms.replicas", "WARNING"):
+            healthy, replica = self.check(error=OperationalError("connection refused"))
+
+        self.assertFalse(healthy)
+        replica.close.assert_called_once()
+
+    def test_lagging_replica_is_skipped(self):
+        with self.assertLogs("debuttend_cms.replicas", "WARNING"):
+            self.assertFalse(self.check(lag=30.0)[0])
+
+    def test_result_is_reused_until_the_check_interval_passes(self):
+        health = replicas.ReplicaHealth()
+        with mock.patch.object(health, "check", return_value=False) as check:
+            self.assertFalse(health.is_healthy(REPLICA))
+            self.assertFalse(health.is_healthy(REPLICA))
+
+        check.assert_called_once_with(REPLICA)
+
+
+@skipUnless(replicas.get_replicas(), "set DJANGO_DB_REPLICAS to run against a second database alias")
+class ReplicaAliasTests(TransactionTestCase):
+    # The replica is a TEST MIRROR of default; it only sees committed rows, hence TransactionTestCase.
+    databases = {DEFAULT_DB_ALIAS, *replicas.get_replicas()}
+
+    def setUp(self):
+        replicas.health._checked.clear()
+
+    def test_reads_are_sent_to_the_replica_connection(self):
+        get_user_model().objects.create_user("reader")
+        alias = replicas.get_replicas()[0]
+        seen = []
+
+        def record(execute, sql, params, many, context):
+            seen.append(context["connection"].alias)
+            return execute(sql, params, many, context)
+
+        with mock.patch.object(replicas.random, "choice", return_value=alias):
+            with connections[alias].execute_wrapper(record), connections[DEFAULT_DB_ALIAS].execute_wrapper(record):
+                usernames, _ = serve(
+                    RequestFactory().get("/articles/"),
+                    lambda: list(get_user_model().objects.values_list("username", flat=True)),
+                )
+
+        self.assertEqual(usernames, ["reader"])
+        self.assertEqual(seen[-1], alias)
@@ -9,17 +9,22 @@ from django.urls import path
 from wagtail import urls as wagtail_urls
 from wagtail.admin import urls as wagtailadmin_urls
 from wagtail.documents import urls as wagtaildocs_urls
-from wagtail.api import API
-from wagtail.api.v2.views import PagesAPIViewSet
+from wagtail.api.v2.router import WagtailAPIRouter
 
-api = API(api_name="v2")
-api.register(PagesAPIViewSet)
+from home.api import CachedPagesAPIViewSet, PageExportView
+from home.views import sitemap_index, sitemap_shard
+
+api_router = WagtailAPIRouter("wagtailapi")
+api_router.register_endpoint("pages", CachedPagesAPIViewSet)
 
 urlpatterns = [
     path("django-admin/", admin.site.urls),
     path("cms/", include(wagtailadmin_urls)),
     path("documents/", include(wagtaildocs_urls)),
-    path("api/", api.urls),
+    path("api/v2/export/pages/", PageExportView.as_view(), name="page_export"),
+    path("api/v2/", api_router.urls),
+    path("sitemap.xml", sitemap_index, name="sitemap"),
+    path("sitemap-<int:shard>.xml", sitemap_shard, name="sitemap_shard"),
     path("search/", include("search.urls")),
     path("integrations/", include("integrations.urls")),
     path("analytics/", include("analytics.urls")),
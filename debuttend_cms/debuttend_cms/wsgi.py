@@ -8,3 +8,13 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "debuttend_cms.settings.dev")
 
 application = get_wsgi_application()
+
+# Build the search suggestion index as each worker starts rather than on its first request.
+try:
+    from search.suggest import warm_index
+
+    warm_index()
+except Exception:  # A cold index is rebuilt on first use.
+    import logging
+
+    logging.getLogger(__name__).exception("Could not warm the search suggestion index")
@@ -0,0 +1,207 @@
+"""Pages API endpoint with conditional GET support and a server-side response cache.
+
+Validators are derived from the pages themselves: a detail response is tagged
+with the page's live revision id, ``last_published_at`` and URL path; a listing
+with the count and the latest ``last_published_at``/revision id of the filtered
+queryset. Both also include a generation counter that ``home.signals`` bumps on
+publish, unpublish, move, delete and view restriction changes, which covers
+changes that leave revision ids untouched. ``If-None-Match`` is answered with
+304 before anything is serialized. No ``Last-Modified`` is sent: unpublishing,
+deleting or moving a page changes the data without moving any timestamp, so
+only the ETag can be trusted.
+
+Anonymous responses are additionally cached per generation, host, renderer and
+query string, so a warm poll costs a cache lookup and no queries.
+"""
+from __future__ import annotations
+
+import hashlib
+from datetime import timezone as dt_timezone
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Max
+from django.http import HttpResponse, StreamingHttpResponse
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.dateparse import parse_datetime
+from django.utils.http import quote_etag
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from wagtail.api.v2.utils import page_models_from_string
+from wagtail.api.v2.views import PagesAPIViewSet
+from wagtail.search.backends.base import BaseSearchResults
+
+from debuttend_cms import generations
+
+from . import export
+
+GENERATION_KEY = "api:pages:generation"
+
+
+def get_generation() -> int:
+    return generations.get(GENERATION_KEY)
+
+
+def bump_generation() -> None:
+    generations.bump(GENERATION_KEY)
+
+
+def make_etag(*parts) -> str:
+    digest = hashlib.sha1(":".join(str(part) for part in parts).encode()).hexdigest()
+    return quote_etag(digest)
+
+
+class CachedPagesAPIViewSet(PagesAPIViewSet):
+    """``PagesAPIViewSet`` emitting strong ETags and caching anonymous responses."""
+
+    def is_cacheable_request(self, request) -> bool:
+        # View restrictions are evaluated per request; only anonymous, session-less
+        # requests are guaranteed to see the same pages.
+        return (
+            getattr(settings, "API_CACHE_ENABLED", True)
+            and request.method in ("GET", "HEAD")
+            and not request.user.is_authenticated
+            and settings.SESSION_COOKIE_NAME not in request.COOKIES
+        )
+
+    def response_cache_key(self, request, generation: int) -> str:
+        query = "&".join(f"{key}={value}" for key, value in sorted(request.GET.lists()))
+        digest = hashlib.sha1(f"{request.path}?{query}".encode()).hexdigest()
+        return f"api:pages:{generation}:{request.get_host()}:{request.accepted_renderer.format}:{digest}"
+
+    def cached_response(self, request):
+        """Return a 304 or a cached body when a fresh entry exists, otherwise ``None``."""
+        self.etag = None
+        self.cache_key = None
+        if not self.is_cacheable_request(request):
+            return None
+        self.generation = get_generation()
+        self.cache_key = self.response_cache_key(request, self.generation)
+        entry = cache.get(self.cache_key)
+        if entry is None:
+            return None
+        etag, content_type, content = entry
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = HttpResponse(content, content_type=content_type)
+        response["X-API-Cache"] = "hit"
+        response["ETag"] = etag
+        return response
+
+    def conditional_response(self, request, etag: str):
+        self.etag = etag
+        response = get_conditional_response(request, etag=etag)
+        if response is not None:
+            response["ETag"] = etag
+        return response
+
+    def generation_for_validators(self) -> int:
+        return self.generation if self.cache_key else get_generation()
+
+    def listing_view(self, request):
+        cached = self.cached_response(request)
+        if cached is not None:
+            return cached
+
+        queryset = self.get_queryset()
+        self.check_query_parameters(queryset)
+        queryset = self.filter_queryset(queryset)
+
+        if isinstance(queryset, BaseSearchResults):
+            # Search results cannot be aggregated; the generation alone identifies them.
+            etag = make_etag("listing", request.get_full_path(), self.generation_for_validators())
+        else:
+            summary = queryset.order_by().aggregate(
+                count=Count("pk"),
+                last_published_at=Max("last_published_at"),
+                live_revision_id=Max("live_revision_id"),
+            )
+            etag = make_etag(
+                "listing",
+                request.get_full_path(),
+                self.generation_for_validators(),
+                summary["count"],
+                summary["live_revision_id"],
+                summary["last_published_at"].isoformat() if summary["last_published_at"] else "",
+            )
+
+        not_modified = self.conditional_response(request, etag)
+        if not_modified is not None:
+            return not_modified
+
+        queryset = self.paginate_queryset(queryset)
+        serializer = self.get_serializer(queryset, many=True)
+        return self.get_paginated_response(serializer.data)
+
+    def detail_view(self, request, pk):
+        cached = self.cached_response(request)
+        if cached is not None:
+            return cached
+
+        instance = self.get_object()
+        last_published_at = instance.last_published_at
+        etag = make_etag(
+            "detail",
+            request.get_full_path(),
+            self.generation_for_validators(),
+            instance.pk,
+            instance.live_revision_id,
+            instance.url_path,
+            last_published_at.isoformat() if last_published_at else "",
+        )
+        not_modified = self.conditional_response(request, etag)
+        if not_modified is not None:
+            return not_modified
+
+        serializer = self.get_serializer(instance)
+        return Response(serializer.data)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        etag = getattr(self, "etag", None)
+        if etag is None or response.status_code != 200:
+            return response
+        response["ETag"] = etag
+        if self.cache_key:
+            response.render()
+            entry = (etag, response["Content-Type"], response.content)
+            cache.set(self.cache_key, entry, getattr(settings, "API_CACHE_TIMEOUT", 60 * 10))
+            response["X-API-Cache"] = "miss"
+        return response
+
+
+class PageExportView(APIView):
+    """Stream every live public page as NDJSON, optionally filtered by ``type`` and ``since``.
+
+    The last line is a trailer whose ``until`` value can be passed back as
+    ``since`` on the next run to fetch only pages published in between. With
+    ``since``, pages removed in between are listed before the trailer as
+    ``{"id": ..., "deleted": true}`` lines.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        try:
+            models = page_models_from_string(request.GET["type"]) if "type" in request.GET else None
+        except (LookupError, ValueError):
+            raise ValidationError({"type": "type doesn't exist"})
+
+        since = None
+        if "since" in request.GET:
+            since = parse_datetime(request.GET["since"])
+            if since is None:
+                raise ValidationError({"since": "expected an ISO 8601 timestamp"})
+            if timezone.is_naive(since):
+                since = timezone.make_aware(since, dt_timezone.utc)
+
+        until = timezone.now()
+        queryset = export.exportable_pages(models, since)
+        response = StreamingHttpResponse(
+            export.stream_ndjson(queryset, request, until, since), content_type="application/x-ndjson"
+        )
+        response["Cache-Control"] = "no-store"
+        return response
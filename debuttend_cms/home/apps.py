@@ -7,3 +7,6 @@ class HomeConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "home"
     verbose_name = "Content"
+
+    def ready(self):
+        from . import checks, signals  # noqa: F401
@@ -0,0 +1,91 @@
+"""Fragment cache for individual StreamField blocks.
+
+Block types opt in with the ``fragment_cache=True`` meta option and are rendered
+through the ``include_cached_block`` template tag. Fragments are keyed by the
+block's stream id plus a hash of its block type, template and stored value, so
+editing one block only re-renders that block. Changes to objects a block merely
+references (an image file, a linked page) are picked up when the entry expires.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils.html import conditional_escape
+from django.utils.safestring import mark_safe
+
+KEY_PREFIX = "blockcache"
+
+
+class FragmentCacheStats:
+    """Process-local hit/miss counters, broken down by block type."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.hits: Counter[str] = Counter()
+        self.misses: Counter[str] = Counter()
+
+    def record(self, block_type: str, hit: bool) -> None:
+        with self._lock:
+            (self.hits if hit else self.misses)[block_type] += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            block_types = sorted(set(self.hits) | set(self.misses))
+            return {
+                block_type: {"hits": self.hits[block_type], "misses": self.misses[block_type]}
+                for block_type in block_types
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self.hits.clear()
+            self.misses.clear()
+
+
+stats = FragmentCacheStats()
+
+
+def get_cache():
+    return caches[getattr(settings, "BLOCK_CACHE_ALIAS", "default")]
+
+
+def is_cacheable(child) -> bool:
+    return bool(getattr(child, "id", None)) and getattr(child.block.meta, "fragment_cache", False)
+
+
+def make_key(child) -> str:
+    template = getattr(child.block.meta, "template", None) or ""
+    payload = json.dumps(
+        [child.block_type, template, child.block.get_prep_value(child.value)],
+        cls=DjangoJSONEncoder,
+        sort_keys=True,
+    )
+    digest = hashlib.sha1(payload.encode("utf-8")).hexdigest()
+    return f"{KEY_PREFIX}:{child.id}:{digest}"
+
+
+def _render(child, context) -> str:
+    if hasattr(child, "render_as_block"):
+        return conditional_escape(child.render_as_block(context=context))
+    return conditional_escape(child)
+
+
+def render(child, context: dict) -> str:
+    """Render a stream child, reusing the cached fragment when one exists."""
+    if not is_cacheable(child):
+        return _render(child, context)
+
+    cache = get_cache()
+    key = make_key(child)
+    html = cache.get(key)
+    stats.record(child.block_type, hit=html is not None)
+    if html is None:
+        html = str(_render(child, context))
+        cache.set(key, html, getattr(settings, "BLOCK_CACHE_TIMEOUT", 60 * 60 * 24))
+    return mark_safe(html)
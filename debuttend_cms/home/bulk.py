@@ -0,0 +1,93 @@
+"""Bulk insertion of pages under a common parent.
+
+``Page.add_child`` locks the tree, inserts a single node and updates its
+parent, which is several queries per page. ``bulk_add_children`` reserves a
+run of consecutive treebeard paths under the parent at once. It then inserts
+the ``wagtailcore_page`` rows and the specific rows with one multi-row
+``INSERT`` each per batch. Django's ``bulk_create`` refuses multi-table
+models, so the specific rows are written with a plain multi-row ``INSERT``
+built from the model's fields.
+
+The pages are written as-is: no revisions, log entries, search or reference
+index updates and no signals. Callers fill in derived fields such as
+``ArticlePage.body_text`` before calling, and index afterwards.
+"""
+from __future__ import annotations
+
+from django.db import connections, router, transaction
+from django.db.models import F
+from django.utils import timezone
+from treebeard.numconv import NumConv
+from wagtail.models import Page
+
+
+def allocate_paths(parent, count: int) -> list[str]:
+    """Treebeard paths for ``count`` new children of ``parent``, after its current last child."""
+    numconv = NumConv(len(Page.alphabet), Page.alphabet)
+    last_child = parent.get_last_child()
+    first_step = numconv.str2int(last_child.path[-Page.steplen :]) + 1 if last_child is not None else 1
+    return [
+        parent.path + numconv.int2str(step).rjust(Page.steplen, Page.alphabet[0])
+        for step in range(first_step, first_step + count)
+    ]
+
+
+def prepare(page, parent, path: str, now) -> None:
+    page.path = path
+    page.depth = parent.depth + 1
+    page.numchild = 0
+    page.url_path = f"{parent.url_path}{page.slug}/"
+    page.locale_id = page.locale_id or parent.locale_id
+    page.draft_title = page.draft_title or page.title
+    page.has_unpublished_changes = not page.live
+    if page.live:
+        page.first_published_at = page.first_published_at or now
+        page.last_published_at = page.last_published_at or now
+
+
+def insert_rows(model, rows: list) -> None:
+    """Insert ``rows`` into ``model``'s own table with one multi-row ``INSERT``."""
+    connection = connections[router.db_for_write(model)]
+    fields = model._meta.local_concrete_fields
+    quote = connection.ops.quote_name
+    columns = ", ".join(quote(field.column) for field in fields)
+    placeholders = f"({', '.join(['%s'] * len(fields))})"
+    params = [
+        field.get_db_prep_save(field.pre_save(row, add=True), connection=connection) for row in rows for field in fields
+    ]
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {quote(model._meta.db_table)} ({columns}) VALUES {', '.join([placeholders] * len(rows))}",
+            params,
+        )
+
+
+def insert_batch(pages: list) -> None:
+    base_fields = [field for field in Page._meta.concrete_fields if not field.primary_key]
+    base_rows = Page.objects.bulk_create(
+        [Page(**{field.attname: getattr(page, field.attname) for field in base_fields}) for page in pages]
+    )
+    by_model: dict[type, list] = {}
+    for page, base_row in zip(pages, base_rows):
+        page.pk = page.page_ptr_id = base_row.pk
+        by_model.setdefault(type(page), []).append(page)
+    for model, model_pages in by_model.items():
+        insert_rows(model, model_pages)
+    for page in pages:
+        page._state.adding = False
+        page._state.db = Page.objects.db
+
+
+def bulk_add_children(parent, pages: list, batch_size: int = 500) -> list:
+    """Insert unsaved specific ``pages`` (direct ``Page`` subclasses) as the last children of ``parent``."""
+    if not pages:
+        return pages
+    now = timezone.now()
+    with transaction.atomic():
+        parent = Page.objects.select_for_update().get(pk=parent.pk)
+        for page, path in zip(pages, allocate_paths(parent, len(pages))):
+            prepare(page, parent, path, now)
+        for start in range(0, len(pages), batch_size):
+            insert_batch(pages[start:start + batch_size])
+        Page.objects.filter(pk=parent.pk).update(numchild=F("numchild") + len(pages))
+    return pages
@@ -0,0 +1,24 @@
+"""System checks for the content app."""
+from __future__ import annotations
+
+from django.conf import settings
+from django.core.checks import Warning, register
+
+from . import page_cache
+
+
+@register()
+def check_page_cache_backend(app_configs, **kwargs):
+    if not getattr(settings, "PAGE_CACHE_ENABLED", True) or page_cache.is_shared_cache():
+        return []
+    return [
+        Warning(
+            "The page cache is disabled because its cache backend is per-process.",
+            hint=(
+                "Publishing only clears the cache of the worker that handled it. Point "
+                "DJANGO_CACHE_BACKEND at the database cache, Redis or Memcached."
+            ),
+            obj=getattr(settings, "PAGE_CACHE_ALIAS", "default"),
+            id="home.W001",
+        )
+    ]
@@ -0,0 +1,165 @@
+"""Off-request resolution of embed URLs through ``wagtail.embeds``.
+
+Embed URLs in ``ArticlePage.body`` are resolved with ``wagtail.embeds.get_embed``
+in a background thread pool once a page is published, using the finders in
+``WAGTAILEMBEDS_FINDERS`` and storing results in Wagtail's ``Embed`` table. A
+result is kept for ``EMBED_TTL`` seconds, or the provider's ``cache_age`` when
+shorter. A failure is remembered in the cache and not retried for
+``EMBED_NEGATIVE_TTL`` seconds. Rendering only reads stored rows:
+``EmbedResolverMixin`` loads every row a page needs in one query, and
+``ResolvedEmbedBlock`` falls back to a plain link when a URL has no usable
+result. ``manage.py resolve_embeds`` refreshes expired entries.
+
+``LocalEmbedFinder`` builds players for well-known video hosts without network
+access, for development and tests.
+"""
+from __future__ import annotations
+
+import logging
+import re
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from urllib.parse import parse_qs, urlsplit
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections, transaction
+from django.utils import timezone
+from django.utils.html import format_html
+from wagtail.embeds.embeds import get_embed, get_embed_hash
+from wagtail.embeds.exceptions import EmbedException, EmbedNotFoundException, EmbedUnsupportedProviderException
+from wagtail.embeds.finders import get_finders
+from wagtail.embeds.finders.base import EmbedFinder
+from wagtail.embeds.models import Embed
+
+from . import page_cache, prerender
+
+logger = logging.getLogger(__name__)
+
+FAILED_KEY_PREFIX = "embeds:failed:"
+
+_executor: ThreadPoolExecutor | None = None
+
+
+class LocalEmbedFinder(EmbedFinder):
+    """Build iframes for YouTube and Vimeo URLs locally; accepts no other hosts."""
+
+    YOUTUBE = re.compile(r"^(?:www\.|m\.)?(?:youtube\.com|youtu\.be)$")
+    VIMEO = re.compile(r"^(?:www\.)?vimeo\.com$")
+
+    def accept(self, url):
+        netloc = urlsplit(url).netloc
+        return bool(self.YOUTUBE.match(netloc) or self.VIMEO.match(netloc))
+
+    def find_embed(self, url, max_width=None, max_height=None):
+        parts = urlsplit(url)
+        if self.VIMEO.match(parts.netloc):
+            video_id = parts.path.strip("/").split("/")[0]
+            src, provider = f"https://player.vimeo.com/video/{video_id}", "Vimeo"
+        else:
+            if parts.netloc.endswith("youtu.be"):
+                video_id = parts.path.strip("/")
+            else:
+                video_id = parse_qs(parts.query).get("v", [""])[0]
+            src, provider = f"https://www.youtube-nocookie.com/embed/{video_id}", "YouTube"
+        if not video_id:
+            raise EmbedNotFoundException
+        html = format_html(
+            '<iframe src="{}" width="640" height="360" frameborder="0" allowfullscreen loading="lazy"></iframe>', src
+        )
+        return {"type": "video", "html": html, "title": "", "provider_name": provider, "width": 640, "height": 360}
+
+
+def find_embed(url, max_width=None, max_height=None) -> dict:
+    """Ask the configured finders for ``url``, capping the result's lifetime at ``EMBED_TTL``."""
+    for finder in get_finders():
+        if finder.accept(url):
+            result = finder.find_embed(url, max_width=max_width, max_height=max_height)
+            break
+    else:
+        raise EmbedUnsupportedProviderException
+    ttl_until = timezone.now() + timedelta(seconds=getattr(settings, "EMBED_TTL", 7 * 24 * 60 * 60))
+    result["cache_until"] = min(result.get("cache_until") or ttl_until, ttl_until)
+    return result
+
+
+def failed_key(url: str) -> str:
+    return f"{FAILED_KEY_PREFIX}{get_embed_hash(url)}"
+
+
+def embed_urls(page) -> list[str]:
+    """Embed URLs referenced by ``page``'s body, in order, without duplicates."""
+    body = getattr(page, "body", None)
+    if body is None:
+        return []
+    urls = (block.get("value") for block in body.raw_data if block.get("type") == "embed")
+    return list(dict.fromkeys(url for url in urls if isinstance(url, str) and url))
+
+
+def load(urls) -> dict[str, Embed]:
+    """Return stored ``Embed`` rows for ``urls`` keyed by URL, in one query; expired rows are still served."""
+    hashes = {get_embed_hash(url): url for url in urls}
+    if not hashes:
+        return {}
+    return {hashes[embed.hash]: embed for embed in Embed.objects.filter(hash__in=hashes)}
+
+
+def resolve_urls(urls, force: bool = False) -> int:
+    """Resolve URLs with no fresh stored result or recent failure; returns how many were fetched."""
+    now = timezone.now()
+    urls = list(dict.fromkeys(urls))
+    stored = load(urls)
+    pending = [
+        url
+        for url in urls
+        if force or url not in stored or (stored[url].cache_until is not None and stored[url].cache_until <= now)
+    ]
+    if not force:
+        failed = cache.get_many([failed_key(url) for url in pending])
+        pending = [url for url in pending if failed_key(url) not in failed]
+    if not pending:
+        return 0
+    if force:
+        # get_embed returns any unexpired row as is; expire them so it asks the finders again.
+        Embed.objects.filter(hash__in=[get_embed_hash(url) for url in pending]).update(cache_until=now)
+    negative_ttl = getattr(settings, "EMBED_NEGATIVE_TTL", 60 * 60)
+    for url in pending:
+        try:
+            get_embed(url, finder=find_embed)
+        except EmbedException as exc:
+            cache.set(failed_key(url), str(exc) or type(exc).__name__, negative_ttl)
+        else:
+            cache.delete(failed_key(url))
+    return len(pending)
+
+
+def resolve_for_page(page_id: int) -> None:
+    """Background task: resolve a published page's embeds and drop its cached renders if any changed."""
+    from .models import ArticlePage
+
+    try:
+        page = ArticlePage.objects.filter(pk=page_id).only("id", "body").first()
+        if page is not None and resolve_urls(embed_urls(page)):
+            page_cache.invalidate_pages([page_id])
+            prerender.invalidate_pages([page_id])
+    except Exception:  # noqa: BLE001 - background task; never propagate
+        logger.exception("Could not resolve embeds for page %s", page_id)
+    finally:
+        connections.close_all()
+
+
+def get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=getattr(settings, "EMBED_WORKERS", 2), thread_name_prefix="embed-resolver"
+        )
+    return _executor
+
+
+def schedule(page) -> None:
+    """Resolve ``page``'s embeds in the background once the current transaction commits."""
+    if not embed_urls(page):
+        return
+    page_id = page.pk
+    transaction.on_commit(lambda: get_executor().submit(resolve_for_page, page_id))
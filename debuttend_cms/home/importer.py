@@ -0,0 +1,310 @@
+"""Streaming bulk import of ``ArticlePage`` content from JSON Lines.
+
+Each line is one article::
+
+    {"id": "wp-1042", "title": "...", "slug": "...", "author": "...", "published_date": "2021-04-01",
+     "introduction": "...", "featured_image": 12, "body": [{"type": "rich_text", "value": "<p>...</p>"}]}
+
+Only ``title`` is required. ``id`` is the record's stable id in the source
+system and is stored on the page as ``import_id``. ``featured_image`` and ``image`` blocks refer to
+existing image ids. References to missing images are dropped, as are block
+types ``ArticlePage.body`` doesn't define.
+
+Records are read lazily and written in batches, each in its own transaction:
+- tree paths are reserved and pages inserted through ``home.bulk``;
+- each page's live revision is added with one ``bulk_create``;
+- derived fields (``body_text``, ``compiled_richtext``) are filled in before
+  the insert.
+
+Search indexing (the article full-text index, Wagtail's search backends and the
+reference index) is deferred to one batched pass once every record is in.
+
+After each batch, progress goes to a JSON checkpoint file. A rerun with the same
+checkpoint continues after the last committed batch. A record whose ``id`` was
+already imported under the parent is skipped, so a rerun never duplicates
+pages; if its slug is taken by a different page it gets a numbered slug. A
+record without an ``id`` cannot be matched, so one whose slug belongs to an
+existing page is reported as a conflict and not imported.
+"""
+from __future__ import annotations
+
+import json
+import os
+import time
+import uuid
+from dataclasses import asdict, dataclass, field
+from datetime import date
+
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+from django.utils import timezone
+from django.utils.text import slugify
+from wagtail.images import get_image_model
+from wagtail.models import Page, ReferenceIndex, Revision
+
+from . import api, bulk, richtext, sitemaps
+from .models import ArticlePage
+from .text import stream_to_text
+
+MAX_REPORTED_ERRORS = 20
+
+
+class ImportRecordError(ValueError):
+    pass
+
+
+@dataclass
+class Checkpoint:
+    """Progress of one import.
+
+    ``line`` is the last input line covered by a committed batch, and
+    ``first_unindexed_id`` the first imported page the deferred indexing pass
+    has not covered yet.
+    """
+
+    path: str
+    line: int = 0
+    imported: int = 0
+    skipped: int = 0
+    conflicts: int = 0
+    errors: int = 0
+    first_unindexed_id: int | None = None
+
+    @classmethod
+    def load(cls, path: str) -> Checkpoint:
+        if not os.path.exists(path):
+            return cls(path)
+        with open(path) as handle:
+            return cls(path, **json.load(handle))
+
+    def save(self) -> None:
+        state = asdict(self)
+        del state["path"]
+        with open(f"{self.path}.tmp", "w") as handle:
+            json.dump(state, handle)
+        os.replace(f"{self.path}.tmp", self.path)
+
+
+@dataclass
+class ImportReport:
+    imported: int = 0
+    skipped: int = 0
+    conflicts: int = 0
+    errors: list[str] = field(default_factory=list)
+    error_count: int = 0
+    missing_images: int = 0
+    indexed: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def rate(self) -> float:
+        return self.imported / self.elapsed if self.elapsed else 0.0
+
+    def error(self, line_number: int, message: str) -> None:
+        self.error_count += 1
+        self.note(line_number, message)
+
+    def conflict(self, line_number: int, slug: str) -> None:
+        self.conflicts += 1
+        self.note(line_number, f"slug {slug!r} belongs to an existing page; give the record an id to import it")
+
+    def note(self, line_number: int, message: str) -> None:
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append(f"line {line_number}: {message}")
+
+
+def read_records(handle, start_line: int):
+    """Yield ``(line_number, record or ImportRecordError)`` after ``start_line``, skipping blank lines."""
+    for line_number, line in enumerate(handle, start=1):
+        if line_number <= start_line or not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as exc:
+            yield line_number, ImportRecordError(f"invalid JSON: {exc}")
+            continue
+        if not isinstance(record, dict) or not str(record.get("title") or "").strip():
+            yield line_number, ImportRecordError("a title is required")
+            continue
+        yield line_number, record
+
+
+def clean_body(blocks, image_ids: set[int], report: ImportReport) -> list[dict]:
+    if not isinstance(blocks, list):
+        raise ImportRecordError("body must be a list of blocks")
+    block_types = ArticlePage.body.field.stream_block.child_blocks
+    body = []
+    for block in blocks:
+        if not isinstance(block, dict) or block.get("type") not in block_types:
+            continue
+        if block["type"] == "image" and block.get("value") not in image_ids:
+            report.missing_images += 1
+            continue
+        body.append({"type": block["type"], "value": block.get("value"), "id": block.get("id") or str(uuid.uuid4())})
+    return body
+
+
+def source_id(record: dict) -> str:
+    value = record.get("id")
+    return str(value).strip()[:255] if value is not None else ""
+
+
+def build_page(record: dict, slug: str, image_ids: set[int], report: ImportReport) -> ArticlePage:
+    published_date = record.get("published_date")
+    try:
+        published_date = date.fromisoformat(published_date) if published_date else None
+    except (TypeError, ValueError) as exc:
+        raise ImportRecordError(f"invalid published_date {published_date!r}") from exc
+    featured_image = record.get("featured_image")
+    if featured_image is not None and featured_image not in image_ids:
+        report.missing_images += 1
+        featured_image = None
+    page = ArticlePage(
+        title=str(record["title"]).strip()[:255],
+        slug=slug,
+        live=True,
+        introduction=str(record.get("introduction") or "")[:250],
+        author=str(record.get("author") or "")[:120],
+        published_date=published_date,
+        featured_image_id=featured_image,
+        body=json.dumps(clean_body(record.get("body") or [], image_ids, report)),
+        import_id=source_id(record),
+    )
+    page.body_text = stream_to_text(page.body)
+    page.compiled_richtext = richtext.compile_page(page)
+    return page
+
+
+def referenced_image_ids(records: list[dict]) -> set[int]:
+    ids = set()
+    for record in records:
+        ids.add(record.get("featured_image"))
+        blocks = record.get("body") if isinstance(record.get("body"), list) else []
+        ids.update(block.get("value") for block in blocks if isinstance(block, dict) and block.get("type") == "image")
+    ids = {image_id for image_id in ids if isinstance(image_id, int)}
+    return set(get_image_model().objects.filter(pk__in=ids).values_list("pk", flat=True)) if ids else set()
+
+
+def create_revisions(pages: list[ArticlePage]) -> None:
+    """Give each inserted page a live revision, as publishing would, with one insert and one update."""
+    now = timezone.now()
+    content_type = ContentType.objects.get_for_model(ArticlePage)
+    base_content_type = ContentType.objects.get_for_model(Page)
+    revisions = Revision.objects.bulk_create(
+        [
+            Revision(
+                content_type=content_type,
+                base_content_type=base_content_type,
+                object_id=str(page.pk),
+                object_str=page.title,
+                content=page.serializable_data(),
+                created_at=now,
+            )
+            for page in pages
+        ]
+    )
+    for page, revision in zip(pages, revisions):
+        page.live_revision = page.latest_revision = revision
+        page.latest_revision_created_at = now
+    Page.objects.bulk_update(pages, ["live_revision", "latest_revision", "latest_revision_created_at"])
+
+
+def import_batch(
+    parent, records: list[tuple[int, dict]], existing: set[str], slugs: set[str], import_ids: set[str], report
+):
+    """Insert one batch.
+
+    ``existing`` holds slugs present before this run, ``slugs`` every slug
+    taken so far and ``import_ids`` every source id imported so far.
+    """
+    image_ids = referenced_image_ids([record for _, record in records])
+    pages = []
+    for line_number, record in records:
+        record_id = source_id(record)
+        if record_id and record_id in import_ids:
+            report.skipped += 1
+            continue
+        base_slug = slugify(record.get("slug") or record["title"])[:230] or "article"
+        if not record_id and base_slug in existing:
+            report.conflict(line_number, base_slug)
+            continue
+        slug, suffix = base_slug, 1
+        while slug in slugs:
+            suffix += 1
+            slug = f"{base_slug}-{suffix}"
+        try:
+            page = build_page(record, slug, image_ids, report)
+        except ImportRecordError as exc:
+            report.error(line_number, str(exc))
+            continue
+        slugs.add(slug)
+        if record_id:
+            import_ids.add(record_id)
+        pages.append(page)
+    with transaction.atomic():
+        bulk.bulk_add_children(parent, pages)
+        create_revisions(pages)
+    return pages
+
+
+def index_pages(queryset, batch_size: int) -> int:
+    """Batched pass over ``queryset``: full-text index, Wagtail search backends and the reference index."""
+    from search import fulltext, queue, suggest
+
+    count = 0
+    page_ids = list(queryset.order_by("pk").values_list("pk", flat=True))
+    for start in range(0, len(page_ids), batch_size):
+        pages = list(ArticlePage.objects.filter(pk__in=page_ids[start:start + batch_size]))
+        fulltext.index_articles(pages)
+        queue.update_index(ArticlePage, pages)
+        for page in pages:
+            ReferenceIndex.create_or_update_for_object(page)
+        count += len(pages)
+    suggest.record_changes(page_ids)
+    sitemaps.bump_generation()
+    api.bump_generation()
+    return count
+
+
+def import_articles(handle, parent, checkpoint: Checkpoint, batch_size: int = 500, progress=None) -> ImportReport:
+    """Import the records in ``handle`` under ``parent``, resuming after ``checkpoint.line``."""
+    report = ImportReport(skipped=checkpoint.skipped, conflicts=checkpoint.conflicts)
+    report.error_count = checkpoint.errors
+    started = time.perf_counter()
+    existing = set(Page.objects.child_of(parent).values_list("slug", flat=True))
+    slugs = set(existing)
+    import_ids = set(ArticlePage.objects.child_of(parent).exclude(import_id="").values_list("import_id", flat=True))
+
+    def flush(batch: list, last_line: int) -> None:
+        pages = import_batch(parent, batch, existing, slugs, import_ids, report) if batch else []
+        report.imported += len(pages)
+        if pages and checkpoint.first_unindexed_id is None:
+            checkpoint.first_unindexed_id = pages[0].pk
+        checkpoint.line = last_line
+        checkpoint.imported += len(pages)
+        checkpoint.skipped, checkpoint.errors = report.skipped, report.error_count
+        checkpoint.conflicts = report.conflicts
+        checkpoint.save()
+        report.elapsed = time.perf_counter() - started
+        if progress is not None:
+            progress(report, checkpoint)
+
+    batch, last_line = [], checkpoint.line
+    for line_number, record in read_records(handle, checkpoint.line):
+        last_line = line_number
+        if isinstance(record, ImportRecordError):
+            report.error(line_number, str(record))
+            continue
+        batch.append((line_number, record))
+        if len(batch) >= batch_size:
+            flush(batch, last_line)
+            batch = []
+    flush(batch, last_line)
+
+    if checkpoint.first_unindexed_id is not None:
+        imported = ArticlePage.objects.child_of(parent).filter(pk__gte=checkpoint.first_unindexed_id)
+        report.indexed = index_pages(imported, batch_size)
+        checkpoint.first_unindexed_id = None
+        checkpoint.save()
+    report.elapsed = time.perf_counter() - started
+    return report
@@ -0,0 +1,24 @@
+"""Compile the rich text of existing pages ahead of rendering."""
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+from wagtail.models import Page
+
+from home import richtext
+
+
+class Command(BaseCommand):
+    help = "Recompile stored rich text HTML for pages that use CompiledRichTextMixin."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=200, help="Pages recompiled per batch.")
+
+    def handle(self, *args, **options):
+        page_ids = list(
+            Page.objects.filter(content_type__in=richtext.compiled_content_types()).values_list("pk", flat=True)
+        )
+        batch_size = options["batch_size"]
+        changed = 0
+        for start in range(0, len(page_ids), batch_size):
+            changed += len(richtext.recompile_pages(page_ids[start:start + batch_size]))
+        self.stdout.write(self.style.SUCCESS(f"Compiled rich text for {len(page_ids)} page(s), {changed} changed."))
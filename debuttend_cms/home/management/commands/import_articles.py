@@ -0,0 +1,57 @@
+"""Bulk import ArticlePages from a JSON Lines file."""
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand, CommandError
+from wagtail.models import Page
+
+from home import importer
+
+
+class Command(BaseCommand):
+    help = "Stream ArticlePages from a JSONL file into the page tree in batches, resuming from a checkpoint."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="JSONL file with one article per line.")
+        parser.add_argument("--parent", required=True, help="Id or URL path (e.g. /home/news/) of the parent page.")
+        parser.add_argument("--batch-size", type=int, default=500, help="Records written per transaction.")
+        parser.add_argument("--checkpoint", help="Checkpoint file (default: <path>.checkpoint).")
+        parser.add_argument("--restart", action="store_true", help="Ignore an existing checkpoint.")
+
+    def get_parent(self, value: str) -> Page:
+        pages = Page.objects.filter(pk=int(value)) if value.isdigit() else Page.objects.filter(url_path=value)
+        parent = pages.first()
+        if parent is None:
+            raise CommandError(f"No parent page matches {value!r}.")
+        if "home.ArticlePage" not in [model._meta.label for model in parent.specific_class.allowed_subpage_models()]:
+            raise CommandError(f"ArticlePages cannot be created under {parent.title!r}.")
+        return parent
+
+    def handle(self, *args, **options):
+        parent = self.get_parent(options["parent"])
+        checkpoint_path = options["checkpoint"] or f"{options['path']}.checkpoint"
+        checkpoint = importer.Checkpoint(checkpoint_path)
+        if not options["restart"]:
+            checkpoint = importer.Checkpoint.load(checkpoint_path)
+            if checkpoint.line:
+                self.stdout.write(f"Resuming after line {checkpoint.line} ({checkpoint.imported} already imported).")
+
+        def progress(report, checkpoint):
+            self.stdout.write(
+                f"Line {checkpoint.line}: {report.imported} imported, {report.skipped} skipped, "
+                f"{report.conflicts} conflict(s), {report.error_count} error(s), {report.rate:.0f} pages/sec."
+            )
+
+        with open(options["path"], encoding="utf-8") as handle:
+            report = importer.import_articles(
+                handle, parent, checkpoint, batch_size=options["batch_size"], progress=progress
+            )
+        for error in report.errors:
+            self.stderr.write(error)
+        if report.missing_images:
+            self.stdout.write(f"Dropped {report.missing_images} reference(s) to missing images.")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {report.imported} article(s) in {report.elapsed:.1f}s ({report.rate:.0f} pages/sec); "
+                f"indexed {report.indexed}."
+            )
+        )
@@ -0,0 +1,31 @@
+"""Generate the configured image renditions for live pages."""
+from __future__ import annotations
+
+from django.apps import apps
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from home import renditions
+
+
+class Command(BaseCommand):
+    help = "Create missing renditions listed in IMAGE_RENDITION_SPECS for every live page of the configured models."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=200, help="Pages whose images are processed together.")
+
+    def handle(self, *args, **options):
+        total = 0
+        for label in getattr(settings, "IMAGE_RENDITION_SPECS", {}):
+            model = apps.get_model(label)
+            batch = {}
+            for page in model.objects.live().iterator(chunk_size=options["batch_size"]):
+                for image_id, specs in renditions.image_specs(page).items():
+                    batch.setdefault(image_id, set()).update(specs)
+                if len(batch) >= options["batch_size"]:
+                    total += renditions.generate(batch)
+                    batch = {}
+            if batch:
+                total += renditions.generate(batch)
+            self.stdout.write(f"{label}: done.")
+        self.stdout.write(self.style.SUCCESS(f"Ensured {total} renditions."))
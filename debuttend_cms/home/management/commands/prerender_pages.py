@@ -0,0 +1,81 @@
+"""Pre-render live pages to static HTML files in parallel."""
+from __future__ import annotations
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from django.core.management.base import BaseCommand, CommandError
+
+from home import prerender
+
+
+def parse_shard(value: str) -> tuple[int, int]:
+    try:
+        shard, shards = (int(part) for part in value.split("/", 1))
+    except ValueError:
+        raise CommandError("--shard must look like i/N, e.g. 0/4") from None
+    if shards < 1 or not 0 <= shard < shards:
+        raise CommandError("--shard index must be between 0 and N-1")
+    return shard, shards
+
+
+class Command(BaseCommand):
+    help = "Render live public pages to PRERENDER_ROOT, skipping pages whose revision has not changed."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Rendering processes.")
+        parser.add_argument("--batch-size", type=int, default=50, help="Pages handed to a worker at a time.")
+        parser.add_argument("--shard", default="0/1", help="Render only pages with pk %% N == i (format i/N).")
+        parser.add_argument("--full", action="store_true", help="Re-render every page, ignoring the manifest.")
+
+    def handle(self, *args, **options):
+        shard, shards = parse_shard(options["shard"])
+        path = prerender.manifest_path(shard, shards)
+        manifest = {} if options["full"] else prerender.load_manifest(path)
+        pages = prerender.select_pages(shard, shards)
+
+        removed = 0
+        for page_id in [page_id for page_id in manifest if int(page_id) not in pages]:
+            (prerender.get_root() / manifest.pop(page_id)["file"]).unlink(missing_ok=True)
+            removed += 1
+
+        stale = [
+            page_id
+            for page_id, (revision_id, url_path) in pages.items()
+            if (entry := manifest.get(str(page_id))) is None
+            or (entry["revision"], entry["url_path"]) != (revision_id, url_path)
+            or not (prerender.get_root() / entry["file"]).exists()
+        ]
+        self.stdout.write(
+            f"Shard {shard}/{shards}: {len(pages)} live pages, {len(stale)} to render, {removed} removed."
+        )
+
+        started = time.perf_counter()
+        rendered = 0
+        failed = []
+        size = 0
+        batches = [stale[idx : idx + options["batch_size"]] for idx in range(0, len(stale), options["batch_size"])]
+        if batches:
+            with ProcessPoolExecutor(max_workers=options["workers"], initializer=prerender.init_worker) as pool:
+                for future in as_completed([pool.submit(prerender.render_batch, batch) for batch in batches]):
+                    entries, batch_failed = future.result()
+                    failed.extend(batch_failed)
+                    for entry in entries:
+                        manifest[str(entry["id"])] = entry
+                        rendered += 1
+                        size += entry["bytes"]
+        elapsed = time.perf_counter() - started
+        prerender.write_manifest(path, manifest)
+
+        rate = rendered / elapsed if elapsed else 0
+        self.stdout.write(
+            f"Rendered {rendered} pages ({size / 1024:.0f} KiB) in {elapsed:.1f}s: {rate:.1f} pages/sec "
+            f"with {options['workers']} worker(s)."
+        )
+        if failed:
+            self.stderr.write(
+                f"{len(failed)} page(s) failed to render and were skipped (see the log): "
+                + ", ".join(str(page_id) for page_id in sorted(failed))
+            )
+        self.stdout.write(self.style.SUCCESS(f"Manifest written to {path}."))
@@ -0,0 +1,24 @@
+"""Resolve embed URLs of live article pages ahead of rendering."""
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+
+from home import embeds, page_cache, prerender
+from home.models import ArticlePage
+
+
+class Command(BaseCommand):
+    help = "Resolve missing or expired embed URLs used by live article pages."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--force", action="store_true", help="Re-resolve URLs even if their stored result is fresh.")
+
+    def handle(self, *args, **options):
+        fetched = 0
+        for page in ArticlePage.objects.live().only("id", "body").iterator(chunk_size=200):
+            resolved = embeds.resolve_urls(embeds.embed_urls(page), force=options["force"])
+            if resolved:
+                page_cache.invalidate_pages([page.pk])
+                prerender.invalidate_pages([page.pk])
+                fetched += resolved
+        self.stdout.write(self.style.SUCCESS(f"Resolved {fetched} embed URL(s)."))
@@ -0,0 +1,61 @@
+"""Request middleware for the content app."""
+from __future__ import annotations
+
+from django.conf import settings
+from django.http import HttpResponsePermanentRedirect, HttpResponseRedirect
+
+from . import page_cache, prerender, redirects
+
+
+class PageCacheMiddleware:
+    """Answer anonymous page requests straight from the page output cache.
+
+    Entries are written by ``PageCacheMixin.serve`` once Wagtail has routed and
+    rendered a page; this middleware only reads them back by host and path so a
+    warm hit skips site lookup, routing and rendering entirely.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if page_cache.is_cacheable_request(request):
+            response = page_cache.get_response(page_cache.route_key(request), request)
+            if response is not None:
+                return response
+        return self.get_response(request)
+
+
+class PrerenderMiddleware:
+    """Answer anonymous page requests with files written by ``manage.py prerender_pages``.
+
+    A file is only served while the page's live revision and URL path match the
+    manifest entry it was rendered from; anything else falls through to Wagtail.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if getattr(settings, "PRERENDER_ENABLED", True) and page_cache.is_cacheable_request(request):
+            response = prerender.get_response(request)
+            if response is not None:
+                return response
+        return self.get_response(request)
+
+
+class RedirectMiddleware:
+    """Replacement for Wagtail's ``RedirectMiddleware`` that answers 404s from the compiled redirect table."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if response.status_code != 404:
+            return response
+        redirect = redirects.find(request)
+        if redirect is None or redirect[0] is None:
+            return response
+        link, is_permanent = redirect
+        return HttpResponsePermanentRedirect(link) if is_permanent else HttpResponseRedirect(link)
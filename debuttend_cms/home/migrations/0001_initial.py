@@ -0,0 +1,122 @@
+# Generated by Django 4.2.30 on 2026-10-16 23:09
+
+from django.db import migrations, models
+import django.db.models.deletion
+import home.models
+import modelcluster.fields
+import uuid
+import wagtail.blocks
+import wagtail.fields
+import wagtail.images.blocks
+import wagtail.snippets.blocks
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('wagtailimages', '0025_alter_image_file_alter_rendition_file'),
+        ('wagtailcore', '0089_log_entry_data_json_null_to_object'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Integration',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('translation_key', models.UUIDField(default=uuid.uuid4, editable=False)),
+                ('name', models.CharField(max_length=120)),
+                ('description', models.TextField(blank=True)),
+                ('api_base_url', models.URLField()),
+                ('credential_key', models.CharField(blank=True, max_length=255)),
+                ('is_active', models.BooleanField(default=True)),
+                ('last_synced_at', models.DateTimeField(blank=True, null=True)),
+                ('locale', models.ForeignKey(editable=False, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='wagtailcore.locale')),
+            ],
+            options={
+                'verbose_name': 'Integration',
+                'verbose_name_plural': 'Integrations',
+                'abstract': False,
+                'unique_together': {('translation_key', 'locale')},
+            },
+        ),
+        migrations.CreateModel(
+            name='IntegrationLogEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('sort_order', models.IntegerField(blank=True, editable=False, null=True)),
+                ('status', models.CharField(choices=[('success', 'Success'), ('error', 'Error'), ('pending', 'Pending')], max_length=20)),
+                ('message', models.TextField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('integration', modelcluster.fields.ParentalKey(on_delete=django.db.models.deletion.CASCADE, related_name='logs', to='home.integration')),
+            ],
+            options={
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='HomePage',
+            fields=[
+                ('page_ptr', models.OneToOneField(auto_created=True, on_delete=django.db.models.deletion.CASCADE, parent_link=True, primary_key=True, serialize=False, to='wagtailcore.page')),
+                ('meta_title', models.CharField(blank=True, max_length=255)),
+                ('meta_description', models.CharField(blank=True, max_length=160)),
+                ('introduction', wagtail.fields.RichTextField(blank=True)),
+                ('body', wagtail.fields.StreamField([('hero', wagtail.blocks.StructBlock([('heading', wagtail.blocks.CharBlock(form_classname='full title')), ('subheading', wagtail.blocks.TextBlock(required=False)), ('background_image', wagtail.images.blocks.ImageChooserBlock(required=False)), ('cta_text', wagtail.blocks.CharBlock(required=False)), ('cta_link', wagtail.blocks.URLBlock(required=False))], template='home/blocks/hero_block.html')), ('content', wagtail.blocks.RichTextBlock(features=['bold', 'italic', 'h2', 'h3', 'ol', 'ul', 'link', 'image'])), ('callout', wagtail.blocks.StructBlock([('title', wagtail.blocks.CharBlock()), ('body', wagtail.blocks.TextBlock()), ('button_text', wagtail.blocks.CharBlock(required=False)), ('button_link', wagtail.blocks.URLBlock(required=False))], template='home/blocks/callout_block.html'))], blank=True, use_json_field=True)),
+                ('og_image', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='wagtailimages.image')),
+            ],
+            options={
+                'abstract': False,
+            },
+            bases=('wagtailcore.page', models.Model),
+        ),
+        migrations.CreateModel(
+            name='DashboardPage',
+            fields=[
+                ('page_ptr', models.OneToOneField(auto_created=True, on_delete=django.db.models.deletion.CASCADE, parent_link=True, primary_key=True, serialize=False, to='wagtailcore.page')),
+                ('meta_title', models.CharField(blank=True, max_length=255)),
+                ('meta_description', models.CharField(blank=True, max_length=160)),
+                ('subtitle', models.CharField(blank=True, max_length=250)),
+                ('layout', wagtail.fields.StreamField([('widget', wagtail.blocks.StructBlock([('widget', wagtail.snippets.blocks.SnippetChooserBlock(target_model=home.models.DashboardWidget)), ('column_span', wagtail.blocks.ChoiceBlock(choices=[('1', '1 Column'), ('2', '2 Columns'), ('3', '3 Columns')]))]))], blank=True, use_json_field=True)),
+                ('og_image', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='wagtailimages.image')),
+            ],
+            options={
+                'abstract': False,
+            },
+            bases=('wagtailcore.page', models.Model),
+        ),
+        migrations.CreateModel(
+            name='ArticlePage',
+            fields=[
+                ('page_ptr', models.OneToOneField(auto_created=True, on_delete=django.db.models.deletion.CASCADE, parent_link=True, primary_key=True, serialize=False, to='wagtailcore.page')),
+                ('meta_title', models.CharField(blank=True, max_length=255)),
+                ('meta_description', models.CharField(blank=True, max_length=160)),
+                ('introduction', models.CharField(blank=True, max_length=250)),
+                ('body', wagtail.fields.StreamField([('rich_text', wagtail.blocks.RichTextBlock()), ('image', wagtail.images.blocks.ImageChooserBlock()), ('quote', wagtail.blocks.StructBlock([('quote', wagtail.blocks.TextBlock()), ('attribution', wagtail.blocks.CharBlock(required=False))], template='home/blocks/quote_block.html')), ('embed', wagtail.blocks.URLBlock(help_text='Embed URL (YouTube, Vimeo, etc.)'))], blank=True, use_json_field=True)),
+                ('author', models.CharField(blank=True, max_length=120)),
+                ('published_date', models.DateField(blank=True, null=True)),
+                ('featured_image', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='article_featured', to='wagtailimages.image')),
+                ('og_image', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='wagtailimages.image')),
+            ],
+            options={
+                'abstract': False,
+            },
+            bases=('wagtailcore.page', models.Model),
+        ),
+        migrations.CreateModel(
+            name='DashboardWidget',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('translation_key', models.UUIDField(default=uuid.uuid4, editable=False)),
+                ('title', models.CharField(max_length=120)),
+                ('description', models.TextField(blank=True)),
+                ('widget_type', models.CharField(choices=[('stats', 'Statistics'), ('chart', 'Chart'), ('todo', 'Task List')], max_length=50)),
+                ('configuration', models.JSONField(blank=True, default=dict)),
+                ('locale', models.ForeignKey(editable=False, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='wagtailcore.locale')),
+            ],
+            options={
+                'abstract': False,
+                'unique_together': {('translation_key', 'locale')},
+            },
+        ),
+    ]
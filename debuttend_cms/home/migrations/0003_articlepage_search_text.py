@@ -0,0 +1,41 @@
+# Generated by Django 4.2.30 on 2026-10-16 23:09
+
+import django.contrib.postgres.search
+from django.db import migrations, models
+
+
+INDEX_NAME = "home_article_search_gin"
+
+
+def create_search_index(apps, schema_editor):
+    # GIN indexes only exist on PostgreSQL; other databases search articles without this column.
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    table = apps.get_model("home", "ArticlePage")._meta.db_table
+    schema_editor.execute(f"CREATE INDEX IF NOT EXISTS {INDEX_NAME} ON {table} USING gin (search_vector)")
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(f"DROP INDEX IF EXISTS {INDEX_NAME}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('home', '0002_block_fragment_cache'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='articlepage',
+            name='body_text',
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.AddField(
+            model_name='articlepage',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
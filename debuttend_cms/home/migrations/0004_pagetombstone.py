@@ -0,0 +1,21 @@
+# Generated by Django 4.2.30 on 2026-10-16 23:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('home', '0003_articlepage_search_text'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PageTombstone',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('page_id', models.PositiveIntegerField(unique=True)),
+                ('removed_at', models.DateTimeField(db_index=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 4.2.30 on 2026-10-16 23:09
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('home', '0004_pagetombstone'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IntegrationLogSummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('successes', models.PositiveIntegerField(default=0)),
+                ('errors', models.PositiveIntegerField(default=0)),
+                ('pending', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'ordering': ['-day'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='integrationlogentry',
+            index=models.Index(fields=['integration', '-created_at'], name='home_intlog_created_idx'),
+        ),
+        migrations.AddField(
+            model_name='integrationlogsummary',
+            name='integration',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='log_summaries', to='home.integration'),
+        ),
+        migrations.AddConstraint(
+            model_name='integrationlogsummary',
+            constraint=models.UniqueConstraint(fields=('integration', 'day'), name='home_intlog_summary_unique'),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 4.2.30 on 2026-10-16 23:09
+
+from django.db import migrations
+import home.models
+import wagtail.blocks
+import wagtail.fields
+import wagtail.images.blocks
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('home', '0005_integration_log_summary'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='articlepage',
+            name='body',
+            field=wagtail.fields.StreamField([('rich_text', wagtail.blocks.RichTextBlock()), ('image', wagtail.images.blocks.ImageChooserBlock(fragment_cache=True)), ('quote', wagtail.blocks.StructBlock([('quote', wagtail.blocks.TextBlock()), ('attribution', wagtail.blocks.CharBlock(required=False))], fragment_cache=True, template='home/blocks/quote_block.html')), ('embed', home.models.ResolvedEmbedBlock(help_text='Embed URL (YouTube, Vimeo, etc.)'))], blank=True, use_json_field=True),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 4.2.30 on 2026-10-16 23:09
+
+from django.db import migrations, models
+import home.models
+import wagtail.blocks
+import wagtail.fields
+import wagtail.images.blocks
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('home', '0006_articlepage_resolved_embed_block'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='articlepage',
+            name='compiled_richtext',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+        migrations.AddField(
+            model_name='homepage',
+            name='compiled_richtext',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+        migrations.AlterField(
+            model_name='articlepage',
+            name='body',
+            field=wagtail.fields.StreamField([('rich_text', home.models.CompiledRichTextBlock()), ('image', wagtail.images.blocks.ImageChooserBlock(fragment_cache=True)), ('quote', wagtail.blocks.StructBlock([('quote', wagtail.blocks.TextBlock()), ('attribution', wagtail.blocks.CharBlock(required=False))], fragment_cache=True, template='home/blocks/quote_block.html')), ('embed', home.models.ResolvedEmbedBlock(help_text='Embed URL (YouTube, Vimeo, etc.)'))], blank=True, use_json_field=True),
+        ),
+        migrations.AlterField(
+            model_name='homepage',
+            name='body',
+            field=wagtail.fields.StreamField([('hero', wagtail.blocks.StructBlock([('heading', wagtail.blocks.CharBlock(form_classname='full title')), ('subheading', wagtail.blocks.TextBlock(required=False)), ('background_image', wagtail.images.blocks.ImageChooserBlock(required=False)), ('cta_text', wagtail.blocks.CharBlock(required=False)), ('cta_link', wagtail.blocks.URLBlock(required=False))], fragment_cache=True, template='home/blocks/hero_block.html')), ('content', home.models.CompiledRichTextBlock(features=['bold', 'italic', 'h2', 'h3', 'ol', 'ul', 'link', 'image'])), ('callout', wagtail.blocks.StructBlock([('title', wagtail.blocks.CharBlock()), ('body', wagtail.blocks.TextBlock()), ('button_text', wagtail.blocks.CharBlock(required=False)), ('button_link', wagtail.blocks.URLBlock(required=False))], fragment_cache=True, template='home/blocks/callout_block.html'))], blank=True, use_json_field=True),
+        ),
+    ]
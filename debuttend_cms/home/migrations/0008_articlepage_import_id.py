@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-16 23:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('home', '0007_compiled_richtext'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='articlepage',
+            name='import_id',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=255),
+        ),
+    ]
@@ -1,18 +1,23 @@
 """Content models for the Debuttend CMS."""
 from __future__ import annotations
 
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 from modelcluster.fields import ParentalKey
-from modelcluster.models import ClusterableModel, Orderable
-from wagtail.admin.panels import FieldPanel, InlinePanel, ObjectList, TabbedInterface
+from modelcluster.models import ClusterableModel
+from wagtail.admin.panels import FieldPanel, ObjectList, TabbedInterface
 from wagtail.fields import RichTextField, StreamField
 from wagtail.images.blocks import ImageChooserBlock
-from wagtail.models import Page, TranslatableMixin
+from wagtail.models import Orderable, Page, TranslatableMixin
 from wagtail.snippets.models import register_snippet
 from wagtail import blocks
 from wagtail.snippets.blocks import SnippetChooserBlock
 from wagtail.search import index
 
+from . import embeds, page_cache, renditions, richtext
+from .panels import RecentLogsPanel
+from .text import stream_to_text
+
 
 class SEOFieldsMixin(models.Model):
     """Reusable SEO metadata fields for pages and snippets."""
@@ -37,7 +42,91 @@ class SEOFieldsMixin(models.Model):
         abstract = True
 
 
-class HomePage(SEOFieldsMixin, Page):
+class PageCacheMixin:
+    """Serve anonymous page views from the page output cache."""
+
+    def serve(self, request, *args, **kwargs):
+        if not page_cache.is_cacheable_request(request):
+            return super().serve(request, *args, **kwargs)
+
+        key = page_cache.make_key(request, self)
+        cached = page_cache.get_response(key, request)
+        if cached is not None:
+            return cached
+
+        response = super().serve(request, *args, **kwargs)
+        if hasattr(response, "render"):
+            response.render()
+        if page_cache.is_cacheable_response(response):
+            page_cache.store_response(request, key, self.pk, response)
+        return response
+
+
+class RenditionPrefetchMixin:
+    """Load the page's images and their configured renditions in bulk before rendering."""
+
+    def get_context(self, request, *args, **kwargs):
+        renditions.prefetch_renditions(self)
+        return super().get_context(request, *args, **kwargs)
+
+
+class ResolvedEmbedBlock(blocks.URLBlock):
+    """Embed URL rendered from its stored resolution; never fetches during a request."""
+
+    def get_context(self, value, parent_context=None):
+        context = super().get_context(value, parent_context)
+        resolved = (parent_context or {}).get("resolved_embeds")
+        if resolved is None:
+            resolved = embeds.load([value]) if value else {}
+        embed = resolved.get(value)
+        context["embed"] = embed if embed is not None and embed.html else None
+        return context
+
+    class Meta:
+        template = "home/blocks/embed_block.html"
+
+
+class EmbedResolverMixin:
+    """Load stored embed results for the whole page in one query and resolve new URLs on publish."""
+
+    def get_context(self, request, *args, **kwargs):
+        context = super().get_context(request, *args, **kwargs)
+        context["resolved_embeds"] = embeds.load(embeds.embed_urls(self))
+        return context
+
+
+class CompiledRichTextMixin(models.Model):
+    """Store rich text with its links and images already expanded, so rendering it needs no queries."""
+
+    # Front-end HTML keyed by source hash; maintained on save and by home.richtext when link targets change.
+    compiled_richtext = models.JSONField(default=dict, blank=True, editable=False)
+
+    class Meta:
+        abstract = True
+
+    def serializable_data(self):
+        # Rebuilt on every save, so revisions don't need to carry it.
+        data = super().serializable_data()
+        data.pop("compiled_richtext", None)
+        return data
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None or not richtext.source_fields(type(self)).isdisjoint(update_fields):
+            self.compiled_richtext = richtext.compile_page(self)
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, "compiled_richtext"}
+        return super().save(*args, **kwargs)
+
+
+class CompiledRichTextBlock(blocks.RichTextBlock):
+    """Rich text rendered from the page's compiled HTML; expands links itself only when no entry exists."""
+
+    def render_basic(self, value, context=None):
+        return richtext.render((context or {}).get("page"), value)
+
+
+class HomePage(PageCacheMixin, RenditionPrefetchMixin, CompiledRichTextMixin, SEOFieldsMixin, Page):
     """Landing page with modular content blocks."""
 
     introduction = RichTextField(blank=True)
@@ -54,9 +143,10 @@ class HomePage(SEOFieldsMixin, Page):
                         ("cta_link", blocks.URLBlock(required=False)),
                     ],
                     template="home/blocks/hero_block.html",
+                    fragment_cache=True,
                 ),
             ),
-            ("content", blocks.RichTextBlock(features=[
+            ("content", CompiledRichTextBlock(features=[
                 "bold",
                 "italic",
                 "h2",
@@ -76,6 +166,7 @@ class HomePage(SEOFieldsMixin, Page):
                         ("button_link", blocks.URLBlock(required=False)),
                     ],
                     template="home/blocks/callout_block.html",
+                    fragment_cache=True,
                 ),
             ),
         ],
@@ -91,7 +182,9 @@ class HomePage(SEOFieldsMixin, Page):
     promote_panels = Page.promote_panels + SEOFieldsMixin.seo_panels
 
 
-class ArticlePage(SEOFieldsMixin, Page):
+class ArticlePage(
+    PageCacheMixin, RenditionPrefetchMixin, EmbedResolverMixin, CompiledRichTextMixin, SEOFieldsMixin, Page
+):
     """Flexible article page with modular StreamField content."""
 
     introduction = models.CharField(max_length=250, blank=True)
@@ -104,8 +197,8 @@ class ArticlePage(SEOFieldsMixin, Page):
     )
     body = StreamField(
         [
-            ("rich_text", blocks.RichTextBlock()),
-            ("image", ImageChooserBlock()),
+            ("rich_text", CompiledRichTextBlock()),
+            ("image", ImageChooserBlock(fragment_cache=True)),
             (
                 "quote",
                 blocks.StructBlock(
@@ -114,19 +207,29 @@ class ArticlePage(SEOFieldsMixin, Page):
                         ("attribution", blocks.CharBlock(required=False)),
                     ],
                     template="home/blocks/quote_block.html",
+                    fragment_cache=True,
                 ),
             ),
-            ("embed", blocks.URLBlock(help_text="Embed URL (YouTube, Vimeo, etc.)")),
+            ("embed", ResolvedEmbedBlock(help_text="Embed URL (YouTube, Vimeo, etc.)")),
         ],
         use_json_field=True,
         blank=True,
     )
     author = models.CharField(max_length=120, blank=True)
     published_date = models.DateField(null=True, blank=True)
+    # Plain text of ``body``, extracted once per save so indexing never walks the StreamField.
+    body_text = models.TextField(blank=True, editable=False)
+    # Weighted title/introduction/author/body vector, maintained by search.fulltext on PostgreSQL.
+    # Its GIN index is created by migration 0003 on PostgreSQL only.
+    search_vector = SearchVectorField(null=True, editable=False)
+    # Id of the source record this page was imported from (home.importer); blank for pages made in the admin.
+    import_id = models.CharField(max_length=255, blank=True, db_index=True, editable=False)
+
+    exclude_fields_in_copy = ["import_id"]
 
     search_fields = Page.search_fields + [
         index.SearchField("introduction"),
-        index.SearchField("body"),
+        index.SearchField("body_text"),
         index.SearchField("author"),
     ]
 
@@ -140,6 +243,31 @@ class ArticlePage(SEOFieldsMixin, Page):
 
     promote_panels = Page.promote_panels + SEOFieldsMixin.seo_panels
 
+    def serializable_data(self):
+        # Derived on save and on publish (search.fulltext), so revisions don't need to carry them.
+        data = super().serializable_data()
+        data.pop("body_text", None)
+        data.pop("search_vector", None)
+        return data
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None or "body" in update_fields:
+            self.body_text = stream_to_text(self.body)
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, "body_text"}
+        return super().save(*args, **kwargs)
+
+
+class PageTombstone(models.Model):
+    """A page that left the export (unpublished, deleted or view-restricted), reported by incremental exports."""
+
+    page_id = models.PositiveIntegerField(unique=True)
+    removed_at = models.DateTimeField(db_index=True)
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"page {self.page_id} removed {self.removed_at:%Y-%m-%d %H:%M}"
+
 
 class DashboardWidget(TranslatableMixin, ClusterableModel):
     """Reusable dashboard widget snippets."""
@@ -226,10 +354,12 @@ class Integration(TranslatableMixin, ClusterableModel):
         FieldPanel("credential_key"),
         FieldPanel("is_active"),
         FieldPanel("last_synced_at"),
-        InlinePanel("logs", label="Activity"),
+        # Logs are written by the sync job and can run to many thousands of rows,
+        # so the editor shows the latest entries read-only instead of an InlinePanel.
+        RecentLogsPanel(heading="Activity"),
     ]
 
-    class Meta:
+    class Meta(TranslatableMixin.Meta):
         verbose_name = "Integration"
         verbose_name_plural = "Integrations"
 
@@ -259,6 +389,24 @@ class IntegrationLogEntry(Orderable):
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [models.Index(fields=["integration", "-created_at"], name="home_intlog_created_idx")]
 
     def __str__(self) -> str:  # pragma: no cover
         return f"{self.integration.name} - {self.status}"
+
+
+class IntegrationLogSummary(models.Model):
+    """Per-day counts of log entries compacted by ``manage.py prune_integration_logs``."""
+
+    integration = models.ForeignKey(Integration, on_delete=models.CASCADE, related_name="log_summaries")
+    day = models.DateField()
+    successes = models.PositiveIntegerField(default=0)
+    errors = models.PositiveIntegerField(default=0)
+    pending = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        ordering = ["-day"]
+        constraints = [models.UniqueConstraint(fields=["integration", "day"], name="home_intlog_summary_unique")]
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"{self.integration.name} - {self.day}"
@@ -0,0 +1,112 @@
+"""Full-page output cache for anonymous Wagtail page views.
+
+Rendered responses are stored under a key built from the site, locale, page id
+and live revision id, so a publish naturally produces a new key. The same entry
+is also stored under a route key (host and path) which ``PageCacheMiddleware``
+checks before Wagtail routes the request, so a warm anonymous hit costs a single
+cache lookup. Every key written for a page is tracked in a small per-page index
+so the signal handlers in ``home.signals`` can drop all variants at once.
+"""
+from __future__ import annotations
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.http import HttpResponse
+from wagtail.models import Site
+
+KEY_PREFIX = "pagecache"
+# Headers describing a single response rather than the rendered page; never replayed from the cache.
+UNCACHED_HEADERS = {"x-page-cache", "set-cookie", "date", "expires"}
+# Upper bound on the number of keys remembered per page (sites x locales x revisions).
+MAX_INDEXED_KEYS = 32
+
+
+def get_cache():
+    return caches[getattr(settings, "PAGE_CACHE_ALIAS", "default")]
+
+
+def get_timeout() -> int:
+    return getattr(settings, "PAGE_CACHE_TIMEOUT", 60 * 60)
+
+
+def is_shared_cache() -> bool:
+    """Whether the page cache is visible to every worker, so invalidation reaches them all."""
+    return not isinstance(get_cache(), LocMemCache)
+
+
+def is_enabled() -> bool:
+    return getattr(settings, "PAGE_CACHE_ENABLED", True) and is_shared_cache()
+
+
+def is_cacheable_request(request) -> bool:
+    """Only plain anonymous GET/HEAD requests without a session are cacheable."""
+    if not is_enabled():
+        return False
+    if request.method not in ("GET", "HEAD"):
+        return False
+    if request.GET:
+        return False
+    if getattr(request, "is_preview", False) or getattr(request, "bypass_page_cache", False):
+        return False
+    return settings.SESSION_COOKIE_NAME not in request.COOKIES
+
+
+def is_cacheable_response(response) -> bool:
+    return response.status_code == 200 and not response.cookies and not response.streaming
+
+
+def make_key(request, page) -> str:
+    site = Site.find_for_request(request)
+    site_id = site.pk if site else 0
+    return f"{KEY_PREFIX}:{site_id}:{page.locale_id}:{page.pk}:{page.live_revision_id or 0}"
+
+
+def route_key(request) -> str:
+    return f"{KEY_PREFIX}:route:{request.get_host()}:{request.path}"
+
+
+def index_key(page_id: int) -> str:
+    return f"{KEY_PREFIX}:index:{page_id}"
+
+
+def get_response(key: str, request=None) -> HttpResponse | None:
+    entry = get_cache().get(key)
+    if entry is None:
+        return None
+    status, headers, content, page_id = entry
+    if request is not None:
+        request.page_cache_page_id = page_id
+    response = HttpResponse(content, status=status)
+    for name, value in headers:
+        response[name] = value
+    response["X-Page-Cache"] = "hit"
+    return response
+
+
+def store_response(request, key: str, page_id: int, response) -> None:
+    cache = get_cache()
+    timeout = get_timeout()
+    headers = [(name, value) for name, value in response.items() if name.lower() not in UNCACHED_HEADERS]
+    entry = (response.status_code, headers, response.content, page_id)
+    new_keys = [key, route_key(request)]
+    cache.set_many(dict.fromkeys(new_keys, entry), timeout)
+
+    keys = cache.get(index_key(page_id)) or []
+    missing = [new_key for new_key in new_keys if new_key not in keys]
+    if missing:
+        keys = (keys + missing)[-MAX_INDEXED_KEYS:]
+        cache.set(index_key(page_id), keys, timeout)
+    response["X-Page-Cache"] = "miss"
+
+
+def invalidate_pages(page_ids) -> None:
+    """Drop every cached response for the given pages."""
+    cache = get_cache()
+    index_keys = [index_key(page_id) for page_id in page_ids]
+    if not index_keys:
+        return
+    stale = list(index_keys)
+    for keys in cache.get_many(index_keys).values():
+        stale.extend(keys)
+    cache.delete_many(stale)
@@ -0,0 +1,28 @@
+"""Custom edit handler panels."""
+from __future__ import annotations
+
+from wagtail.admin.panels import Panel
+
+
+class RecentLogsPanel(Panel):
+    """Read-only list of an integration's most recent log entries."""
+
+    def __init__(self, limit: int = 20, **kwargs):
+        super().__init__(**kwargs)
+        self.limit = limit
+
+    def clone_kwargs(self):
+        kwargs = super().clone_kwargs()
+        kwargs["limit"] = self.limit
+        return kwargs
+
+    class BoundPanel(Panel.BoundPanel):
+        template_name = "home/panels/recent_logs.html"
+
+        def get_context_data(self, parent_context=None):
+            context = super().get_context_data(parent_context)
+            if self.instance.pk:
+                context["logs"] = list(self.instance.logs.order_by("-created_at")[: self.panel.limit])
+            else:
+                context["logs"] = []
+            return context
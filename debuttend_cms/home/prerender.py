@@ -0,0 +1,225 @@
+"""Static pre-rendering of the live page tree and serving of the rendered files.
+
+``manage.py prerender_pages`` renders live public ``HomePage`` and
+``ArticlePage`` pages to ``PRERENDER_ROOT/<site id>/<path>/index.html`` in a process pool and records
+each page's live revision and URL path in a manifest. A re-run renders only the
+pages whose revision or path changed. With ``--shard i/N``, each machine renders
+the pages where ``pk % N == i`` and writes its own manifest file.
+
+``PrerenderMiddleware`` maps anonymous requests to a manifest entry and serves
+the file only while the entry is fresh. Fresh means the page's current live
+revision and URL path, cached per page and dropped by ``home.signals`` on
+publish, unpublish, move and delete, still match what was rendered.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.db import connections
+from django.db.models import F, Q
+from django.http import HttpResponse
+from django.test import RequestFactory
+from wagtail.models import Page, Site
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_GLOB = "manifest-*.json"
+FILE_NAME = "index.html"
+
+
+def get_root() -> Path:
+    return Path(getattr(settings, "PRERENDER_ROOT", settings.BASE_DIR / "prerendered"))
+
+
+def manifest_path(shard: int, shards: int) -> Path:
+    return get_root() / f"manifest-{shard}-of-{shards}.json"
+
+
+def file_path(site_id: int, page_path: str) -> Path:
+    return get_root() / str(site_id) / page_path.strip("/") / FILE_NAME
+
+
+def load_manifest(path: Path) -> dict[str, dict]:
+    try:
+        with open(path) as fh:
+            return json.load(fh)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def write_manifest(path: Path, entries: dict[str, dict]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    with open(tmp, "w") as fh:
+        json.dump(entries, fh)
+    os.replace(tmp, path)
+
+
+def revision_key(page_id: int) -> str:
+    return f"prerender:revision:{page_id}"
+
+
+def current_state(page_id: int) -> tuple[int, str] | None:
+    """Return ``(live_revision_id, url_path)`` if the page may be served anonymously, else ``None``."""
+    key = revision_key(page_id)
+    state = cache.get(key)
+    if state is None:
+        row = Page.objects.live().public().filter(pk=page_id).values_list("live_revision_id", "url_path").first()
+        state = list(row) if row else []
+        cache.set(key, state, getattr(settings, "PRERENDER_STATE_TIMEOUT", 60 * 60))
+    return tuple(state) if state else None
+
+
+def invalidate_pages(page_ids) -> None:
+    """Forget the cached state of the given pages and remove their files from this machine."""
+    page_ids = {str(page_id) for page_id in page_ids}
+    if not page_ids:
+        return
+    cache.delete_many([revision_key(page_id) for page_id in page_ids])
+    for entry in _manifest.entries_for(page_ids):
+        (get_root() / entry["file"]).unlink(missing_ok=True)
+
+
+def get_page_models():
+    """Page types with a front-end template that renders without a logged-in user."""
+    from .models import ArticlePage, HomePage
+
+    return (HomePage, ArticlePage)
+
+
+def select_pages(shard: int = 0, shards: int = 1):
+    """Return ``{page_id: (live_revision_id, url_path)}`` for the live public pages in this shard."""
+    # Only pages under a site root have a URL to render at.
+    in_site = Q(pk__in=[])
+    for root_path in Site.objects.values_list("root_page__path", flat=True):
+        in_site |= Q(path__startswith=root_path)
+    queryset = Page.objects.live().public().type(*get_page_models()).filter(in_site).order_by("pk")
+    if shards > 1:
+        queryset = queryset.annotate(shard=F("pk") % shards).filter(shard=shard)
+    return {
+        page_id: (revision_id, url_path)
+        for page_id, revision_id, url_path in queryset.values_list("pk", "live_revision_id", "url_path").iterator()
+    }
+
+
+def init_worker() -> None:
+    # Forked workers must not share the parent's database connections.
+    connections.close_all()
+
+
+def render_page(page, factory: RequestFactory) -> dict | None:
+    """Render one page to disk and return its manifest entry, or ``None`` if it cannot be served statically."""
+    site_id, root_url, page_path = page.get_url_parts() or (None, None, None)
+    if page_path is None:
+        return None
+    host = root_url.split("://", 1)[-1]
+    request = factory.get(page_path, HTTP_HOST=host, secure=root_url.startswith("https"))
+    request.user = AnonymousUser()
+    # The rendered file is the cache here; don't also fill the page cache from pool workers.
+    request.bypass_page_cache = True
+    response = page.serve(request)
+    if hasattr(response, "render"):
+        response.render()
+    if response.status_code != 200 or response.streaming:
+        return None
+    target = file_path(site_id, page_path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp = target.with_suffix(".tmp")
+    tmp.write_bytes(response.content)
+    os.replace(tmp, target)
+    return {
+        "id": page.pk,
+        "revision": page.live_revision_id,
+        "url_path": page.url_path,
+        "site": site_id,
+        "path": page_path,
+        "file": str(target.relative_to(get_root())),
+        "content_type": response["Content-Type"],
+        "bytes": len(response.content),
+    }
+
+
+def render_batch(page_ids: list[int]) -> tuple[list[dict], list[int]]:
+    """Render ``page_ids`` to disk; runs inside a pool worker.
+
+    Returns the manifest entries and the ids of pages that failed to render.
+    Failures are logged here rather than raised, so one bad page neither stops
+    the run nor has to cross the process boundary as an exception.
+    """
+    factory = RequestFactory()
+    results = []
+    failed = []
+    for page in Page.objects.filter(pk__in=page_ids).specific().select_related("locale"):
+        try:
+            entry = render_page(page, factory)
+        except Exception:
+            logger.exception("Failed to pre-render page %s (%s)", page.pk, page.url_path)
+            failed.append(page.pk)
+            continue
+        if entry is not None:
+            results.append(entry)
+    connections.close_all()
+    return results, failed
+
+
+class ManifestIndex:
+    """All manifests under ``PRERENDER_ROOT`` merged by ``(site id, path)``, reloaded when they change."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._routes: dict[tuple[int, str], dict] = {}
+        self._mtimes: dict[str, float] = {}
+        self._checked_at = 0.0
+
+    def _reload_if_changed(self) -> None:
+        now = time.monotonic()
+        if now - self._checked_at < getattr(settings, "PRERENDER_RELOAD_INTERVAL", 5):
+            return
+        with self._lock:
+            self._checked_at = now
+            paths = sorted(get_root().glob(MANIFEST_GLOB))
+            mtimes = {str(path): path.stat().st_mtime for path in paths}
+            if mtimes == self._mtimes:
+                return
+            routes = {}
+            for path in paths:
+                for entry in load_manifest(path).values():
+                    routes[(entry["site"], entry["path"])] = entry
+            self._routes = routes
+            self._mtimes = mtimes
+
+    def lookup(self, site_id: int, path: str) -> dict | None:
+        self._reload_if_changed()
+        return self._routes.get((site_id, path))
+
+    def entries_for(self, page_ids: set[str]) -> list[dict]:
+        self._reload_if_changed()
+        return [entry for entry in list(self._routes.values()) if str(entry["id"]) in page_ids]
+
+
+_manifest = ManifestIndex()
+
+
+def get_response(request) -> HttpResponse | None:
+    site = Site.find_for_request(request)
+    if site is None:
+        return None
+    entry = _manifest.lookup(site.pk, request.path)
+    if entry is None or current_state(entry["id"]) != (entry["revision"], entry["url_path"]):
+        return None
+    try:
+        content = (get_root() / entry["file"]).read_bytes()
+    except FileNotFoundError:
+        return None
+    request.analytics_page_id = entry["id"]
+    response = HttpResponse(content, content_type=entry["content_type"])
+    response["X-Prerendered"] = "hit"
+    return response
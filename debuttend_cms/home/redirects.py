@@ -0,0 +1,109 @@
+"""Per-process compiled redirect table for ``home.middleware.RedirectMiddleware``.
+
+Wagtail's ``RedirectMiddleware`` queries ``Redirect`` on every 404, up to four
+times per request. Here all redirects are loaded once per process into a dict
+keyed by site and normalised old path, with the target URL already resolved.
+The table is tagged with a version stamp held in the shared cache. Saving or
+deleting a redirect, moving a page, changing a slug or editing a site bumps the
+stamp, and each worker reloads on its next 404. Paths that matched nothing are
+remembered in a bounded negative cache, so repeated scans for dead URLs cost a
+single cache read.
+
+Lookups follow Wagtail's rules: the normalised full path, then its IRI form,
+then the same two without the query string. A site-specific redirect wins over
+one that applies to all sites. Redirects to a page that is not live are left
+out, so their old paths keep answering 404; publishing or unpublishing a
+redirect target bumps the stamp.
+"""
+from __future__ import annotations
+
+import threading
+from collections import defaultdict
+from urllib.parse import urlparse
+
+from django.utils.encoding import uri_to_iri
+from wagtail.contrib.redirects.models import Redirect
+from wagtail.models import Page, Site
+
+from debuttend_cms import generations
+
+VERSION_KEY = "redirects:version"
+# Request paths are client-controlled, so keep the negative cache bounded.
+MAX_MISSES = 10000
+
+_lock = threading.Lock()
+_table: tuple[int, dict[int | None, dict[str, tuple[str | None, bool]]]] | None = None
+_misses: set[tuple[int, int | None, str]] = set()
+
+
+def get_version() -> int:
+    return generations.get(VERSION_KEY)
+
+
+def bump_version() -> None:
+    generations.bump(VERSION_KEY)
+
+
+def build_table() -> dict[int | None, dict[str, tuple[str | None, bool]]]:
+    """Map site id (``None`` for all sites) to ``{old_path: (link, is_permanent)}``."""
+    redirects = list(Redirect.objects.all())
+    page_ids = {redirect.redirect_page_id for redirect in redirects} - {None}
+    pages = Page.objects.live().filter(pk__in=page_ids).specific().in_bulk() if page_ids else {}
+    table = defaultdict(dict)
+    for redirect in redirects:
+        if redirect.redirect_page_id is not None:
+            page = pages.get(redirect.redirect_page_id)
+            if page is None:
+                continue
+            redirect.redirect_page = page
+        table[redirect.site_id][redirect.old_path] = (redirect.link, redirect.is_permanent)
+    return dict(table)
+
+
+def get_table() -> tuple[int, dict[int | None, dict[str, tuple[str | None, bool]]]]:
+    """The ``(version, table)`` pair for the current version stamp, rebuilt when the stamp has moved."""
+    global _table
+    version = get_version()
+    table = _table
+    if table is not None and table[0] == version:
+        return table
+    with _lock:
+        if _table is None or _table[0] != version:
+            _misses.clear()
+            _table = (version, build_table())
+        return _table
+
+
+def candidates(full_path: str) -> list[str]:
+    path = Redirect.normalise_path(full_path)
+    paths = [path, uri_to_iri(path)]
+    path_without_query = urlparse(path).path
+    if path_without_query != path:
+        paths += [path_without_query, uri_to_iri(path_without_query)]
+    return list(dict.fromkeys(paths))
+
+
+def find(request) -> tuple[str | None, bool] | None:
+    """Return ``(link, is_permanent)`` for the request's path, or ``None`` when no redirect matches."""
+    version, table = get_table()
+    site = Site.find_for_request(request)
+    site_id = site.pk if site is not None else None
+    miss_key = (version, site_id, request.get_full_path())
+    if miss_key in _misses:
+        return None
+
+    if site is None:
+        # Wagtail matches redirects for any site when the request has none.
+        lookups = list(table.values())
+    else:
+        lookups = [table.get(site_id, {}), table.get(None, {})]
+    for path in candidates(miss_key[2]):
+        for redirects in lookups:
+            redirect = redirects.get(path)
+            if redirect is not None:
+                return redirect
+
+    if len(_misses) >= MAX_MISSES:
+        _misses.clear()
+    _misses.add(miss_key)
+    return None
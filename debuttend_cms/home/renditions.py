@@ -0,0 +1,154 @@
+"""Image rendition pre-generation on publish and bulk prefetching at render time.
+
+``IMAGE_RENDITION_SPECS`` maps a page model label to the rendition specs its
+templates use, per image source. A source is either an image foreign key
+(``"featured_image"``) or a StreamField path (``"body.image"``,
+``"body.hero.background_image"``). When a page is published, the renditions it
+needs are generated in a process pool after the transaction commits, so the
+first visitor never waits for an image to be decoded and resized.
+
+At render time ``prefetch_renditions`` loads the configured renditions of every
+image source in one query: the image foreign keys, and the images inside
+StreamField blocks that Wagtail has already loaded in bulk. Rendering then
+finds each rendition on its image instead of querying per image and rendition.
+"""
+from __future__ import annotations
+
+import logging
+import multiprocessing
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Prefetch, prefetch_related_objects
+from wagtail.images import get_image_model
+
+logger = logging.getLogger(__name__)
+
+_executor: ProcessPoolExecutor | None = None
+
+
+def get_specs(model) -> dict[str, list[str]]:
+    return getattr(settings, "IMAGE_RENDITION_SPECS", {}).get(model._meta.label, {})
+
+
+def stream_image_ids(stream, block_path: list[str]):
+    """Yield image ids found at ``block_path`` (block type, then struct child names) in a stream."""
+    block_type, *child_path = block_path
+    for block in stream.raw_data:
+        if block.get("type") != block_type:
+            continue
+        value = block.get("value")
+        for name in child_path:
+            value = value.get(name) if isinstance(value, dict) else None
+        if isinstance(value, int):
+            yield value
+
+
+def image_specs(page) -> dict[int, set[str]]:
+    """Return ``{image_id: specs}`` for every configured image source on ``page``."""
+    specs_by_image = defaultdict(set)
+    for source, specs in get_specs(type(page)).items():
+        field_name, *block_path = source.split(".")
+        if block_path:
+            image_ids = stream_image_ids(getattr(page, field_name), block_path)
+        else:
+            image_ids = [getattr(page, f"{field_name}_id")]
+        for image_id in image_ids:
+            if image_id:
+                specs_by_image[image_id].update(specs)
+    return specs_by_image
+
+
+def generate(specs_by_image: dict[int, list[str]]) -> int:
+    """Create any missing renditions; returns the number of renditions ensured."""
+    all_specs = {spec for specs in specs_by_image.values() for spec in specs}
+    images = get_image_model().objects.filter(pk__in=specs_by_image).prefetch_renditions(*all_specs)
+    count = 0
+    for image in images:
+        try:
+            count += len(image.get_renditions(*sorted(specs_by_image[image.pk])))
+        except Exception:  # noqa: BLE001 - a missing source file must not stop the batch
+            logger.exception("Could not generate renditions for image %s", image.pk)
+    return count
+
+
+def init_worker() -> None:
+    import django
+
+    django.setup()
+
+
+def get_executor() -> ProcessPoolExecutor:
+    global _executor
+    if _executor is None:
+        # Spawned rather than forked: web workers run background threads.
+        _executor = ProcessPoolExecutor(
+            max_workers=getattr(settings, "RENDITION_WORKERS", 2),
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=init_worker,
+        )
+    return _executor
+
+
+def _log_failure(future) -> None:
+    if future.exception() is not None:
+        logger.error("Rendition pre-generation failed", exc_info=future.exception())
+
+
+def schedule(page) -> None:
+    """Generate ``page``'s renditions in the background once the current transaction commits."""
+    if not getattr(settings, "RENDITION_PREGENERATE", True):
+        return
+    specs_by_image = {image_id: sorted(specs) for image_id, specs in image_specs(page).items()}
+    if not specs_by_image:
+        return
+
+    def submit():
+        if getattr(settings, "RENDITION_WORKERS", 2) <= 0:
+            generate(specs_by_image)
+            return
+        get_executor().submit(generate, specs_by_image).add_done_callback(_log_failure)
+
+    transaction.on_commit(submit)
+
+
+def stream_images(stream, block_path: list[str]):
+    """Yield the image instances at ``block_path`` in a stream, as loaded by the stream's own bulk fetch."""
+    block_type, *child_path = block_path
+    for child in stream:
+        if child.block_type != block_type:
+            continue
+        value = child.value
+        for name in child_path:
+            value = value.get(name) if isinstance(value, dict) else None
+        if value is not None and hasattr(value, "get_rendition"):
+            yield value
+
+
+def prefetch_renditions(page) -> None:
+    """Load the configured renditions of ``page``'s images, foreign keys and StreamField blocks, in one query."""
+    specs = get_specs(type(page))
+    if not specs:
+        return
+    fields = [source for source in specs if "." not in source]
+    image_ids = {getattr(page, f"{field_name}_id") for field_name in fields} - {None}
+    images = []
+    if image_ids:
+        loaded = get_image_model().objects.in_bulk(image_ids)
+        for field_name in fields:
+            image = loaded.get(getattr(page, f"{field_name}_id"))
+            if image is not None:
+                setattr(page, field_name, image)
+                images.append(image)
+    for source in specs:
+        field_name, *block_path = source.split(".")
+        if block_path:
+            images.extend(stream_images(getattr(page, field_name), block_path))
+    if not images:
+        return
+    all_specs = {spec for source_specs in specs.values() for spec in source_specs}
+    renditions = get_image_model().get_rendition_model().objects.filter(filter_spec__in=all_specs)
+    # Same attribute as ImageQuerySet.prefetch_renditions, which Image.get_rendition checks first.
+    prefetch_related_objects(images, Prefetch("renditions", queryset=renditions, to_attr="prefetched_renditions"))
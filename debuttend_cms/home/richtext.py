@@ -0,0 +1,153 @@
+"""Rich text compiled to front-end HTML when a page is saved.
+
+``expand_db_html`` resolves every internal page link, document link and
+embedded image with its own query. Pages that use ``CompiledRichTextMixin``
+run it once per save and store the result in ``compiled_richtext``, keyed by a
+hash of the source HTML. ``{% compiled_richtext %}`` and
+``CompiledRichTextBlock`` read that mapping, so rendering does no lookups.
+Source that has no entry yet, such as in a preview, is expanded on the fly.
+
+The expanded HTML goes stale when a linked page's URL changes or a linked
+document or image changes. Wagtail's ``ReferenceIndex`` already records which
+pages reference which objects, so those events recompile only the pages that
+reference the changed object. The recompile runs on a background thread after
+the transaction commits (``RICHTEXT_WORKERS``, 0 runs it inline), loading the
+pages in batches of ``RECOMPILE_BATCH_SIZE``. Pages whose output changes have
+their cached renders dropped.
+"""
+from __future__ import annotations
+
+import hashlib
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from django.apps import apps
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.db import connections, transaction
+from django.utils.safestring import mark_safe
+from wagtail.blocks import RichTextBlock
+from wagtail.fields import RichTextField, StreamField
+from wagtail.models import Page, ReferenceIndex
+from wagtail.rich_text import expand_db_html
+
+from . import page_cache, prerender
+
+logger = logging.getLogger(__name__)
+
+RECOMPILE_BATCH_SIZE = 100
+
+_executor: ThreadPoolExecutor | None = None
+
+
+def source_hash(source: str) -> str:
+    return hashlib.sha1(source.encode("utf-8")).hexdigest()
+
+
+def source_fields(model) -> set[str]:
+    return {field.name for field in model._meta.get_fields() if isinstance(field, (RichTextField, StreamField))}
+
+
+def richtext_sources(page) -> list[str]:
+    """Source HTML of ``page``'s rich text fields and top-level rich text stream blocks."""
+    sources = []
+    for field in page._meta.get_fields():
+        if isinstance(field, RichTextField):
+            sources.append(getattr(page, field.attname))
+        elif isinstance(field, StreamField):
+            child_blocks = field.stream_block.child_blocks
+            sources.extend(
+                block.get("value")
+                for block in getattr(page, field.attname).raw_data
+                if isinstance(child_blocks.get(block.get("type")), RichTextBlock)
+            )
+    return [source for source in sources if isinstance(source, str) and source]
+
+
+def compile_page(page) -> dict[str, str]:
+    return {source_hash(source): str(expand_db_html(source)) for source in richtext_sources(page)}
+
+
+def render(page, source) -> str:
+    """Front-end HTML for ``source``, from ``page``'s compiled entries when present."""
+    source = getattr(source, "source", source)
+    if not source:
+        return ""
+    html = (getattr(page, "compiled_richtext", None) or {}).get(source_hash(source))
+    if html is None:
+        html = expand_db_html(source)
+    return mark_safe(html)
+
+
+def compiled_models() -> list:
+    from .models import CompiledRichTextMixin
+
+    return [model for model in apps.get_models() if issubclass(model, CompiledRichTextMixin)]
+
+
+def compiled_content_types() -> list:
+    return list(ContentType.objects.get_for_models(*compiled_models()).values())
+
+
+def referencing_page_ids(model, object_ids) -> set[int]:
+    """Ids of compiled pages whose content references ``model`` objects with ``object_ids``."""
+    rows = ReferenceIndex.objects.filter(
+        to_content_type=ContentType.objects.get_for_model(model),
+        to_object_id__in=[str(pk) for pk in object_ids],
+        base_content_type=ContentType.objects.get_for_model(Page),
+        content_type__in=compiled_content_types(),
+    ).values_list("object_id", flat=True)
+    return {int(pk) for pk in rows}
+
+
+def recompile_pages(page_ids) -> list[int]:
+    """Recompile ``page_ids``' rich text; return the ids whose HTML changed, after dropping their cached renders."""
+    from .models import CompiledRichTextMixin
+
+    changed = []
+    pages = Page.objects.filter(pk__in=page_ids).specific().iterator(chunk_size=RECOMPILE_BATCH_SIZE)
+    for page in pages:
+        if not isinstance(page, CompiledRichTextMixin):
+            continue
+        compiled = compile_page(page)
+        if compiled != page.compiled_richtext:
+            type(page).objects.filter(pk=page.pk).update(compiled_richtext=compiled)
+            changed.append(page.pk)
+    if changed:
+        page_cache.invalidate_pages(changed)
+        prerender.invalidate_pages(changed)
+    return changed
+
+
+def recompile_references(model, object_ids) -> None:
+    """Background task: recompile the pages referencing the given objects."""
+    try:
+        recompile_pages(referencing_page_ids(model, object_ids))
+    except Exception:  # noqa: BLE001 - background task; never propagate
+        logger.exception("Could not recompile rich text referencing %s %s", model._meta.label, object_ids)
+    finally:
+        connections.close_all()
+
+
+def get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=getattr(settings, "RICHTEXT_WORKERS", 1), thread_name_prefix="richtext-recompile"
+        )
+    return _executor
+
+
+def schedule_recompile(model, object_ids) -> None:
+    """Recompile pages referencing the given objects in the background once the current transaction commits."""
+    object_ids = list(object_ids)
+    if not object_ids:
+        return
+
+    def submit():
+        if getattr(settings, "RICHTEXT_WORKERS", 1) <= 0:
+            recompile_pages(referencing_page_ids(model, object_ids))
+            return
+        get_executor().submit(recompile_references, model, object_ids)
+
+    transaction.on_commit(submit)
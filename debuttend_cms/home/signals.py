@@ -0,0 +1,125 @@
+"""Signal receivers keeping derived page data in sync with publishing."""
+from __future__ import annotations
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+from wagtail.contrib.redirects.models import Redirect
+from wagtail.documents import get_document_model
+from wagtail.images import get_image_model
+from wagtail.models import Page, PageViewRestriction, Site
+from wagtail.signals import page_published, page_slug_changed, page_unpublished, post_page_move
+
+from . import api, embeds, export, page_cache, prerender, redirects, renditions, richtext, sitemaps
+from .models import ArticlePage
+
+
+@receiver(page_published)
+@receiver(page_unpublished)
+def invalidate_page_cache(sender, instance, **kwargs):
+    page_cache.invalidate_pages([instance.pk])
+    prerender.invalidate_pages([instance.pk])
+    api.bump_generation()
+
+
+@receiver(page_unpublished)
+def record_unpublished_tombstone(sender, instance, **kwargs):
+    export.record_removed([instance.pk])
+
+
+@receiver(page_published)
+def invalidate_published_sitemap_shard(sender, instance, **kwargs):
+    sitemaps.invalidate_page(instance, instance.last_published_at)
+
+
+@receiver(page_unpublished)
+def invalidate_unpublished_sitemap_shard(sender, instance, **kwargs):
+    sitemaps.invalidate_page(instance, timezone.now())
+
+
+@receiver(page_published)
+def pregenerate_renditions(sender, instance, **kwargs):
+    renditions.schedule(instance.specific)
+
+
+@receiver(page_published, sender=ArticlePage)
+def resolve_page_embeds(sender, instance, **kwargs):
+    embeds.schedule(instance)
+
+
+@receiver(post_page_move)
+@receiver(page_slug_changed)
+def invalidate_moved_page_cache(sender, instance, **kwargs):
+    page_ids = Page.objects.descendant_of(instance, inclusive=True).values_list("pk", flat=True)
+    page_cache.invalidate_pages(list(page_ids))
+    prerender.invalidate_pages(page_ids)
+    api.bump_generation()
+    sitemaps.bump_generation()
+
+
+@receiver(post_page_move)
+@receiver(page_slug_changed)
+def recompile_links_to_moved_pages(sender, instance, **kwargs):
+    page_ids = Page.objects.descendant_of(instance, inclusive=True).values_list("pk", flat=True)
+    richtext.schedule_recompile(Page, page_ids)
+
+
+@receiver(page_unpublished)
+def recompile_links_to_unpublished_page(sender, instance, **kwargs):
+    richtext.schedule_recompile(Page, [instance.pk])
+
+
+@receiver(post_save, sender=get_document_model())
+@receiver(post_delete, sender=get_document_model())
+@receiver(post_save, sender=get_image_model())
+@receiver(post_delete, sender=get_image_model())
+def recompile_links_to_media(sender, instance, created=False, **kwargs):
+    if not created:
+        richtext.schedule_recompile(sender, [instance.pk])
+
+
+@receiver(post_save, sender=Redirect)
+@receiver(post_delete, sender=Redirect)
+@receiver(post_page_move)
+@receiver(page_slug_changed)
+def invalidate_redirect_table(sender, instance, **kwargs):
+    redirects.bump_version()
+
+
+@receiver(page_published)
+@receiver(page_unpublished)
+def invalidate_redirects_to_page(sender, instance, **kwargs):
+    # Redirects to pages that are not live are left out of the table.
+    if Redirect.objects.filter(redirect_page_id=instance.pk).exists():
+        redirects.bump_version()
+
+
+@receiver(post_save, sender=PageViewRestriction)
+@receiver(post_delete, sender=PageViewRestriction)
+def invalidate_restricted_page_cache(sender, instance, **kwargs):
+    page_ids = Page.objects.descendant_of(instance.page, inclusive=True).values_list("pk", flat=True)
+    page_cache.invalidate_pages(list(page_ids))
+    prerender.invalidate_pages(page_ids)
+    api.bump_generation()
+    sitemaps.bump_generation()
+    if kwargs.get("created"):
+        export.record_removed(list(page_ids))
+
+
+# Deleting a specific page also deletes its parent ``Page`` row, which sends this signal.
+@receiver(post_delete, sender=Page)
+def invalidate_deleted_page_cache(sender, instance, **kwargs):
+    page_cache.invalidate_pages([instance.pk])
+    prerender.invalidate_pages([instance.pk])
+    richtext.schedule_recompile(Page, [instance.pk])
+    sitemaps.invalidate_page(instance, timezone.now())
+    export.record_removed([instance.pk])
+    api.bump_generation()
+
+
+@receiver(post_save, sender=Site)
+@receiver(post_delete, sender=Site)
+def invalidate_site_api_cache(sender, instance, **kwargs):
+    api.bump_generation()
+    sitemaps.bump_generation()
+    redirects.bump_version()
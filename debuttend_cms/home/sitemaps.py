@@ -0,0 +1,149 @@
+"""Sharded XML sitemaps generated from streaming queries and cached per shard.
+
+A site's live, public pages are split by tree path into shards of about
+``SITEMAP_SHARD_SIZE`` pages. The shard boundaries and each shard's latest
+``last_published_at`` come from one streaming scan ordered by path. They are
+cached as the site's layout, which ``/sitemap.xml`` renders as a sitemap index.
+Each ``/sitemap-<n>.xml`` is built by one streaming query over its path range
+and cached as a finished document.
+
+Publishing, unpublishing or deleting a page drops only the shard whose range
+contains the page's path. Moves, view restrictions and site changes bump a
+generation that retires every layout and shard. A new page simply joins the
+shard its path falls in. When a regenerated shard has grown past twice the
+shard size, the layout is rebuilt on the next request.
+"""
+from __future__ import annotations
+
+from bisect import bisect_right
+from xml.sax.saxutils import escape
+
+from django.conf import settings
+from django.core.cache import cache
+from wagtail.models import Page, Site
+
+from debuttend_cms import generations
+
+GENERATION_KEY = "sitemap:generation"
+XMLNS = "http://www.sitemaps.org/schemas/sitemap/0.9"
+
+
+def get_generation() -> int:
+    return generations.get(GENERATION_KEY)
+
+
+def bump_generation() -> None:
+    generations.bump(GENERATION_KEY)
+
+
+def get_shard_size() -> int:
+    # The sitemap protocol allows at most 50,000 URLs per file.
+    return min(getattr(settings, "SITEMAP_SHARD_SIZE", 10000), 50000)
+
+
+def get_timeout() -> int:
+    return getattr(settings, "SITEMAP_CACHE_TIMEOUT", 24 * 60 * 60)
+
+
+def layout_key(site_id: int) -> str:
+    return f"sitemap:{get_generation()}:{site_id}:layout"
+
+
+def shard_key(site_id: int, shard: int) -> str:
+    return f"sitemap:{get_generation()}:{site_id}:shard:{shard}"
+
+
+def site_pages(site: Site):
+    return Page.objects.live().public().descendant_of(site.root_page, inclusive=True).order_by("path")
+
+
+def build_layout(site: Site) -> dict:
+    """Scan the site's page paths once, starting a new shard every ``SITEMAP_SHARD_SIZE`` pages."""
+    shard_size = get_shard_size()
+    starts, lastmods = [], []
+    rows = site_pages(site).values_list("path", "last_published_at").iterator(chunk_size=shard_size)
+    for position, (path, last_published_at) in enumerate(rows):
+        if position % shard_size == 0:
+            starts.append(path)
+            lastmods.append(None)
+        if last_published_at is not None and (lastmods[-1] is None or last_published_at > lastmods[-1]):
+            lastmods[-1] = last_published_at
+    return {"starts": starts, "lastmods": lastmods}
+
+
+def get_layout(site: Site) -> dict:
+    key = layout_key(site.pk)
+    layout = cache.get(key)
+    if layout is None:
+        layout = build_layout(site)
+        cache.set(key, layout, get_timeout())
+    return layout
+
+
+def render_index(site: Site, shard_url) -> str:
+    layout = get_layout(site)
+    entries = []
+    for shard, lastmod in enumerate(layout["lastmods"]):
+        entry = f"<sitemap><loc>{escape(shard_url(shard))}</loc>"
+        if lastmod is not None:
+            entry += f"<lastmod>{lastmod.isoformat()}</lastmod>"
+        entries.append(entry + "</sitemap>")
+    return (
+        f'<?xml version="1.0" encoding="UTF-8"?>\n<sitemapindex xmlns="{XMLNS}">'
+        + "".join(entries)
+        + "</sitemapindex>\n"
+    )
+
+
+def build_shard(site: Site, layout: dict, shard: int) -> tuple[str, int]:
+    """Return the shard's ``<urlset>`` document and its URL count, from one streaming query."""
+    starts = layout["starts"]
+    pages = site_pages(site).filter(path__gte=starts[shard])
+    if shard + 1 < len(starts):
+        pages = pages.filter(path__lt=starts[shard + 1])
+    root_url = site.root_url
+    root_path_length = len(site.root_page.url_path) - 1
+    entries = []
+    for url_path, last_published_at in pages.values_list("url_path", "last_published_at").iterator(
+        chunk_size=2000
+    ):
+        entry = f"<url><loc>{escape(root_url + url_path[root_path_length:])}</loc>"
+        if last_published_at is not None:
+            entry += f"<lastmod>{last_published_at.isoformat()}</lastmod>"
+        entries.append(entry + "</url>")
+    document = (
+        f'<?xml version="1.0" encoding="UTF-8"?>\n<urlset xmlns="{XMLNS}">' + "".join(entries) + "</urlset>\n"
+    )
+    return document, len(entries)
+
+
+def render_shard(site: Site, shard: int) -> str | None:
+    """The cached document for ``shard`` of ``site``; ``None`` when the shard does not exist."""
+    key = shard_key(site.pk, shard)
+    document = cache.get(key)
+    if document is not None:
+        return document
+    layout = get_layout(site)
+    if not 0 <= shard < len(layout["starts"]):
+        return None
+    document, count = build_shard(site, layout, shard)
+    cache.set(key, document, get_timeout())
+    if count > 2 * get_shard_size():
+        bump_generation()
+    return document
+
+
+def invalidate_page(page, changed_at) -> None:
+    """Drop the cached shard containing ``page`` in each site it belongs to and move its lastmod to ``changed_at``."""
+    for root in Site.get_site_root_paths():
+        if not page.url_path.startswith(root.root_path):
+            continue
+        key = layout_key(root.site_id)
+        layout = cache.get(key)
+        if layout is None or not layout["starts"]:
+            continue
+        shard = max(bisect_right(layout["starts"], page.path) - 1, 0)
+        cache.delete(shard_key(root.site_id, shard))
+        if changed_at is not None and (layout["lastmods"][shard] is None or changed_at > layout["lastmods"][shard]):
+            layout["lastmods"][shard] = changed_at
+            cache.set(key, layout, get_timeout())
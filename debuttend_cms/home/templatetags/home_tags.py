@@ -0,0 +1,20 @@
+"""Template tags for rendering content pages."""
+from __future__ import annotations
+
+from django import template
+
+from home import block_cache, richtext
+
+register = template.Library()
+
+
+@register.simple_tag(takes_context=True)
+def include_cached_block(context, block):
+    """Drop-in replacement for ``include_block`` backed by the block fragment cache."""
+    return block_cache.render(block, context.flatten())
+
+
+@register.simple_tag(takes_context=True)
+def compiled_richtext(context, value):
+    """Drop-in replacement for the ``richtext`` filter that reads the page's precompiled HTML."""
+    return richtext.render(context.get("page"), value)
@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+from django.core.cache import cache
+from django.test import TestCase
+from wagtail.models import Site
+
+from home.models import ArticlePage
+
+
+class CachedPagesAPITests(TestCase):
+    def setUp(self):
+        cache.clear()
+        root = Site.objects.get(is_default_site=True).root_page
+        self.first = root.add_child(instance=ArticlePage(title="First", slug="first"))
+        self.second = root.add_child(instance=ArticlePage(title="Second", slug="second"))
+
+    def test_detail_answers_matching_etag_with_304(self):
+        url = f"/api/v2/pages/{self.first.pk}/"
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("Last-Modified", response)
+        not_modified = self.client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(not_modified["ETag"], response["ETag"])
+
+    def test_listing_etag_changes_on_unpublish(self):
+        response = self.client.get("/api/v2/pages/")
+        etag = response["ETag"]
+        self.assertEqual(response["X-API-Cache"], "miss")
+        self.assertEqual(self.client.get("/api/v2/pages/", HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        self.second.unpublish()
+        response = self.client.get("/api/v2/pages/", HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(response.json()["meta"]["total_count"], 2)  # the site root and the remaining article
+
+    def test_if_modified_since_alone_is_not_answered_with_304(self):
+        response = self.client.get("/api/v2/pages/", HTTP_IF_MODIFIED_SINCE="Fri, 01 Jan 2100 00:00:00 GMT")
+
+        self.assertEqual(response.status_code, 200)
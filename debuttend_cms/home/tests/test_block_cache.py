@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+from django.core.cache import cache
+from django.template import Context, Template
+from django.test import TestCase
+from wagtail.models import Site
+
+from home import block_cache
+from home.models import ArticlePage
+
+TEMPLATE = Template("{% load home_tags %}{% for block in page.body %}{% include_cached_block block %}{% endfor %}")
+
+
+def quote(text):
+    return ("quote", {"quote": text, "attribution": "Someone"})
+
+
+class IncludeCachedBlockTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        block_cache.stats.reset()
+        root = Site.objects.get(is_default_site=True).root_page
+        self.page = root.add_child(instance=ArticlePage(title="Article", slug="article", body=[quote("One"), quote("Two")]))
+
+    def render(self):
+        return TEMPLATE.render(Context({"page": ArticlePage.objects.get(pk=self.page.pk)}))
+
+    def test_second_render_reuses_fragments(self):
+        first = self.render()
+        second = self.render()
+
+        self.assertEqual(second, first)
+        self.assertIn("One", first)
+        self.assertEqual(block_cache.stats.snapshot(), {"quote": {"hits": 2, "misses": 2}})
+
+    def test_editing_one_block_only_rerenders_that_block(self):
+        self.render()
+        self.page.body[1] = quote("Changed")
+        self.page.save()
+        block_cache.stats.reset()
+
+        html = self.render()
+
+        self.assertIn("Changed", html)
+        self.assertNotIn("Two", html)
+        self.assertEqual(block_cache.stats.snapshot(), {"quote": {"hits": 1, "misses": 1}})
+
+    def test_key_includes_stream_id_and_value(self):
+        first, second = self.page.body
+
+        self.assertNotEqual(block_cache.make_key(first), block_cache.make_key(second))
+        first.value["quote"] = "Two"
+        self.assertNotEqual(block_cache.make_key(first), block_cache.make_key(second))
+        self.assertTrue(block_cache.make_key(first).startswith(f"{block_cache.KEY_PREFIX}:{first.id}:"))
@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from wagtail.embeds.models import Embed
+from wagtail.models import Site
+
+from home import embeds
+from home.models import ArticlePage
+
+YOUTUBE = "https://www.youtube.com/watch?v=abc123"
+UNSUPPORTED = "https://example.com/clip"
+
+
+@override_settings(WAGTAILEMBEDS_FINDERS=[{"class": "home.embeds.LocalEmbedFinder"}], EMBED_TTL=60)
+class ResolveEmbedsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_stores_results_in_wagtail_embeds_and_remembers_failures(self):
+        self.assertEqual(embeds.resolve_urls([YOUTUBE, UNSUPPORTED, YOUTUBE]), 2)
+
+        embed = Embed.objects.get()
+        self.assertEqual((embed.url, embed.provider_name), (YOUTUBE, "YouTube"))
+        self.assertIn("youtube-nocookie.com/embed/abc123", embed.html)
+        self.assertIsNotNone(embed.cache_until)
+        self.assertEqual(set(embeds.load([YOUTUBE, UNSUPPORTED])), {YOUTUBE})
+        # The stored result and the remembered failure both count as fresh.
+        self.assertEqual(embeds.resolve_urls([YOUTUBE, UNSUPPORTED]), 0)
+        self.assertEqual(embeds.resolve_urls([YOUTUBE, UNSUPPORTED], force=True), 2)
+
+    def test_page_renders_stored_players_and_links_the_rest(self):
+        root = Site.objects.get(is_default_site=True).root_page
+        article = root.add_child(
+            instance=ArticlePage(title="Article", slug="article", body=[("embed", YOUTUBE), ("embed", UNSUPPORTED)])
+        )
+        embeds.resolve_urls(embeds.embed_urls(article))
+
+        response = self.client.get(article.url)
+
+        self.assertContains(response, "https://www.youtube-nocookie.com/embed/abc123")
+        self.assertContains(response, f'<a href="{UNSUPPORTED}"')
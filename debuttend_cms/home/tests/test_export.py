@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import json
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.utils import timezone
+from wagtail.models import Site
+
+from home.models import ArticlePage
+
+
+class PageExportTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        root = Site.objects.get(is_default_site=True).root_page
+        cls.kept = root.add_child(instance=ArticlePage(title="Kept", slug="kept", last_published_at=timezone.now()))
+        cls.dropped = root.add_child(instance=ArticlePage(title="Dropped", slug="dropped"))
+        cls.user = get_user_model().objects.create_user("exporter", password="secret")
+
+    def export(self, **params) -> list[dict]:
+        self.client.force_login(self.user)
+        response = self.client.get("/api/v2/export/pages/", params)
+        self.assertEqual(response.status_code, 200)
+        return [json.loads(line) for line in b"".join(response.streaming_content).splitlines()]
+
+    def test_leaves_out_derived_columns(self):
+        fields = next(line["fields"] for line in self.export() if line.get("id") == self.kept.pk)
+
+        self.assertIn("introduction", fields)
+        self.assertNotIn("compiled_richtext", fields)
+        self.assertNotIn("body_text", fields)
+        self.assertNotIn("search_vector", fields)
+
+    def test_incremental_export_lists_removed_pages(self):
+        since = timezone.now() - timedelta(minutes=1)
+        self.dropped.unpublish()
+
+        lines = self.export(since=since.isoformat())
+
+        self.assertEqual([line["id"] for line in lines if line.get("deleted") is True], [self.dropped.pk])
+        self.assertEqual(lines[-1]["deleted"], 1)
+        self.assertEqual([line["id"] for line in lines if "title" in line], [self.kept.pk])
+
+    def test_republished_pages_are_not_reported_as_removed(self):
+        since = timezone.now() - timedelta(minutes=1)
+        self.dropped.unpublish()
+        self.dropped.save_revision().publish()
+
+        self.assertEqual(self.export(since=since.isoformat())[-1]["deleted"], 0)
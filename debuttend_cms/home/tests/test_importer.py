@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import io
+import json
+import tempfile
+from pathlib import Path
+
+from django.test import TestCase
+from wagtail.models import Site
+
+from home import importer
+from home.models import ArticlePage, HomePage
+
+
+class ImportArticlesTests(TestCase):
+    def setUp(self):
+        root = Site.objects.get(is_default_site=True).root_page
+        self.parent = root.add_child(instance=HomePage(title="News", slug="news"))
+        self.parent.add_child(instance=ArticlePage(title="Launch", slug="launch"))
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.checkpoint_path = str(Path(directory.name) / "import.checkpoint")
+
+    def run_import(self, *records):
+        handle = io.StringIO("".join(json.dumps(record) + "\n" for record in records))
+        checkpoint = importer.Checkpoint(self.checkpoint_path)
+        return importer.import_articles(handle, self.parent, checkpoint, batch_size=2)
+
+    def test_matches_records_on_their_source_id(self):
+        first = self.run_import({"id": 1, "title": "Launch"}, {"id": 2, "title": "Launch"})
+        second = self.run_import({"id": 1, "title": "Launch"}, {"id": 3, "title": "Update"})
+
+        self.assertEqual((first.imported, first.skipped, first.conflicts), (2, 0, 0))
+        self.assertEqual((second.imported, second.skipped, second.conflicts), (1, 1, 0))
+        self.assertEqual(
+            dict(ArticlePage.objects.child_of(self.parent).exclude(import_id="").values_list("import_id", "slug")),
+            {"1": "launch-2", "2": "launch-3", "3": "update"},
+        )
+
+    def test_reports_slug_collisions_without_an_id_as_conflicts(self):
+        report = self.run_import({"title": "Launch"}, {"title": "Other"})
+
+        self.assertEqual((report.imported, report.skipped, report.conflicts), (1, 0, 1))
+        self.assertEqual(
+            report.errors, ["line 1: slug 'launch' belongs to an existing page; give the record an id to import it"]
+        )
+        self.assertEqual(importer.Checkpoint.load(self.checkpoint_path).conflicts, 1)
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from wagtail.models import Site
+
+from analytics.buffer import get_buffer
+from home.checks import check_page_cache_backend
+from home.models import ArticlePage
+
+LOCMEM = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+
+class PageCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.root = Site.objects.get(is_default_site=True).root_page
+        self.parent = self.root.add_child(instance=ArticlePage(title="Parent", slug="parent"))
+        self.child = self.parent.add_child(instance=ArticlePage(title="Child", slug="child"))
+
+    def tearDown(self):
+        get_buffer().flush()
+
+    def test_second_request_is_served_from_cache(self):
+        first = self.client.get("/parent/child/")
+        second = self.client.get("/parent/child/")
+
+        self.assertEqual(first["X-Page-Cache"], "miss")
+        self.assertEqual(second["X-Page-Cache"], "hit")
+        self.assertEqual(second.content, first.content)
+
+    def test_publish_drops_cached_response(self):
+        self.client.get("/parent/child/")
+        self.child.title = "Child renamed"
+        self.child.save_revision().publish()
+
+        response = self.client.get("/parent/child/")
+
+        self.assertEqual(response["X-Page-Cache"], "miss")
+        self.assertContains(response, "Child renamed")
+
+    def test_parent_slug_change_drops_cached_descendant_routes(self):
+        self.assertEqual(self.client.get("/parent/child/").status_code, 200)
+        self.parent.slug = "renamed"
+        with self.captureOnCommitCallbacks(execute=True):
+            self.parent.save_revision().publish()
+
+        self.assertRedirects(self.client.get("/parent/child/"), "/renamed/child/", status_code=301)
+        self.assertEqual(self.client.get("/renamed/child/").status_code, 200)
+
+    @override_settings(CACHES=LOCMEM)
+    def test_per_process_backend_disables_page_cache(self):
+        self.client.get("/parent/child/")
+        response = self.client.get("/parent/child/")
+
+        self.assertNotIn("X-Page-Cache", response)
+        self.assertEqual([error.id for error in check_page_cache_backend(None)], ["home.W001"])
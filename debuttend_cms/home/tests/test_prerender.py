@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import shutil
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import RequestFactory, TestCase, override_settings
+from wagtail.models import Site
+
+from analytics.buffer import get_buffer
+from home import page_cache, prerender
+from home.models import ArticlePage, DashboardPage, HomePage
+
+
+class SelectPagesTests(TestCase):
+    def test_selects_only_page_types_that_render_statically(self):
+        root = Site.objects.get(is_default_site=True).root_page
+        home = root.add_child(instance=HomePage(title="Home", slug="home-page"))
+        article = root.add_child(instance=ArticlePage(title="Article", slug="article"))
+        root.add_child(instance=DashboardPage(title="Dashboard", slug="dashboard"))
+
+        self.assertEqual(set(prerender.select_pages()), {home.pk, article.pk})
+
+
+class PrerenderServeTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.root_dir = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.root_dir)
+        settings_override = override_settings(PRERENDER_ROOT=self.root_dir, PRERENDER_RELOAD_INTERVAL=0)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        manifest_patch = mock.patch.object(prerender, "_manifest", prerender.ManifestIndex())
+        manifest_patch.start()
+        self.addCleanup(manifest_patch.stop)
+        root = Site.objects.get(is_default_site=True).root_page
+        self.article = root.add_child(instance=ArticlePage(title="Article", slug="article"))
+
+    def tearDown(self):
+        get_buffer().flush()
+
+    def prerender(self):
+        entry = prerender.render_page(ArticlePage.objects.get(pk=self.article.pk), RequestFactory())
+        prerender.write_manifest(prerender.manifest_path(0, 1), {str(entry["id"]): entry})
+
+    def test_rendering_does_not_fill_the_page_cache(self):
+        self.prerender()
+
+        self.assertIsNone(page_cache.get_cache().get(page_cache.index_key(self.article.pk)))
+
+    def test_serves_the_file_until_the_page_is_published(self):
+        self.prerender()
+        self.assertEqual(self.client.get("/article/")["X-Prerendered"], "hit")
+
+        self.article.title = "Article updated"
+        self.article.save_revision().publish()
+        response = self.client.get("/article/")
+
+        self.assertNotIn("X-Prerendered", response)
+        self.assertContains(response, "Article updated")
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+from django.core.cache import cache
+from django.test import RequestFactory, TestCase, override_settings
+from wagtail.contrib.redirects.models import Redirect
+from wagtail.models import Site
+
+from analytics.buffer import get_buffer
+from home import redirects
+from home.models import ArticlePage
+
+
+class RedirectMiddlewareTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.site = Site.objects.get(is_default_site=True)
+        self.other_site = Site.objects.create(hostname="other.test", root_page=self.site.root_page)
+
+    def tearDown(self):
+        get_buffer().flush()
+
+    def add(self, old_path, **kwargs):
+        kwargs.setdefault("redirect_link", "https://example.com/new/")
+        return Redirect.objects.create(old_path=Redirect.normalise_path(old_path), **kwargs)
+
+    def test_matches_exact_and_normalised_paths(self):
+        self.add("/old/")
+        self.add("/listing?b=2&a=1", redirect_link="https://example.com/listing/", is_permanent=False)
+
+        self.assertRedirects(self.client.get("/old"), "https://example.com/new/", 301, fetch_redirect_response=False)
+        self.assertRedirects(
+            self.client.get("/old/?utm_source=mail"), "https://example.com/new/", 301, fetch_redirect_response=False
+        )
+        self.assertRedirects(
+            self.client.get("/listing/?a=1&b=2"), "https://example.com/listing/", 302, fetch_redirect_response=False
+        )
+
+    def test_site_specific_redirect_wins_over_all_sites(self):
+        self.add("/promo/", redirect_link="https://example.com/everywhere/")
+        self.add("/promo/", site=self.site, redirect_link="https://example.com/main-site/")
+
+        main = self.client.get("/promo/", HTTP_HOST="localhost")
+        other = self.client.get("/promo/", HTTP_HOST="other.test")
+
+        self.assertEqual(main["Location"], "https://example.com/main-site/")
+        self.assertEqual(other["Location"], "https://example.com/everywhere/")
+
+    def test_redirect_to_an_unpublished_page_is_a_404(self):
+        article = self.site.root_page.add_child(instance=ArticlePage(title="Target", slug="target"))
+        self.add("/moved/", redirect_link="", redirect_page=article)
+        self.assertEqual(self.client.get("/moved/")["Location"], "http://localhost/target/")
+
+        article.unpublish()
+
+        self.assertEqual(self.client.get("/moved/").status_code, 404)
+
+    def test_saving_a_redirect_drops_remembered_misses(self):
+        self.assertEqual(self.client.get("/later/").status_code, 404)
+
+        self.add("/later/")
+
+        self.assertEqual(self.client.get("/later/").status_code, 301)
+
+
+# Query budgets count content queries; keep cache reads off the database cache.
+@override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}})
+class NegativeCacheTests(TestCase):
+    def test_repeated_miss_makes_no_queries(self):
+        site = Site.objects.get(is_default_site=True)
+        Redirect.objects.create(old_path="/old", redirect_link="https://example.com/new/")
+
+        def lookup():
+            request = RequestFactory().get("/missing/")
+            # Set by Wagtail while serving the 404, before the middleware looks up redirects.
+            request._wagtail_site = site
+            return redirects.find(request)
+
+        self.assertIsNone(lookup())
+        with self.assertNumQueries(0):
+            self.assertIsNone(lookup())
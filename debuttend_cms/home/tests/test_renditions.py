@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+from django.test import TestCase, override_settings
+from wagtail.images import get_image_model
+from wagtail.images.tests.utils import get_test_image_file
+from wagtail.models import Site
+
+from home.models import ArticlePage
+from home.renditions import prefetch_renditions
+
+
+# Query budgets count content queries; keep cache reads off the database cache.
+@override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}})
+class PrefetchRenditionsTests(TestCase):
+    def test_loads_foreign_key_and_stream_renditions_up_front(self):
+        Image = get_image_model()
+        images = [Image.objects.create(title=f"Image {n}", file=get_test_image_file()) for n in range(3)]
+        for image in images:
+            image.get_rendition("original")
+        images[0].get_rendition("fill-1200x600")
+        root = Site.objects.get(is_default_site=True).root_page
+        article = root.add_child(
+            instance=ArticlePage(
+                title="Article",
+                slug="article",
+                featured_image=images[0],
+                body=[("image", images[1]), ("image", images[2])],
+            )
+        )
+        page = ArticlePage.objects.get(pk=article.pk)
+        list(page.body)  # StreamField loads its images in bulk, outside the prefetch.
+
+        prefetch_renditions(page)
+
+        with self.assertNumQueries(0):
+            page.featured_image.get_rendition("fill-1200x600")
+            for child in page.body:
+                child.value.get_rendition("original")
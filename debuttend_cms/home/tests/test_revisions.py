@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+from django.test import TestCase
+from wagtail.models import Site
+from wagtail.rich_text import RichText
+
+from home.models import ArticlePage
+
+DERIVED_FIELDS = {"body_text", "search_vector", "compiled_richtext"}
+
+
+class RevisionContentTests(TestCase):
+    def setUp(self):
+        root = Site.objects.get(is_default_site=True).root_page
+        self.article = root.add_child(
+            instance=ArticlePage(title="Article", slug="article", body=[("rich_text", RichText("<p>Original</p>"))])
+        )
+
+    def test_derived_columns_are_left_out_of_revisions(self):
+        revision = self.article.save_revision()
+
+        self.assertFalse(DERIVED_FIELDS & set(revision.content))
+
+    def test_publishing_a_revision_rebuilds_derived_columns(self):
+        self.article.body = [("rich_text", RichText("<p>Updated</p>"))]
+        self.article.save_revision().publish()
+
+        article = ArticlePage.objects.get(pk=self.article.pk)
+        self.assertEqual(article.body_text.strip(), "Updated")
+        self.assertIn("Updated", "".join(article.compiled_richtext.values()))
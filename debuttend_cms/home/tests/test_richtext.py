@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from wagtail.models import Site
+from wagtail.rich_text import RichText
+
+from home import richtext
+from home.models import ArticlePage
+
+
+class ScheduleRecompileTests(TestCase):
+    def setUp(self):
+        root = Site.objects.get(is_default_site=True).root_page
+        self.target = root.add_child(instance=ArticlePage(title="Target", slug="target"))
+        link = f'<p><a linktype="page" id="{self.target.pk}">Target</a></p>'
+        self.article = root.add_child(
+            instance=ArticlePage(title="Article", slug="article", body=[("rich_text", RichText(link))])
+        )
+
+    def rename_target(self):
+        self.target.slug = "renamed"
+        self.target.save_revision().publish()
+
+    @override_settings(RICHTEXT_WORKERS=0)
+    def test_recompiles_referencing_pages_after_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.rename_target()
+
+        self.article.refresh_from_db()
+        self.assertIn("/renamed/", "".join(self.article.compiled_richtext.values()))
+
+    @override_settings(RICHTEXT_WORKERS=1)
+    def test_hands_the_recompile_to_a_background_worker(self):
+        with mock.patch.object(richtext, "get_executor") as get_executor:
+            with self.captureOnCommitCallbacks(execute=True):
+                self.rename_target()
+
+        get_executor.return_value.submit.assert_called_with(richtext.recompile_references, mock.ANY, mock.ANY)
+        self.article.refresh_from_db()
+        self.assertNotIn("/renamed/", "".join(self.article.compiled_richtext.values()))
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import re
+from datetime import datetime, timedelta
+from datetime import timezone as dt_timezone
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from wagtail.models import Page, Site
+
+from home import sitemaps
+from home.models import ArticlePage
+
+START = datetime(2024, 1, 1, tzinfo=dt_timezone.utc)
+
+
+def locs(document: str) -> list[str]:
+    return re.findall(r"<loc>([^<]+)</loc>", document)
+
+
+def lastmods(document: str) -> list[str]:
+    return re.findall(r"<lastmod>([^<]+)</lastmod>", document)
+
+
+@override_settings(SITEMAP_SHARD_SIZE=2)
+class SitemapTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.site = Site.objects.get(is_default_site=True)
+        self.root = self.site.root_page
+        self.articles = [self.add_article(number) for number in range(4)]
+        # The site root and four articles: shards [root, 0], [1, 2] and [3].
+        Page.objects.filter(pk=self.root.pk).update(last_published_at=START)
+
+    def add_article(self, number: int) -> ArticlePage:
+        article = self.root.add_child(instance=ArticlePage(title=f"Article {number}", slug=f"article-{number}"))
+        ArticlePage.objects.filter(pk=article.pk).update(last_published_at=START + timedelta(days=number + 1))
+        article.refresh_from_db()
+        return article
+
+    def index(self) -> str:
+        return self.client.get("/sitemap.xml").content.decode()
+
+    def shard(self, number: int):
+        return self.client.get(f"/sitemap-{number}.xml")
+
+    def test_index_lists_one_shard_per_shard_size_pages_with_their_latest_lastmod(self):
+        index = self.index()
+
+        self.assertEqual(locs(index), [f"http://testserver/sitemap-{number}.xml" for number in range(3)])
+        self.assertEqual(
+            lastmods(index),
+            [(START + timedelta(days=days)).isoformat() for days in (1, 3, 4)],
+        )
+
+    def test_shards_list_their_pages_with_lastmod(self):
+        shard = self.shard(1).content.decode()
+
+        self.assertEqual(locs(shard), ["http://localhost/article-1/", "http://localhost/article-2/"])
+        self.assertEqual(lastmods(shard), [(START + timedelta(days=days)).isoformat() for days in (2, 3)])
+        self.assertEqual(self.shard(3).status_code, 404)
+
+    def test_publish_regenerates_only_the_pages_shard(self):
+        self.index()
+        for number in range(3):
+            self.shard(number)
+
+        self.articles[1].title = "Article one, revised"
+        self.articles[1].save_revision().publish()
+
+        self.assertIsNotNone(cache.get(sitemaps.shard_key(self.site.pk, 0)))
+        self.assertIsNone(cache.get(sitemaps.shard_key(self.site.pk, 1)))
+        self.assertIsNotNone(cache.get(sitemaps.shard_key(self.site.pk, 2)))
+        published_at = ArticlePage.objects.get(pk=self.articles[1].pk).last_published_at
+        self.assertEqual(lastmods(self.index())[1], published_at.isoformat())
+        self.assertIn(published_at.isoformat(), lastmods(self.shard(1).content.decode()))
+
+    def test_unpublish_drops_the_page_from_its_shard(self):
+        self.index()
+        self.shard(2)
+        before = timezone.now()
+
+        self.articles[3].unpublish()
+
+        self.assertEqual(locs(self.shard(2).content.decode()), [])
+        self.assertGreaterEqual(datetime.fromisoformat(lastmods(self.index())[2]), before)
+
+    def test_layout_is_rebuilt_once_a_shard_outgrows_twice_the_shard_size(self):
+        self.index()
+        # New pages sort after the last shard's start, so they all join it.
+        for number in range(4, 8):
+            self.add_article(number)
+
+        self.assertEqual(len(locs(self.shard(2).content.decode())), 5)
+        self.assertEqual(len(locs(self.index())), 5)
@@ -0,0 +1,38 @@
+"""Plain-text extraction from rich text and StreamField content."""
+from __future__ import annotations
+
+import html
+import re
+
+from django.utils.html import strip_tags
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def html_to_text(value: str) -> str:
+    return _WHITESPACE.sub(" ", html.unescape(strip_tags(value))).strip()
+
+
+def _collect(value, parts: list[str]) -> None:
+    if isinstance(value, str):
+        # URLs (embeds, CTA links) carry no searchable prose.
+        if value and not value.startswith(("http://", "https://", "/")):
+            parts.append(html_to_text(value))
+    elif isinstance(value, dict):
+        for item in value.values():
+            _collect(item, parts)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            _collect(item, parts)
+
+
+def stream_to_text(stream_value) -> str:
+    """Flatten a StreamField value to plain text using its raw JSON data.
+
+    Working on the raw data avoids instantiating chooser blocks, so no queries
+    are issued for referenced images or snippets.
+    """
+    parts: list[str] = []
+    for item in getattr(stream_value, "raw_data", None) or []:
+        _collect(item.get("value"), parts)
+    return " ".join(part for part in parts if part)
@@ -0,0 +1,30 @@
+"""Public views of the content app."""
+from __future__ import annotations
+
+from django.http import Http404, HttpResponse
+from django.urls import reverse
+from wagtail.models import Site
+
+from . import sitemaps
+
+
+def get_site(request) -> Site:
+    site = Site.find_for_request(request)
+    if site is None:
+        raise Http404("No site matches this host.")
+    return site
+
+
+def sitemap_index(request):
+    site = get_site(request)
+    document = sitemaps.render_index(
+        site, lambda shard: request.build_absolute_uri(reverse("sitemap_shard", args=[shard]))
+    )
+    return HttpResponse(document, content_type="application/xml")
+
+
+def sitemap_shard(request, shard: int):
+    document = sitemaps.render_shard(get_site(request), shard)
+    if document is None:
+        raise Http404("No such sitemap.")
+    return HttpResponse(document, content_type="application/xml")
@@ -5,7 +5,24 @@ from wagtail import hooks
 from wagtail.admin.menu import MenuItem
 from django.urls import reverse
 
+from integrations.health import get_summary
+
+
+class IntegrationsMenuItem(MenuItem):
+    """Menu link that flags failing integrations using the cached health summary."""
+
+    def render_component(self, request):
+        component = super().render_component(request)
+        summary = get_summary()
+        if summary["failing"]:
+            component.label = f"{self.label} ({summary['failing']} failing)"
+        component.attrs = {
+            **component.attrs,
+            "title": f"{summary['active']} active, {summary['with_recent_errors']} with errors in the last 24h",
+        }
+        return component
+
 
 @hooks.register("register_admin_menu_item")
 def register_integrations_menu_item():
-    return MenuItem("Integrations", reverse("integrations:list"), icon_name="link", order=601)
+    return IntegrationsMenuItem("Integrations", reverse("integrations:list"), icon_name="link", order=601)
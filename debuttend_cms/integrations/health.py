@@ -0,0 +1,57 @@
+"""Per-integration health annotations and the cached summary shown in the admin menu.
+
+The list annotations are correlated subqueries against the latest log entries,
+so they use the ``(integration, -created_at)`` index instead of aggregating
+each integration's whole history, and the list renders in one query.
+"""
+from __future__ import annotations
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, IntegerField, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from home.models import Integration, IntegrationLogEntry
+
+SUMMARY_KEY = "integrations:health:summary"
+ERROR_WINDOW = timedelta(hours=24)
+
+
+def annotate_health(queryset):
+    """Annotate ``last_status``, ``last_log_at``, ``last_error_at`` and ``errors_24h``."""
+    logs = IntegrationLogEntry.objects.filter(integration=OuterRef("pk")).order_by("-created_at", "-pk")
+    errors = logs.filter(status="error")
+    recent_errors = (
+        errors.filter(created_at__gte=timezone.now() - ERROR_WINDOW)
+        .order_by()
+        .values("integration")
+        .annotate(total=Count("pk"))
+        .values("total")
+    )
+    return queryset.annotate(
+        last_status=Subquery(logs.values("status")[:1]),
+        last_log_at=Subquery(logs.values("created_at")[:1]),
+        last_error_at=Subquery(errors.values("created_at")[:1]),
+        errors_24h=Coalesce(Subquery(recent_errors, output_field=IntegerField()), Value(0)),
+    )
+
+
+def build_summary() -> dict[str, int]:
+    return annotate_health(Integration.objects.order_by()).aggregate(
+        total=Count("pk"),
+        active=Count("pk", filter=Q(is_active=True)),
+        failing=Count("pk", filter=Q(is_active=True, last_status="error")),
+        with_recent_errors=Count("pk", filter=Q(is_active=True, errors_24h__gt=0)),
+    )
+
+
+def get_summary() -> dict[str, int]:
+    """Health counts across all integrations, cached for ``INTEGRATION_HEALTH_CACHE_TIMEOUT`` seconds."""
+    summary = cache.get(SUMMARY_KEY)
+    if summary is None:
+        summary = build_summary()
+        cache.set(SUMMARY_KEY, summary, getattr(settings, "INTEGRATION_HEALTH_CACHE_TIMEOUT", 60))
+    return summary
@@ -0,0 +1,83 @@
+"""Retention and compaction of ``IntegrationLogEntry`` history.
+
+Entries older than ``INTEGRATION_LOG_RETENTION_DAYS`` are removed oldest first
+in small batches. Each batch is its own short transaction: its rows are counted
+per integration, day and status into ``IntegrationLogSummary``, then deleted.
+Only the rows in the current batch are locked, and an interrupted run resumes
+without double counting.
+"""
+from __future__ import annotations
+
+from collections import Counter
+from dataclasses import dataclass
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from home.models import IntegrationLogEntry, IntegrationLogSummary
+
+STATUS_FIELDS = {"success": "successes", "error": "errors", "pending": "pending"}
+
+
+@dataclass
+class PruneResult:
+    deleted: int = 0
+    batches: int = 0
+    summarized_days: int = 0
+
+
+def summarize(ids: list[int]) -> int:
+    """Add the entries in ``ids`` to the per-day summaries; return how many summary rows were touched."""
+    counts = Counter()
+    rows = (
+        IntegrationLogEntry.objects.filter(pk__in=ids)
+        .annotate(day=TruncDate("created_at"))
+        .values_list("integration_id", "day", "status")
+        .annotate(total=Count("id"))
+        .order_by()
+    )
+    for integration_id, day, status, total in rows:
+        counts[(integration_id, day, STATUS_FIELDS.get(status, "pending"))] += total
+    if not counts:
+        return 0
+
+    keys = {(integration_id, day) for integration_id, day, _ in counts}
+    existing = {
+        (summary.integration_id, summary.day): summary
+        for summary in IntegrationLogSummary.objects.select_for_update().filter(
+            integration_id__in={integration_id for integration_id, _ in keys},
+            day__in={day for _, day in keys},
+        )
+    }
+    created = {}
+    for (integration_id, day, field), total in counts.items():
+        summary = existing.get((integration_id, day))
+        if summary is None:
+            summary = created.setdefault(
+                (integration_id, day), IntegrationLogSummary(integration_id=integration_id, day=day)
+            )
+        setattr(summary, field, getattr(summary, field) + total)
+    IntegrationLogSummary.objects.bulk_update(existing.values(), list(STATUS_FIELDS.values()))
+    IntegrationLogSummary.objects.bulk_create(created.values())
+    return len(keys)
+
+
+def prune_logs(retention_days: int | None = None, batch_size: int = 1000, keep_summary: bool = True) -> PruneResult:
+    if retention_days is None:
+        retention_days = getattr(settings, "INTEGRATION_LOG_RETENTION_DAYS", 30)
+    cutoff = timezone.now() - timedelta(days=retention_days)
+    expired = IntegrationLogEntry.objects.filter(created_at__lt=cutoff)
+    result = PruneResult()
+    while True:
+        with transaction.atomic():
+            ids = list(expired.order_by("created_at", "pk").values_list("pk", flat=True)[:batch_size])
+            if not ids:
+                return result
+            if keep_summary:
+                result.summarized_days += summarize(ids)
+            result.deleted += IntegrationLogEntry.objects.filter(pk__in=ids).delete()[0]
+            result.batches += 1
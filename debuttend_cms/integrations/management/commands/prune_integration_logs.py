@@ -0,0 +1,27 @@
+"""Delete expired integration log entries, keeping per-day counts."""
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+
+from integrations.logs import prune_logs
+
+
+class Command(BaseCommand):
+    help = "Compact integration log entries older than the retention period into daily summaries, in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, default=None, help="Retention in days (INTEGRATION_LOG_RETENTION_DAYS).")
+        parser.add_argument("--batch-size", type=int, default=1000, help="Entries deleted per transaction.")
+        parser.add_argument("--no-summary", action="store_true", help="Delete without updating daily summaries.")
+
+    def handle(self, *args, **options):
+        result = prune_logs(
+            retention_days=options["days"],
+            batch_size=options["batch_size"],
+            keep_summary=not options["no_summary"],
+        )
+        self.stdout.write(
+            f"Deleted {result.deleted} log entries in {result.batches} batch(es); "
+            f"{result.summarized_days} daily summary update(s)."
+        )
+        self.stdout.write(self.style.SUCCESS("Prune complete."))
@@ -0,0 +1,35 @@
+"""Poll active integrations concurrently and record the outcomes."""
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+
+from home.models import Integration
+from integrations.sync import sync_integrations
+
+
+class Command(BaseCommand):
+    help = "Poll every active integration concurrently, updating last_synced_at and the activity log."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--ids", type=int, nargs="+", help="Only sync these integration ids.")
+        parser.add_argument("--concurrency", type=int, help="Maximum simultaneous connections.")
+        parser.add_argument("--per-host", type=int, help="Maximum simultaneous requests per host.")
+        parser.add_argument("--timeout", type=float, help="Per-request timeout in seconds.")
+        parser.add_argument("--retries", type=int, help="Retries after a transport error, 429 or 5xx.")
+
+    def handle(self, *args, **options):
+        queryset = None
+        if options["ids"]:
+            queryset = Integration.objects.filter(is_active=True, pk__in=options["ids"])
+        report = sync_integrations(
+            queryset,
+            concurrency=options["concurrency"],
+            per_host=options["per_host"],
+            timeout=options["timeout"],
+            retries=options["retries"],
+        )
+        self.stdout.write(
+            f"Synced {report.total} integration(s): {report.succeeded} succeeded, {report.failed} failed "
+            f"in {report.elapsed:.2f}s ({report.rate:.1f} integrations/sec)."
+        )
+        self.stdout.write(self.style.SUCCESS("Sync complete."))
@@ -0,0 +1,223 @@
+"""Concurrent polling of active integrations.
+
+``sync_integrations()`` polls every active ``Integration`` from a single asyncio
+event loop over a shared, pooled ``httpx.AsyncClient``. Concurrency is limited
+per host and globally by semaphores, so one slow provider cannot hold every
+slot and no request waits for a pooled connection (the pool is sized to the
+global limit). Each call has a timeout and is retried with exponential backoff
+and jitter on transport errors, 429 and 5xx responses. Redirects are not
+followed, since ``api_base_url`` is entered by editors.
+
+Credentials are bearer tokens read from environment variables whose names start
+with ``INTEGRATION_CREDENTIAL_PREFIX``, so an editor cannot point
+``credential_key`` at another setting such as the secret key or database
+password. Integrations naming any other variable fail without being polled.
+
+Outcomes are buffered and written in batches: one ``bulk_update`` of
+``last_synced_at`` for the successful integrations and one ``bulk_create`` of
+``IntegrationLogEntry`` rows per batch, rather than several queries per call.
+"""
+from __future__ import annotations
+
+import asyncio
+import os
+import random
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from urllib.parse import urlsplit
+
+import httpx
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import connections
+from django.utils import timezone
+
+from home.models import Integration, IntegrationLogEntry
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+MAX_MESSAGE_LENGTH = 500
+
+
+class CredentialError(ValueError):
+    """Raised when an integration's ``credential_key`` names a variable it may not read."""
+
+
+@dataclass
+class SyncOptions:
+    concurrency: int = 50
+    per_host: int = 4
+    timeout: float = 10.0
+    retries: int = 3
+    backoff: float = 0.5
+    batch_size: int = 200
+
+    @classmethod
+    def from_settings(cls, **overrides) -> SyncOptions:
+        options = cls(
+            concurrency=getattr(settings, "INTEGRATION_SYNC_CONCURRENCY", cls.concurrency),
+            per_host=getattr(settings, "INTEGRATION_SYNC_PER_HOST", cls.per_host),
+            timeout=getattr(settings, "INTEGRATION_SYNC_TIMEOUT", cls.timeout),
+            retries=getattr(settings, "INTEGRATION_SYNC_RETRIES", cls.retries),
+            backoff=getattr(settings, "INTEGRATION_SYNC_BACKOFF", cls.backoff),
+            batch_size=getattr(settings, "INTEGRATION_SYNC_BATCH_SIZE", cls.batch_size),
+        )
+        for name, value in overrides.items():
+            if value is not None:
+                setattr(options, name, value)
+        return options
+
+
+@dataclass
+class SyncTarget:
+    integration_id: int
+    url: str
+    credential_key: str = ""
+
+    @property
+    def host(self) -> str:
+        return urlsplit(self.url).netloc
+
+
+@dataclass
+class SyncResult:
+    integration_id: int
+    ok: bool
+    message: str
+    attempts: int
+    finished_at: datetime
+
+
+@dataclass
+class SyncReport:
+    total: int = 0
+    succeeded: int = 0
+    failed: int = 0
+    elapsed: float = 0.0
+    results: list[SyncResult] = field(default_factory=list)
+
+    @property
+    def rate(self) -> float:
+        return self.total / self.elapsed if self.elapsed else 0.0
+
+
+def get_credential_prefix() -> str:
+    return getattr(settings, "INTEGRATION_CREDENTIAL_PREFIX", "INTEGRATION_TOKEN_")
+
+
+def auth_headers(target: SyncTarget) -> dict[str, str]:
+    """``credential_key`` names an environment variable, with the credential prefix, holding a bearer token."""
+    if not target.credential_key:
+        return {}
+    prefix = get_credential_prefix()
+    if not target.credential_key.startswith(prefix) or target.credential_key == prefix:
+        raise CredentialError(f"credential_key must name an environment variable starting with {prefix}")
+    token = os.getenv(target.credential_key)
+    return {"Authorization": f"Bearer {token}"} if token else {}
+
+
+async def poll(
+    client: httpx.AsyncClient,
+    target: SyncTarget,
+    host_limit: asyncio.Semaphore,
+    limit: asyncio.Semaphore,
+    options: SyncOptions,
+):
+    try:
+        headers = auth_headers(target)
+    except CredentialError as exc:
+        return SyncResult(target.integration_id, False, str(exc), 0, timezone.now())
+    attempt = 0
+    while True:
+        attempt += 1
+        # Take the host slot first so requests queued behind a slow host don't hold global slots.
+        async with host_limit, limit:
+            try:
+                response = await client.get(target.url, headers=headers)
+                retryable = response.status_code in RETRY_STATUSES
+                ok = response.is_success
+                message = f"HTTP {response.status_code}"
+            except httpx.HTTPError as exc:
+                retryable = isinstance(exc, httpx.TransportError)
+                ok = False
+                message = f"{type(exc).__name__}: {exc}"[:MAX_MESSAGE_LENGTH]
+        if ok or not retryable or attempt > options.retries:
+            return SyncResult(target.integration_id, ok, message, attempt, timezone.now())
+        # Back off outside the semaphores so waiting retries don't starve the host.
+        delay = options.backoff * 2 ** (attempt - 1)
+        await asyncio.sleep(delay + random.uniform(0, delay))
+
+
+def write_results(results: list[SyncResult]) -> None:
+    """Persist one batch of outcomes with a single bulk update and a single bulk insert."""
+    synced = [
+        Integration(pk=result.integration_id, last_synced_at=result.finished_at) for result in results if result.ok
+    ]
+    if synced:
+        Integration.objects.bulk_update(synced, ["last_synced_at"])
+    IntegrationLogEntry.objects.bulk_create(
+        [
+            IntegrationLogEntry(
+                integration_id=result.integration_id,
+                status="success" if result.ok else "error",
+                message=f"Sync {'succeeded' if result.ok else 'failed'} after {result.attempts} attempt(s): "
+                f"{result.message}",
+            )
+            for result in results
+        ]
+    )
+
+
+async def run(targets: list[SyncTarget], options: SyncOptions) -> list[SyncResult]:
+    semaphores: dict[str, asyncio.Semaphore] = {}
+    for target in targets:
+        semaphores.setdefault(target.host, asyncio.Semaphore(options.per_host))
+
+    limit = asyncio.Semaphore(options.concurrency)
+    limits = httpx.Limits(max_connections=options.concurrency, max_keepalive_connections=options.concurrency)
+    # Waiting for a connection is bounded by ``limit``, not by the request timeout.
+    timeout = httpx.Timeout(options.timeout, pool=None)
+    write = sync_to_async(write_results, thread_sensitive=True)
+    results: list[SyncResult] = []
+    pending: list[SyncResult] = []
+
+    async with httpx.AsyncClient(limits=limits, timeout=timeout) as client:
+        tasks = [
+            asyncio.create_task(poll(client, target, semaphores[target.host], limit, options)) for target in targets
+        ]
+        for task in asyncio.as_completed(tasks):
+            result = await task
+            results.append(result)
+            pending.append(result)
+            if len(pending) >= options.batch_size:
+                await write(pending)
+                pending = []
+    if pending:
+        await write(pending)
+    # The writes ran on asgiref's worker thread; don't leave its connection open.
+    await sync_to_async(connections.close_all, thread_sensitive=True)()
+    return results
+
+
+def load_targets(queryset=None) -> list[SyncTarget]:
+    queryset = Integration.objects.filter(is_active=True) if queryset is None else queryset
+    return [
+        SyncTarget(pk, url, credential_key)
+        for pk, url, credential_key in queryset.values_list("pk", "api_base_url", "credential_key")
+    ]
+
+
+def sync_integrations(queryset=None, **overrides) -> SyncReport:
+    """Poll the active integrations (or ``queryset``) and record the outcomes."""
+    options = SyncOptions.from_settings(**overrides)
+    targets = load_targets(queryset)
+    started = time.perf_counter()
+    results = asyncio.run(run(targets, options)) if targets else []
+    succeeded = sum(result.ok for result in results)
+    return SyncReport(
+        total=len(results),
+        succeeded=succeeded,
+        failed=len(results) - succeeded,
+        elapsed=time.perf_counter() - started,
+        results=results,
+    )
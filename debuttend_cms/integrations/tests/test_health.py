@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.utils import timezone
+
+from home.models import Integration, IntegrationLogEntry
+from integrations.health import annotate_health, get_summary
+
+
+class AnnotateHealthTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        now = timezone.now()
+        self.failing = self.integration(
+            "Failing", [("success", now - timedelta(days=3)), ("error", now - timedelta(hours=1))]
+        )
+        self.recovered = self.integration(
+            "Recovered",
+            [
+                ("error", now - timedelta(days=2)),
+                ("error", now - timedelta(hours=2)),
+                ("success", now - timedelta(hours=1)),
+            ],
+        )
+        self.quiet = self.integration("Quiet", [])
+        self.inactive = self.integration("Inactive", [("error", now)], is_active=False)
+
+    def integration(self, name, logs, **kwargs):
+        integration = Integration.objects.create(name=name, api_base_url="https://example.com", **kwargs)
+        for status, created_at in logs:
+            entry = IntegrationLogEntry.objects.create(integration=integration, status=status, message=status)
+            IntegrationLogEntry.objects.filter(pk=entry.pk).update(created_at=created_at)
+        return integration
+
+    def test_annotates_latest_status_and_recent_errors_in_one_query(self):
+        with self.assertNumQueries(1):
+            rows = {integration.name: integration for integration in annotate_health(Integration.objects.all())}
+
+        self.assertEqual(
+            {name: (row.last_status, row.errors_24h) for name, row in rows.items()},
+            {
+                "Failing": ("error", 1),
+                "Recovered": ("success", 1),
+                "Quiet": (None, 0),
+                "Inactive": ("error", 1),
+            },
+        )
+        self.assertGreater(rows["Failing"].last_error_at, rows["Recovered"].last_error_at)
+        self.assertIsNone(rows["Quiet"].last_log_at)
+
+    def test_summary_counts_only_active_integrations(self):
+        self.assertEqual(get_summary(), {"total": 4, "active": 3, "failing": 1, "with_recent_errors": 2})
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+from datetime import timedelta
+
+from django.test import TestCase
+from django.utils import timezone
+
+from home.models import Integration, IntegrationLogEntry, IntegrationLogSummary
+from integrations.logs import prune_logs
+
+
+class PruneLogsTests(TestCase):
+    def setUp(self):
+        self.integration = Integration.objects.create(name="CRM", api_base_url="https://crm.example.com")
+        now = timezone.now()
+        # Midday, so the few minutes between entries never cross into another day.
+        self.old_day = (now - timedelta(days=40)).replace(hour=12, minute=0)
+        self.older_day = now - timedelta(days=41)
+        for status, created_at in [
+            ("success", self.old_day),
+            ("error", self.old_day),
+            ("success", self.old_day + timedelta(minutes=5)),
+            ("pending", self.older_day),
+            ("error", now),
+        ]:
+            self.log(status, created_at)
+
+    def log(self, status, created_at):
+        entry = IntegrationLogEntry.objects.create(integration=self.integration, status=status, message=status)
+        IntegrationLogEntry.objects.filter(pk=entry.pk).update(created_at=created_at)
+
+    def summaries(self):
+        return {
+            summary.day: (summary.successes, summary.errors, summary.pending)
+            for summary in IntegrationLogSummary.objects.filter(integration=self.integration)
+        }
+
+    def test_compacts_expired_entries_into_daily_summaries(self):
+        # Batches of two split the entries of one day across transactions.
+        result = prune_logs(retention_days=30, batch_size=2)
+
+        self.assertEqual((result.deleted, result.batches), (4, 2))
+        self.assertEqual(list(IntegrationLogEntry.objects.values_list("status", flat=True)), ["error"])
+        self.assertEqual(self.summaries(), {self.old_day.date(): (2, 1, 0), self.older_day.date(): (0, 0, 1)})
+
+    def test_rerun_does_not_count_twice(self):
+        prune_logs(retention_days=30)
+        result = prune_logs(retention_days=30)
+
+        self.assertEqual((result.deleted, result.batches), (0, 0))
+        self.assertEqual(self.summaries()[self.old_day.date()], (2, 1, 0))
+
+    def test_can_delete_without_summaries(self):
+        result = prune_logs(retention_days=30, keep_summary=False)
+
+        self.assertEqual(result.deleted, 4)
+        self.assertFalse(IntegrationLogSummary.objects.exists())
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+from django.conf import settings
+from django.test import TransactionTestCase
+from wagtail.coreutils import get_supported_content_language_variant
+from wagtail.models import Locale
+
+from home.models import Integration, IntegrationLogEntry
+from integrations.sync import sync_integrations
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Answers by path: ``/ok`` 200, ``/missing`` 404, ``/flaky`` 503 on the first call and 200 after.
+
+    ``/slow/<n>`` answers 200 after a short delay and ``/redirect`` redirects to ``/ok``.
+    """
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.calls[self.path] += 1
+            server.auth[self.path] = self.headers.get("Authorization")
+            calls = server.calls[self.path]
+        if self.path == "/redirect":
+            self.send_response(302)
+            self.send_header("Location", "/ok")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        if self.path.startswith("/slow/"):
+            time.sleep(0.2)
+            status = 200
+        elif self.path == "/ok" or (self.path == "/flaky" and calls > 1):
+            status = 200
+        elif self.path == "/flaky":
+            status = 503
+        else:
+            status = 404
+        self.send_response(status)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+class SyncIntegrationsTests(TransactionTestCase):
+    # Results are written from asgiref's worker thread, which cannot see an open test transaction.
+
+    def setUp(self):
+        # TransactionTestCase flushes the default locale created by Wagtail's migrations.
+        Locale.objects.get_or_create(language_code=get_supported_content_language_variant(settings.LANGUAGE_CODE))
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+        self.server.lock = threading.Lock()
+        self.server.calls = Counter()
+        self.server.auth = {}
+        thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        thread.start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+
+    def integration(self, path: str, **kwargs) -> Integration:
+        host, port = self.server.server_address
+        return Integration.objects.create(name=path, api_base_url=f"http://{host}:{port}{path}", **kwargs)
+
+    def test_records_outcomes_and_retries_transient_errors(self):
+        ok = self.integration("/ok")
+        missing = self.integration("/missing")
+        flaky = self.integration("/flaky")
+
+        report = sync_integrations(backoff=0)
+
+        self.assertEqual((report.total, report.succeeded, report.failed), (3, 2, 1))
+        self.assertEqual(self.server.calls, Counter({"/ok": 1, "/missing": 1, "/flaky": 2}))
+        self.assertEqual(
+            dict(IntegrationLogEntry.objects.values_list("integration_id", "status")),
+            {ok.pk: "success", missing.pk: "error", flaky.pk: "success"},
+        )
+        self.assertEqual(
+            set(Integration.objects.filter(last_synced_at__isnull=False).values_list("pk", flat=True)),
+            {ok.pk, flaky.pk},
+        )
+
+    def test_sends_tokens_only_from_prefixed_variables(self):
+        self.integration("/ok", credential_key="INTEGRATION_TOKEN_CRM")
+        leaky = self.integration("/missing", credential_key="DJANGO_SECRET_KEY")
+
+        with mock.patch.dict("os.environ", {"INTEGRATION_TOKEN_CRM": "crm-token", "DJANGO_SECRET_KEY": "secret"}):
+            report = sync_integrations(backoff=0)
+
+        self.assertEqual(self.server.auth, {"/ok": "Bearer crm-token"})
+        self.assertEqual(report.failed, 1)
+        self.assertIn("INTEGRATION_TOKEN_", IntegrationLogEntry.objects.get(integration=leaky).message)
+
+    def test_queued_requests_do_not_time_out_waiting_for_a_connection(self):
+        for number in range(4):
+            self.integration(f"/slow/{number}")
+
+        # Each request fits the timeout, but all four together would not if they queued on the pool.
+        report = sync_integrations(concurrency=1, timeout=0.5, retries=0)
+
+        self.assertEqual((report.succeeded, report.failed), (4, 0))
+
+    def test_does_not_follow_redirects(self):
+        redirect = self.integration("/redirect")
+
+        report = sync_integrations(backoff=0)
+
+        self.assertEqual(report.failed, 1)
+        self.assertNotIn("/ok", self.server.calls)
+        self.assertIn("HTTP 302", IntegrationLogEntry.objects.get(integration=redirect).message)
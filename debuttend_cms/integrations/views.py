@@ -1,22 +1,55 @@
 """Views for managing integrations in the Debuttend CMS."""
 from __future__ import annotations
 
+from datetime import timedelta
+
+from django.conf import settings
 from django.contrib.auth.mixins import LoginRequiredMixin
+from django.core.paginator import Paginator
+from django.utils import timezone
 from django.views.generic import DetailView, ListView
 
 from home.models import Integration
 
+from .health import annotate_health, get_summary
+
 
 class IntegrationListView(LoginRequiredMixin, ListView):
     template_name = "integrations/list.html"
     model = Integration
     context_object_name = "integrations"
 
+    def get_queryset(self):
+        return annotate_health(super().get_queryset())
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["summary"] = get_summary()
+        return context
+
 
 class IntegrationDetailView(LoginRequiredMixin, DetailView):
     template_name = "integrations/detail.html"
     model = Integration
     context_object_name = "integration"
+    summary_days = 30
 
-    def get_queryset(self):
-        return super().get_queryset().prefetch_related("logs")
+    def get_logs(self):
+        """Newest-first log entries, optionally limited to the last ``?days=N`` days."""
+        logs = self.object.logs.order_by("-created_at", "-pk")
+        try:
+            days = int(self.request.GET.get("days", ""))
+        except ValueError:
+            days = None
+        if days and days > 0:
+            logs = logs.filter(created_at__gte=timezone.now() - timedelta(days=days))
+        return logs, days
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        logs, days = self.get_logs()
+        paginator = Paginator(logs, getattr(settings, "INTEGRATION_LOG_PAGE_SIZE", 25))
+        context["logs_page"] = paginator.get_page(self.request.GET.get("page"))
+        context["days"] = days
+        context["log_summaries"] = self.object.log_summaries.all()[: self.summary_days]
+        return context
@@ -7,3 +7,8 @@ class SearchConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "search"
     verbose_name = "Global Search"
+
+    def ready(self):
+        from . import signals
+
+        signals.register_queue_handlers()
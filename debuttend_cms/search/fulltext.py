@@ -0,0 +1,175 @@
+"""Weighted full-text index over published ``ArticlePage`` content.
+
+Article text is extracted once when the page is saved (``ArticlePage.body_text``)
+and indexed here on publish, so queries hit the index directly instead of the
+StreamField JSON:
+
+* PostgreSQL: ``ArticlePage.search_vector`` (``tsvector``) backed by a GIN index,
+  weighted A (title), B (introduction, author) and C (body), ranked with
+  ``ts_rank``.
+* SQLite: an FTS5 virtual table ranked with ``bm25`` using the same weights,
+  used for local development and tests.
+
+The GIN index and the FTS5 table are created by migrations
+(``home.0002_article_search_gin`` and ``search.0002_article_fts``). Results
+carry a ``search_score`` attribute, higher meaning more relevant.
+
+Other database vendors return ``None`` from ``get_index`` and callers fall back
+to the Wagtail search backend.
+"""
+from __future__ import annotations
+
+import re
+
+from django.conf import settings
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db import connection
+from django.db.models import F
+from wagtail.models import Page
+
+from home.models import ArticlePage
+
+FTS_TABLE = "search_article_fts"
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+
+def get_config() -> str:
+    return getattr(settings, "SEARCH_ARTICLE_CONFIG", "english")
+
+
+class ArticleResults:
+    """Lazily evaluated, sliceable ranked results usable with ``Paginator``."""
+
+    def __init__(self, count_fn, slice_fn):
+        self._count_fn = count_fn
+        self._slice_fn = slice_fn
+        self._count = None
+
+    def count(self) -> int:
+        if self._count is None:
+            self._count = self._count_fn()
+        return self._count
+
+    def __len__(self) -> int:
+        return self.count()
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            start = item.start or 0
+            stop = self.count() if item.stop is None else item.stop
+            return self._slice_fn(start, max(stop - start, 0))
+        return self._slice_fn(item, 1)[0]
+
+
+class PostgresArticleIndex:
+    def update(self, pages) -> None:
+        """Recompute the vectors of ``pages`` from their saved text in one ``UPDATE``."""
+        page_ids = [page.pk for page in pages]
+        if not page_ids:
+            return
+        # The title lives on the parent page table, which a queryset update() cannot reference.
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"""
+                UPDATE {ArticlePage._meta.db_table} AS article
+                SET search_vector =
+                    setweight(to_tsvector(%(config)s::regconfig, coalesce(page.title, '')), 'A')
+                    || setweight(to_tsvector(%(config)s::regconfig, coalesce(article.introduction, '')), 'B')
+                    || setweight(to_tsvector(%(config)s::regconfig, coalesce(article.author, '')), 'B')
+                    || setweight(to_tsvector(%(config)s::regconfig, coalesce(article.body_text, '')), 'C')
+                FROM {Page._meta.db_table} AS page
+                WHERE page.id = article.page_ptr_id AND article.page_ptr_id = ANY(%(ids)s)
+                """,
+                {"config": get_config(), "ids": page_ids},
+            )
+
+    def remove(self, page_ids) -> None:
+        ArticlePage.objects.filter(pk__in=page_ids).update(search_vector=None)
+
+    def search(self, query: str) -> ArticleResults:
+        search_query = SearchQuery(query, search_type="websearch", config=get_config())
+        queryset = (
+            ArticlePage.objects.live()
+            .filter(search_vector=search_query)
+            .annotate(search_score=SearchRank(F("search_vector"), search_query))
+            .order_by("-search_score", "-pk")
+        )
+        return ArticleResults(queryset.count, lambda offset, limit: list(queryset[offset:offset + limit]))
+
+
+class SQLiteArticleIndex:
+    # bm25 column weights, mirroring the A/B/B/C weighting used on PostgreSQL.
+    WEIGHTS = (10.0, 4.0, 4.0, 1.0)
+
+    def update(self, pages) -> None:
+        rows = [(page.pk, page.title, page.introduction, page.author, page.body_text) for page in pages]
+        with connection.cursor() as cursor:
+            cursor.executemany(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [(row[0],) for row in rows])
+            cursor.executemany(
+                f"INSERT INTO {FTS_TABLE} (rowid, title, introduction, author, body) VALUES (%s, %s, %s, %s, %s)",
+                rows,
+            )
+
+    def remove(self, page_ids) -> None:
+        with connection.cursor() as cursor:
+            cursor.executemany(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [(page_id,) for page_id in page_ids])
+
+    def match_expression(self, query: str) -> str:
+        return " ".join(f'"{token}"' for token in _TOKEN.findall(query))
+
+    def search(self, query: str) -> ArticleResults:
+        expression = self.match_expression(query)
+        weights = ", ".join(str(weight) for weight in self.WEIGHTS)
+
+        def count() -> int:
+            if not expression:
+                return 0
+            with connection.cursor() as cursor:
+                cursor.execute(f"SELECT COUNT(*) FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", [expression])
+                return cursor.fetchone()[0]
+
+        def fetch(offset: int, limit: int) -> list[ArticlePage]:
+            if not expression or not limit:
+                return []
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f"SELECT rowid, bm25({FTS_TABLE}, {weights}) AS score FROM {FTS_TABLE} "
+                    f"WHERE {FTS_TABLE} MATCH %s ORDER BY score LIMIT %s OFFSET %s",
+                    [expression, limit, offset],
+                )
+                scores = dict(cursor.fetchall())
+            pages = ArticlePage.objects.live().in_bulk(list(scores))
+            results = []
+            for page_id, score in scores.items():
+                if page_id in pages:
+                    # bm25 is lower for better matches.
+                    pages[page_id].search_score = -score
+                    results.append(pages[page_id])
+            return results
+
+        return ArticleResults(count, fetch)
+
+
+def get_index():
+    if connection.vendor == "postgresql":
+        return PostgresArticleIndex()
+    if connection.vendor == "sqlite":
+        return SQLiteArticleIndex()
+    return None
+
+
+def index_articles(pages) -> None:
+    index = get_index()
+    if index is not None:
+        index.update(pages)
+
+
+def remove_articles(page_ids) -> None:
+    index = get_index()
+    if index is not None:
+        index.remove(list(page_ids))
+
+
+def search_articles(query: str) -> ArticleResults | None:
+    index = get_index()
+    return index.search(query) if index is not None else None
@@ -0,0 +1,43 @@
+"""Rebuild the article full-text index from live ArticlePages."""
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+
+from home.models import ArticlePage
+from home.text import stream_to_text
+from search import fulltext
+
+
+class Command(BaseCommand):
+    help = "Re-extract ArticlePage body text and rebuild the weighted full-text index."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        index = fulltext.get_index()
+        if index is None:
+            self.stderr.write("The configured database has no article full-text index; nothing to do.")
+            return
+
+        batch_size = options["batch_size"]
+        total = 0
+        batch = []
+        for page in ArticlePage.objects.live().iterator(chunk_size=batch_size):
+            page.body_text = stream_to_text(page.body)
+            batch.append(page)
+            if len(batch) >= batch_size:
+                total += self.flush(index, batch)
+                batch = []
+        total += self.flush(index, batch)
+
+        stale = ArticlePage.objects.not_live().values_list("pk", flat=True)
+        index.remove(list(stale))
+        self.stdout.write(self.style.SUCCESS(f"Indexed {total} articles."))
+
+    def flush(self, index, pages) -> int:
+        if not pages:
+            return 0
+        ArticlePage.objects.bulk_update(pages, ["body_text"])
+        index.update(pages)
+        return len(pages)
@@ -0,0 +1,29 @@
+from django.db import migrations
+
+FTS_TABLE = "search_article_fts"
+
+
+def create_fts_table(apps, schema_editor):
+    # The FTS5 article index is only used on SQLite; PostgreSQL uses ArticlePage.search_vector.
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    schema_editor.execute(
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} "
+        "USING fts5(title, introduction, author, body, tokenize='porter unicode61')"
+    )
+
+
+def drop_fts_table(apps, schema_editor):
+    if schema_editor.connection.vendor == "sqlite":
+        schema_editor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.RunPython(create_fts_table, drop_fts_table),
+    ]
@@ -0,0 +1,21 @@
+"""Pending search index updates, drained by ``process_search_queue``."""
+from __future__ import annotations
+
+from django.contrib.contenttypes.models import ContentType
+from django.db import models
+from django.utils import timezone
+
+
+class IndexQueueEntry(models.Model):
+    """An object saved or deleted since it was last indexed.
+
+    Rows are written in the same transaction as the change. An object saved
+    several times has several rows, which the worker coalesces.
+    """
+
+    content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE, related_name="+")
+    object_id = models.CharField(max_length=255)
+    enqueued_at = models.DateTimeField(default=timezone.now, db_index=True)
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"{self.content_type_id}:{self.object_id} @ {self.enqueued_at:%Y-%m-%d %H:%M:%S}"
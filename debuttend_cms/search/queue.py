@@ -0,0 +1,152 @@
+"""Database-backed queue of search index updates.
+
+With ``SEARCH_QUEUE_ENABLED`` the Wagtail search backends run with
+``AUTO_UPDATE`` off. Saving or deleting an indexed object only inserts an
+``IndexQueueEntry`` row in the same transaction, so editors don't wait on
+StreamField text extraction and index writes. A rolled-back save leaves no
+entry behind. Saves that only record a draft revision are not queued: they
+leave the live content the index is built from unchanged.
+
+``process_batch`` claims the oldest entries with ``SELECT ... FOR UPDATE SKIP
+LOCKED``, so several workers can drain the queue side by side. It coalesces
+entries for the same object and reloads the objects per model with one query.
+Each backend is then updated with one ``add_bulk`` call per model. Objects
+that no longer exist or are no longer indexed are removed from the index, with
+one delete per model for the database backends. The
+claimed rows are deleted in the same transaction, so a failed batch is retried
+on the next run.
+
+``stats`` reports the queue depth and the age of the oldest entry, the figures
+to alert on when indexing falls behind.
+"""
+from __future__ import annotations
+
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Min
+from django.utils import timezone
+from wagtail.models import COMMENTS_RELATION_NAME
+from wagtail.search import index
+from wagtail.search.backends import get_search_backends
+from wagtail.search.utils import get_descendants_content_types_pks
+
+from .models import IndexQueueEntry
+
+LAST_BATCH_KEY = "search:queue:last_batch"
+# The fields ``Page.save_revision`` writes when saving a draft.
+DRAFT_REVISION_FIELDS = frozenset(
+    {COMMENTS_RELATION_NAME, "latest_revision_created_at", "draft_title", "latest_revision", "has_unpublished_changes"}
+)
+
+
+def is_enabled() -> bool:
+    return getattr(settings, "SEARCH_QUEUE_ENABLED", False)
+
+
+def get_batch_size() -> int:
+    return getattr(settings, "SEARCH_QUEUE_BATCH_SIZE", 500)
+
+
+def get_max_lag() -> int:
+    return getattr(settings, "SEARCH_QUEUE_MAX_LAG", 300)
+
+
+def indexed_model(instance) -> type:
+    # Pages are indexed as their specific class, which ``specific_class`` knows without a query.
+    return getattr(instance, "specific_class", None) or type(instance)
+
+
+def enqueue(model, object_ids) -> None:
+    content_type = ContentType.objects.get_for_model(model)
+    now = timezone.now()
+    IndexQueueEntry.objects.bulk_create(
+        [IndexQueueEntry(content_type=content_type, object_id=str(pk), enqueued_at=now) for pk in object_ids]
+    )
+
+
+def update_index(model, objects) -> None:
+    """Write ``objects`` of ``model`` to every configured search backend with one bulk call each."""
+    if objects:
+        for backend in get_search_backends():
+            backend.add_bulk(model, objects)
+
+
+def is_draft_save(update_fields) -> bool:
+    return update_fields is not None and set(update_fields) <= DRAFT_REVISION_FIELDS
+
+
+def remove_from_index(model, object_ids) -> None:
+    object_ids = [str(pk) for pk in object_ids]
+    if not object_ids:
+        return
+    for backend in get_search_backends():
+        entries = getattr(backend.get_index_for_model(model), "entries", None)
+        if entries is not None:
+            # The database backends keep their index in IndexEntry rows, which one statement can drop.
+            entries.filter(
+                content_type_id__in=get_descendants_content_types_pks(model), object_id__in=object_ids
+            ).delete()
+        else:
+            for pk in object_ids:
+                backend.delete(model(pk=pk))
+
+
+def reindex(model, object_ids: set[str]) -> int:
+    objects = list(model.get_indexed_objects().filter(pk__in=object_ids))
+    update_index(model, objects)
+    remove_from_index(model, object_ids - {str(obj.pk) for obj in objects})
+    return len(objects)
+
+
+def process_batch(batch_size: int | None = None) -> tuple[int, int]:
+    """Index the objects behind the oldest queue entries; returns ``(entries, objects)`` processed."""
+    started = time.perf_counter()
+    with transaction.atomic():
+        entries = list(
+            IndexQueueEntry.objects.select_for_update(skip_locked=True)
+            .order_by("pk")
+            .values_list("pk", "content_type_id", "object_id")[: batch_size or get_batch_size()]
+        )
+        if not entries:
+            return 0, 0
+        dirty: dict[int, set[str]] = defaultdict(set)
+        for _, content_type_id, object_id in entries:
+            dirty[content_type_id].add(object_id)
+        for content_type_id, object_ids in dirty.items():
+            model = ContentType.objects.get_for_id(content_type_id).model_class()
+            if model is not None and index.class_is_indexed(model):
+                reindex(model, object_ids)
+        IndexQueueEntry.objects.filter(pk__in=[pk for pk, _, _ in entries]).delete()
+
+    objects = sum(len(object_ids) for object_ids in dirty.values())
+    cache.set(
+        LAST_BATCH_KEY,
+        {
+            "at": timezone.now().isoformat(),
+            "entries": len(entries),
+            "objects": objects,
+            "seconds": round(time.perf_counter() - started, 3),
+        },
+        None,
+    )
+    return len(entries), objects
+
+
+def stats() -> dict:
+    summary = IndexQueueEntry.objects.aggregate(pending=Count("pk"), oldest=Min("enqueued_at"))
+    oldest = summary["oldest"]
+    lag = (timezone.now() - oldest).total_seconds() if oldest is not None else 0.0
+    return {
+        "enabled": is_enabled(),
+        "pending": summary["pending"],
+        "oldest_enqueued_at": oldest.isoformat() if oldest is not None else None,
+        "lag_seconds": round(lag, 1),
+        "max_lag_seconds": get_max_lag(),
+        "lagging": lag > get_max_lag(),
+        "last_batch": cache.get(LAST_BATCH_KEY),
+    }
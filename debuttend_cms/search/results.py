@@ -0,0 +1,112 @@
+"""Helpers turning raw search hits into renderable results without N+1 queries."""
+from __future__ import annotations
+
+import heapq
+from collections import defaultdict
+from dataclasses import dataclass
+from itertools import islice
+
+from django.contrib.contenttypes.models import ContentType
+from wagtail.models import Page
+
+
+class ScoredResults:
+    """A ranked result set exposing the relevance score of each hit.
+
+    ``score_attr`` names the attribute holding the score on each result, higher
+    meaning more relevant; ``None`` when the backend cannot score its hits.
+    """
+
+    def __init__(self, results, score_attr: str | None):
+        self.results = results
+        self.score_attr = score_attr
+
+    def count(self) -> int:
+        return self.results.count()
+
+    def top(self, limit: int) -> list:
+        return list(self.results[:limit]) if limit > 0 else []
+
+
+class MergedResults:
+    """Merge ranked result sets into one relevance order for ``Paginator``.
+
+    Hits are ordered by score when every set provides one. Otherwise each hit
+    is scored by reciprocal rank within its own set, which interleaves the sets
+    without assuming their scores share a scale. A page of results fetches at
+    most ``stop`` hits from each set.
+    """
+
+    # Damping constant of reciprocal rank fusion; larger values flatten the gap between ranks.
+    RANK_CONSTANT = 60
+
+    def __init__(self, *result_sets: ScoredResults):
+        self.result_sets = result_sets
+        self._count = None
+
+    def count(self) -> int:
+        if self._count is None:
+            self._count = sum(results.count() for results in self.result_sets)
+        return self._count
+
+    def __len__(self) -> int:
+        return self.count()
+
+    def scored(self, results: ScoredResults, limit: int) -> list[tuple[float, object]]:
+        hits = results.top(limit)
+        if all(result_set.score_attr for result_set in self.result_sets):
+            return [(getattr(hit, results.score_attr, None) or 0.0, hit) for hit in hits]
+        return [(1 / (self.RANK_CONSTANT + rank), hit) for rank, hit in enumerate(hits, start=1)]
+
+    def __getitem__(self, item):
+        if not isinstance(item, slice):
+            return self[item:item + 1][0]
+        start = item.start or 0
+        stop = self.count() if item.stop is None else item.stop
+        merged = heapq.merge(
+            *(self.scored(results, stop) for results in self.result_sets),
+            key=lambda pair: pair[0],
+            reverse=True,
+        )
+        return [hit for _score, hit in islice(merged, start, stop)]
+
+
+@dataclass
+class SearchHit:
+    page: Page
+    title: str
+    url: str | None
+    search_description: str
+
+
+def load_specific(pages) -> list[Page]:
+    """Return the specific instances of ``pages`` in order, with one query per content type."""
+    ids_by_type = defaultdict(list)
+    for page in pages:
+        if type(page) is Page:
+            ids_by_type[page.content_type_id].append(page.pk)
+
+    specific = {}
+    for content_type_id, ids in ids_by_type.items():
+        model = ContentType.objects.get_for_id(content_type_id).model_class()
+        if model is None or model is Page:
+            continue
+        specific.update(model.objects.in_bulk(ids))
+    return [specific.get(page.pk, page) if type(page) is Page else page for page in pages]
+
+
+def build_hits(pages, request) -> list[SearchHit]:
+    """Resolve specific pages and their URLs for a page of search results.
+
+    URLs come from ``Page.get_url(request)``, which reuses the site root paths
+    cached on the request, so each hit adds no further queries.
+    """
+    return [
+        SearchHit(
+            page=page,
+            title=page.title,
+            url=page.get_url(request=request),
+            search_description=page.search_description,
+        )
+        for page in load_specific(list(pages))
+    ]
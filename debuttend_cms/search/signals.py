@@ -0,0 +1,64 @@
+"""Keep the article full-text index, the suggestion index and the search queue in step with content changes."""
+from __future__ import annotations
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from wagtail.models import Page, PageViewRestriction
+from wagtail.search.index import get_indexed_models
+from wagtail.signals import page_published, page_unpublished, post_page_move
+
+from home.models import ArticlePage
+
+from . import fulltext, queue, suggest
+
+
+@receiver(page_published, sender=ArticlePage)
+def index_published_article(sender, instance, **kwargs):
+    fulltext.index_articles([instance])
+
+
+@receiver(page_unpublished, sender=ArticlePage)
+@receiver(post_delete, sender=ArticlePage)
+def remove_unpublished_article(sender, instance, **kwargs):
+    fulltext.remove_articles([instance.pk])
+
+
+@receiver(page_published)
+@receiver(page_unpublished)
+def refresh_suggestions(sender, instance, **kwargs):
+    suggest.record_changes([instance.pk])
+
+
+@receiver(post_delete)
+def drop_deleted_suggestion(sender, instance, **kwargs):
+    if isinstance(instance, Page):
+        suggest.record_changes([instance.pk])
+
+
+@receiver(post_page_move)
+def refresh_moved_suggestions(sender, instance, **kwargs):
+    # URLs of the whole subtree change with the move.
+    suggest.record_changes(Page.objects.descendant_of(instance, inclusive=True).values_list("pk", flat=True))
+
+
+@receiver(post_save, sender=PageViewRestriction)
+@receiver(post_delete, sender=PageViewRestriction)
+def refresh_restricted_suggestions(sender, instance, **kwargs):
+    # Restricted pages and their subtrees are left out of the index.
+    suggest.record_changes(Page.objects.descendant_of(instance.page, inclusive=True).values_list("pk", flat=True))
+
+
+def enqueue_index_update(sender, instance, update_fields=None, **kwargs):
+    if queue.is_draft_save(update_fields):
+        return
+    queue.enqueue(queue.indexed_model(instance), [instance.pk])
+
+
+def register_queue_handlers():
+    """Queue index updates for the models Wagtail would otherwise index inline on save and delete."""
+    if not queue.is_enabled():
+        return
+    for model in get_indexed_models():
+        if getattr(model, "search_auto_update", True):
+            post_save.connect(enqueue_index_update, sender=model)
+            post_delete.connect(enqueue_index_update, sender=model)
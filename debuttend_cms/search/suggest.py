@@ -0,0 +1,236 @@
+"""In-memory prefix index powering the search-as-you-type endpoint.
+
+Each worker keeps a sorted list of ``(term, page_id)`` pairs for the titles and
+article authors of live pages and answers prefix lookups with ``bisect``. The
+index is built when the worker starts (see ``debuttend_cms.wsgi``) or on first
+use, and kept current from publish/unpublish/move/delete signals. Only live
+pages without view restrictions are indexed.
+
+Changes are also journaled in the shared cache so other workers refresh just
+the affected pages on their next lookup. A writer reserves sequence numbers
+with an atomic ``cache.incr`` and stores one journal key per number, so
+concurrent writers never overwrite each other's entries. A worker that is more
+than ``JOURNAL_LENGTH`` entries behind, or finds an entry missing for longer
+than ``JOURNAL_GAP_TIMEOUT``, rebuilds from scratch.
+"""
+from __future__ import annotations
+
+import sys
+import threading
+import time
+import unicodedata
+from bisect import bisect_left, insort
+
+from django.conf import settings
+from django.core.cache import cache
+from wagtail.models import Page
+
+from home.models import ArticlePage
+
+SEQ_KEY = "search:suggest:seq"
+JOURNAL_LENGTH = 500
+JOURNAL_TTL = 24 * 60 * 60
+# Seconds a reserved journal entry may stay unwritten (or evicted) before readers give up and rebuild.
+JOURNAL_GAP_TIMEOUT = 10
+# Journal entry meaning "too much changed, rebuild everything"; page ids are always positive.
+REBUILD = 0
+
+
+def normalize(text: str) -> str:
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(char for char in decomposed if not unicodedata.combining(char)).casefold().strip()
+
+
+def terms_for(title: str, author: str = "") -> set[str]:
+    terms = set()
+    for value in (title, author):
+        value = normalize(value)
+        if value:
+            terms.add(value)
+            terms.update(word for word in value.split() if len(word) > 1)
+    return terms
+
+
+class PrefixIndex:
+    def __init__(self):
+        self._entries: list[tuple[str, int]] = []
+        self._pages: dict[int, dict] = {}
+        self._terms: dict[int, set[str]] = {}
+        self.seq = 0
+        self.built_at = None
+        self.gap_since: float | None = None
+
+    def __len__(self) -> int:
+        return len(self._pages)
+
+    def _store(self, page_id: int, title: str, url: str | None, kind: str, author: str) -> set[str]:
+        terms = terms_for(title, author)
+        self._pages[page_id] = {"id": page_id, "title": title, "url": url, "type": kind}
+        self._terms[page_id] = terms
+        return terms
+
+    def add(self, page_id: int, title: str, url: str | None, kind: str, author: str = "") -> None:
+        self.remove(page_id)
+        for term in self._store(page_id, title, url, kind, author):
+            insort(self._entries, (term, page_id))
+
+    def load(self, rows) -> None:
+        """Fill an empty index from ``(page_id, title, url, kind, author)`` rows, sorting once at the end."""
+        for page_id, title, url, kind, author in rows:
+            self._entries.extend((term, page_id) for term in self._store(page_id, title, url, kind, author))
+        self._entries.sort()
+
+    def remove(self, page_id: int) -> None:
+        for term in self._terms.pop(page_id, ()):
+            idx = bisect_left(self._entries, (term, page_id))
+            if idx < len(self._entries) and self._entries[idx] == (term, page_id):
+                del self._entries[idx]
+        self._pages.pop(page_id, None)
+
+    def lookup(self, prefix: str, limit: int = 10) -> list[dict]:
+        prefix = normalize(prefix)
+        if not prefix:
+            return []
+        results = []
+        seen = set()
+        idx = bisect_left(self._entries, (prefix,))
+        while idx < len(self._entries) and len(results) < limit:
+            term, page_id = self._entries[idx]
+            if not term.startswith(prefix):
+                break
+            if page_id not in seen:
+                seen.add(page_id)
+                results.append(self._pages[page_id])
+            idx += 1
+        return results
+
+    def memory_usage(self) -> int:
+        """Approximate bytes held by the index structures."""
+        size = sys.getsizeof(self._entries) + sys.getsizeof(self._pages) + sys.getsizeof(self._terms)
+        for term, page_id in self._entries:
+            size += sys.getsizeof((term, page_id)) + sys.getsizeof(term)
+        for page in self._pages.values():
+            size += sys.getsizeof(page) + sum(sys.getsizeof(value) for value in page.values())
+        for terms in self._terms.values():
+            size += sys.getsizeof(terms)
+        return size
+
+    def stats(self) -> dict:
+        return {
+            "pages": len(self._pages),
+            "entries": len(self._entries),
+            "memory_bytes": self.memory_usage(),
+            "seq": self.seq,
+            "built_at": self.built_at,
+        }
+
+
+def load_pages(page_ids=None):
+    """Yield ``(page_id, title, url, kind, author)`` for live pages, optionally restricted to ``page_ids``."""
+    pages = Page.objects.live().public().filter(depth__gt=1).select_related("content_type").only(
+        "id", "title", "url_path", "content_type"
+    )
+    authors = ArticlePage.objects.live().public()
+    if page_ids is not None:
+        pages = pages.filter(pk__in=page_ids)
+        authors = authors.filter(pk__in=page_ids)
+    authors = dict(authors.exclude(author="").values_list("pk", "author"))
+    for page in pages.iterator(chunk_size=2000):
+        yield page.pk, page.title, page.get_url(), page.content_type.model, authors.get(page.pk, "")
+
+
+def journal_key(seq: int) -> str:
+    return f"search:suggest:journal:{seq}"
+
+
+_index: PrefixIndex | None = None
+_lock = threading.Lock()
+
+
+def build_index() -> PrefixIndex:
+    index = PrefixIndex()
+    index.seq = cache.get(SEQ_KEY) or 0
+    index.load(load_pages())
+    index.built_at = time.time()
+    return index
+
+
+def refresh_pages(index: PrefixIndex, page_ids) -> None:
+    page_ids = set(page_ids)
+    found = set()
+    for page_id, title, url, kind, author in load_pages(page_ids):
+        index.add(page_id, title, url, kind, author)
+        found.add(page_id)
+    for page_id in page_ids - found:
+        index.remove(page_id)
+
+
+def get_index() -> PrefixIndex:
+    """Return this worker's index, catching up with changes journaled by other workers."""
+    global _index
+    with _lock:
+        if _index is None:
+            _index = build_index()
+            return _index
+        seq = cache.get(SEQ_KEY) or 0
+        if seq == _index.seq:
+            return _index
+        if seq < _index.seq or seq - _index.seq > JOURNAL_LENGTH:
+            _index = build_index()
+            return _index
+        numbers = range(_index.seq + 1, seq + 1)
+        journal = cache.get_many([journal_key(number) for number in numbers])
+        pending = []
+        applied = _index.seq
+        # Apply the contiguous run of written entries; a writer may have reserved numbers it has not stored yet.
+        for number in numbers:
+            page_id = journal.get(journal_key(number))
+            if page_id is None:
+                break
+            pending.append(page_id)
+            applied = number
+        if REBUILD in pending:
+            _index = build_index()
+            return _index
+        refresh_pages(_index, pending)
+        _index.seq = applied
+        if applied == seq:
+            _index.gap_since = None
+        elif _index.gap_since is None:
+            _index.gap_since = time.monotonic()
+        elif time.monotonic() - _index.gap_since > JOURNAL_GAP_TIMEOUT:
+            _index = build_index()
+        return _index
+
+
+def warm_index() -> None:
+    if getattr(settings, "SEARCH_SUGGEST_WARM_ON_START", True):
+        get_index()
+
+
+def record_changes(page_ids) -> None:
+    """Apply page changes to this worker's index and journal them for the others."""
+    global _index
+    page_ids = list(page_ids)
+    entries = page_ids if len(page_ids) <= getattr(settings, "SEARCH_SUGGEST_MAX_JOURNALED", 200) else [REBUILD]
+    with _lock:
+        # incr reserves a range of sequence numbers atomically across workers.
+        try:
+            seq = cache.incr(SEQ_KEY, len(entries))
+        except ValueError:
+            cache.add(SEQ_KEY, 0, None)
+            seq = cache.incr(SEQ_KEY, len(entries))
+        first = seq - len(entries) + 1
+        cache.set_many({journal_key(first + idx): page_id for idx, page_id in enumerate(entries)}, JOURNAL_TTL)
+        if _index is not None:
+            if REBUILD in entries:
+                _index = None
+            else:
+                refresh_pages(_index, page_ids)
+                # Only skip ahead if no other worker journaled in between.
+                if _index.seq == first - 1:
+                    _index.seq = seq
+
+
+def suggest(prefix: str, limit: int = 10) -> list[dict]:
+    return get_index().lookup(prefix, limit)
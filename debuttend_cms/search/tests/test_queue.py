@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import threading
+from datetime import timedelta
+from unittest import mock, skipUnless
+
+from django.db import connection, transaction
+from django.db.models.signals import post_save
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+from wagtail.models import Site
+from wagtail.search.backends import get_search_backend
+from wagtail.search.models import IndexEntry
+
+from home.models import ArticlePage
+from search import queue
+from search.models import IndexQueueEntry
+from search.signals import enqueue_index_update
+
+
+class SearchQueueTests(TestCase):
+    def setUp(self):
+        root = Site.objects.get(is_default_site=True).root_page
+        self.articles = [root.add_child(instance=ArticlePage(title=f"Article {n}", slug=f"a{n}")) for n in range(3)]
+
+    def test_process_batch_coalesces_duplicate_entries(self):
+        first, second, _ = self.articles
+        queue.enqueue(ArticlePage, [first.pk, second.pk, first.pk, first.pk])
+
+        with mock.patch.object(queue, "update_index", wraps=queue.update_index) as update_index:
+            self.assertEqual(queue.process_batch(), (4, 2))
+
+        update_index.assert_called_once()
+        self.assertCountEqual(update_index.call_args.args[1], [first, second])
+        self.assertFalse(IndexQueueEntry.objects.exists())
+
+    def test_failed_batch_stays_queued(self):
+        queue.enqueue(ArticlePage, [article.pk for article in self.articles])
+
+        with mock.patch.object(queue, "update_index", side_effect=RuntimeError("backend down")):
+            with self.assertRaises(RuntimeError):
+                queue.process_batch()
+
+        self.assertEqual(IndexQueueEntry.objects.count(), 3)
+        self.assertEqual(queue.process_batch(), (3, 3))
+        self.assertFalse(IndexQueueEntry.objects.exists())
+
+    @override_settings(SEARCH_QUEUE_MAX_LAG=300)
+    def test_stats_reports_lag(self):
+        self.assertEqual(queue.stats()["lag_seconds"], 0.0)
+        self.assertFalse(queue.stats()["lagging"])
+
+        queue.enqueue(ArticlePage, [self.articles[0].pk])
+        IndexQueueEntry.objects.update(enqueued_at=timezone.now() - timedelta(seconds=200))
+        stats = queue.stats()
+        self.assertEqual(stats["pending"], 1)
+        self.assertGreaterEqual(stats["lag_seconds"], 200)
+        self.assertFalse(stats["lagging"])
+
+        IndexQueueEntry.objects.update(enqueued_at=timezone.now() - timedelta(seconds=400))
+        self.assertTrue(queue.stats()["lagging"])
+
+    def test_draft_revision_saves_are_not_queued(self):
+        post_save.connect(enqueue_index_update, sender=ArticlePage)
+        self.addCleanup(post_save.disconnect, enqueue_index_update, sender=ArticlePage)
+        article = self.articles[0]
+
+        with mock.patch.object(queue, "enqueue") as enqueue:
+            article.title = "Draft title"
+            revision = article.save_revision()
+            enqueue.assert_not_called()
+
+            revision.publish()
+            enqueue.assert_called_with(ArticlePage, [article.pk])
+
+    def test_remove_from_index_deletes_in_bulk(self):
+        queue.update_index(ArticlePage, self.articles)
+        article_ids = [str(article.pk) for article in self.articles]
+
+        with mock.patch.object(type(get_search_backend()), "delete") as delete:
+            queue.remove_from_index(ArticlePage, article_ids[1:])
+
+        delete.assert_not_called()
+        self.assertEqual(
+            list(IndexEntry.objects.filter(object_id__in=article_ids).values_list("object_id", flat=True)),
+            article_ids[:1],
+        )
+
+
+@skipUnless(connection.features.has_select_for_update_skip_locked, "the database can't skip locked rows")
+class SkipLockedTests(TransactionTestCase):
+    def test_batches_skip_rows_locked_by_another_worker(self):
+        # The ids don't need to exist: missing objects are just removed from the index.
+        queue.enqueue(ArticlePage, ["1", "2", "3"])
+        locked = IndexQueueEntry.objects.order_by("pk").first()
+        result = {}
+
+        def other_worker():
+            try:
+                result["processed"] = queue.process_batch()
+            finally:
+                connection.close()
+
+        with transaction.atomic():
+            list(IndexQueueEntry.objects.select_for_update().filter(pk=locked.pk))
+            worker = threading.Thread(target=other_worker)
+            worker.start()
+            worker.join()
+
+        self.assertEqual(result["processed"], (2, 2))
+        self.assertEqual(list(IndexQueueEntry.objects.values_list("pk", flat=True)), [locked.pk])
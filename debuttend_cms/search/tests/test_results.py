@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+from django.core.cache import cache
+from django.test import RequestFactory, TestCase, override_settings
+from wagtail.models import Page, Site
+
+from home.models import ArticlePage, DashboardPage, HomePage
+from search.results import MergedResults, ScoredResults, build_hits
+
+
+# Query budgets count content queries; keep cache reads off the database cache.
+@override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}})
+class BuildHitsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        root = Site.objects.get(is_default_site=True).root_page
+        cls.pages = [
+            root.add_child(instance=HomePage(title="Home", slug="home-1")),
+            root.add_child(instance=ArticlePage(title="Article one", slug="article-1")),
+            root.add_child(instance=DashboardPage(title="Dashboard", slug="dashboard-1")),
+            root.add_child(instance=ArticlePage(title="Article two", slug="article-2")),
+            root.add_child(instance=HomePage(title="Home two", slug="home-2")),
+        ]
+
+    def setUp(self):
+        # Site root paths are cached between requests; start cold so the budget is deterministic.
+        cache.clear()
+
+    def test_resolves_mixed_page_types_within_query_budget(self):
+        pages = list(Page.objects.filter(pk__in=[page.pk for page in self.pages]).order_by("-pk"))
+        request = RequestFactory().get("/search/")
+
+        # One query per specific page type, plus the request's site and the site root paths shared by every URL.
+        with self.assertNumQueries(5):
+            hits = build_hits(pages, request)
+            urls = [hit.url for hit in hits]
+
+        self.assertEqual([hit.page.pk for hit in hits], [page.pk for page in pages])
+        self.assertEqual(
+            [type(hit.page) for hit in hits],
+            [HomePage, ArticlePage, DashboardPage, ArticlePage, HomePage],
+        )
+        self.assertEqual(urls[0], "/home-2/")
+
+
+class Hit:
+    def __init__(self, name, score=None):
+        self.name = name
+        self.search_score = score
+
+
+class ListResults(list):
+    def count(self) -> int:
+        return len(self)
+
+
+class MergedResultsTests(TestCase):
+    def test_orders_hits_from_every_set_by_score(self):
+        articles = ListResults([Hit("a1", 0.9), Hit("a2", 0.2)])
+        pages = ListResults([Hit("p1", 0.5), Hit("p2", 0.1)])
+        results = MergedResults(ScoredResults(articles, "search_score"), ScoredResults(pages, "search_score"))
+
+        self.assertEqual(results.count(), 4)
+        self.assertEqual([hit.name for hit in results[0:4]], ["a1", "p1", "a2", "p2"])
+        self.assertEqual([hit.name for hit in results[1:3]], ["p1", "a2"])
+
+    def test_interleaves_by_rank_when_a_set_has_no_scores(self):
+        articles = ListResults([Hit("a1", 9.0), Hit("a2", 8.0)])
+        pages = ListResults([Hit("p1"), Hit("p2")])
+        results = MergedResults(ScoredResults(articles, "search_score"), ScoredResults(pages, None))
+
+        self.assertEqual({hit.name for hit in results[0:2]}, {"a1", "p1"})
+        self.assertEqual({hit.name for hit in results[2:4]}, {"a2", "p2"})
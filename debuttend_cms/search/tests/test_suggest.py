@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+from django.core.cache import cache
+from django.test import TestCase
+from wagtail.models import PageViewRestriction, Site
+
+from home.models import HomePage
+from search import suggest
+
+
+class SuggestIndexTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        root = Site.objects.get(is_default_site=True).root_page
+        cls.public = root.add_child(instance=HomePage(title="Gardening club", slug="club"))
+        cls.private = root.add_child(instance=HomePage(title="Gardening board minutes", slug="board"))
+        PageViewRestriction.objects.create(page=cls.private, restriction_type=PageViewRestriction.LOGIN)
+
+    def setUp(self):
+        cache.clear()
+        suggest._index = None
+
+    def titles(self, prefix: str) -> list[str]:
+        return [hit["title"] for hit in suggest.suggest(prefix)]
+
+    def test_leaves_out_view_restricted_pages(self):
+        self.assertEqual(self.titles("garden"), ["Gardening club"])
+
+    def test_other_workers_pick_up_every_journaled_change(self):
+        index = suggest.get_index()
+        HomePage.objects.filter(pk=self.public.pk).update(title="Allotment club")
+        # Two workers journaling at once each reserve their own sequence numbers.
+        suggest._index = None
+        suggest.record_changes([self.public.pk])
+        suggest.record_changes([self.private.pk])
+        suggest._index = index
+
+        self.assertEqual(self.titles("allot"), ["Allotment club"])
+        self.assertEqual(suggest.get_index().seq, cache.get(suggest.SEQ_KEY))
+
+
+class PrefixIndexTests(TestCase):
+    ROWS = [
+        (3, "Winter gardening", "/winter/", "articlepage", "Ann Lee"),
+        (1, "Gardening club", "/club/", "homepage", ""),
+        (2, "Garden tools", "/tools/", "articlepage", "Gary Ward"),
+    ]
+
+    def test_bulk_load_matches_incremental_adds(self):
+        loaded, added = suggest.PrefixIndex(), suggest.PrefixIndex()
+        loaded.load(self.ROWS)
+        for row in self.ROWS:
+            added.add(*row)
+
+        self.assertEqual(loaded._entries, added._entries)
+        self.assertEqual(loaded._entries, sorted(loaded._entries))
+        # "garden" sorts before "gardening"; ties are broken by page id.
+        self.assertEqual([hit["id"] for hit in loaded.lookup("gar")], [2, 1, 3])
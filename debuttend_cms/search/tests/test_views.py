@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+from django.test import TestCase
+from wagtail.models import Site
+
+from home.models import ArticlePage, HomePage
+from search import fulltext
+
+
+class SearchViewTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        root = Site.objects.get(is_default_site=True).root_page
+        cls.article = root.add_child(
+            instance=ArticlePage(title="Composting basics", slug="composting", introduction="Start a heap")
+        )
+        cls.home = root.add_child(instance=HomePage(title="Composting hub", slug="hub"))
+        fulltext.index_articles([cls.article])
+
+    def test_returns_articles_from_the_full_text_index(self):
+        response = self.client.get("/search/", {"query": "composting"})
+
+        self.assertEqual(response.status_code, 200)
+        titles = [hit.title for hit in response.context["results_page"]]
+        self.assertIn("Composting basics", titles)
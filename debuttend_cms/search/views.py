@@ -1,11 +1,21 @@
-"""Search view implementation leveraging Wagtail's search backend."""
+"""Search view combining the article full-text index with Wagtail's search backend."""
 from __future__ import annotations
 
+import time
+
+from django.conf import settings
 from django.core.paginator import Paginator
+from django.db import connection
+from django.http import JsonResponse
 from django.shortcuts import render
 from django.views.generic import View
 from wagtail.models import Page
 
+from home.models import ArticlePage
+
+from . import fulltext, suggest
+from .results import MergedResults, ScoredResults, build_hits
+
 
 class SearchView(View):
     template_name = "search/results.html"
@@ -15,16 +25,56 @@ class SearchView(View):
         """Handle GET requests by returning paginated search results."""
         query = request.GET.get("query", "").strip()
         if query:
-            search_results = Page.objects.live().search(query)
+            search_results = self.search(query)
         else:
             search_results = Page.objects.none()
 
         paginator = Paginator(search_results, self.paginate_by)
         page_number = request.GET.get("page")
         results_page = paginator.get_page(page_number)
+        results_page.object_list = build_hits(results_page.object_list, request)
 
         context = {
             "query": query,
             "results_page": results_page,
         }
         return render(request, self.template_name, context)
+
+    def search(self, query):
+        """Articles come ranked from the dedicated full-text index, other pages from Wagtail search.
+
+        Both sets are merged into one relevance order. Wagtail's database backend
+        only scores hits on PostgreSQL, where both sides use ``ts_rank``; elsewhere
+        the sets are interleaved by rank (see ``MergedResults``).
+        """
+        articles = fulltext.search_articles(query)
+        if articles is None:
+            return Page.objects.live().search(query)
+        pages = Page.objects.live().not_type(ArticlePage).search(query)
+        if connection.vendor == "postgresql":
+            pages = pages.annotate_score("search_score")
+            score_attr = "search_score"
+        else:
+            score_attr = None
+        return MergedResults(ScoredResults(articles, "search_score"), ScoredResults(pages, score_attr))
+
+
+class SuggestView(View):
+    """Search-as-you-type suggestions answered from the in-memory prefix index."""
+
+    def get(self, request, *args, **kwargs):
+        prefix = request.GET.get("q", "").strip()
+        max_limit = getattr(settings, "SEARCH_SUGGEST_MAX_RESULTS", 10)
+        try:
+            limit = min(max(int(request.GET.get("limit", max_limit)), 1), max_limit)
+        except ValueError:
+            limit = max_limit
+
+        started = time.perf_counter()
+        index = suggest.get_index()
+        suggestions = index.lookup(prefix, limit)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        response = JsonResponse({"query": prefix, "suggestions": suggestions})
+        response["Server-Timing"] = f"suggest;dur={elapsed_ms:.2f}"
+        response["X-Suggest-Index-Pages"] = str(len(index))
+        return response